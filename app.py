@@ -2,6 +2,8 @@ import streamlit as st
 from core.session_state import SessionStateManager
 from core.sidebar import Sidebar
 from core.navigation import PageRouter
+from services.netbox_service import NetboxService
+from services import netbox_changefeed
 
 # Importar páginas
 from pages import home
@@ -56,6 +58,9 @@ def main():
     # Inicializar estado da sessão
     SessionStateManager.initialize()
     
+    # Invalidação dos caches a partir do changelog do Netbox (se habilitada)
+    netbox_changefeed.ensure_started()
+    
     # Criar roteador de páginas
     router = PageRouter()
     
@@ -79,8 +84,16 @@ def main():
     sidebar = Sidebar()
     sidebar.render()
     
+    # Aviso de modo degradado (preenchido após a página, que é quem fala com o Netbox)
+    degraded_banner = st.empty()
+    
     # Renderizar página atual
     router.render_current_page()
+    
+    if NetboxService.is_degraded():
+        degraded_banner.warning(
+            "⚠️ Netbox indisponível no momento: exibindo os últimos dados conhecidos, que podem estar desatualizados."
+        )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,4 @@
+from .dataset import DatasetConfig, FakeNetboxDataset
+from .fake_netbox import FakeNetboxServer, ServerBehavior
+
+__all__ = ['DatasetConfig', 'FakeNetboxDataset', 'FakeNetboxServer', 'ServerBehavior']
@@ -0,0 +1,373 @@
+import json
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Intervalos de IDs [início, fim) usados para filtrar sem materializar objetos
+Ranges = List[Tuple[int, int]]
+
+STATUSES = [("active", "Active"), ("planned", "Planned"), ("offline", "Offline")]
+INTERFACE_TYPES = [("10gbase-x-sfpp", "SFP+ (10GE)"), ("1000base-t", "1000BASE-T (1GE)"), ("virtual", "Virtual")]
+REGIONS = ["Norte", "Nordeste", "Centro-Oeste", "Sudeste", "Sul"]
+
+@dataclass
+class DatasetConfig:
+    """Tamanho do inventário simulado (padrão: 100 mil dispositivos / 2 milhões de interfaces)"""
+    tenants: int = 200
+    sites_per_tenant: int = 5
+    devices_per_site: int = 100
+    interfaces_per_device: int = 20
+    circuits_per_tenant: int = 10
+
+    @classmethod
+    def from_fixture(cls, path: str) -> "DatasetConfig":
+        """Carrega o tamanho do inventário de um arquivo JSON (chaves iguais aos campos)"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        known = {field.name for field in fields(cls)}
+        return cls(**{k: v for k, v in data.get("dataset", data).items() if k in known})
+
+class FakeNetboxDataset:
+    """
+    Inventário sintético e determinístico do Netbox
+
+    Nenhum objeto é mantido em memória: os IDs são contíguos por pai
+    (tenant -> sites -> dispositivos -> interfaces) e cada objeto é montado
+    a partir do próprio ID. Filtros por pai viram intervalos de IDs, o que
+    permite servir 2 milhões de interfaces com contagem e paginação O(1).
+    """
+
+    def __init__(self, config: Optional[DatasetConfig] = None, base_url: str = "http://localhost/api"):
+        self.config = config or DatasetConfig()
+        self.base_url = base_url.rstrip("/")
+        c = self.config
+        self.total = {
+            "tenant": c.tenants,
+            "site": c.tenants * c.sites_per_tenant,
+            "device": c.tenants * c.sites_per_tenant * c.devices_per_site,
+            "interface": c.tenants * c.sites_per_tenant * c.devices_per_site * c.interfaces_per_device,
+            "circuit": c.tenants * c.circuits_per_tenant,
+        }
+        self.total["ipaddress"] = self.total["device"] * 2
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.total)
+
+    def to_dict(self) -> Dict:
+        return asdict(self.config)
+
+    # Relações por aritmética de IDs
+    def _parent(self, object_id: int, children_per_parent: int) -> int:
+        return (object_id - 1) // children_per_parent + 1
+
+    def _children(self, parent_id: int, children_per_parent: int) -> Tuple[int, int]:
+        return ((parent_id - 1) * children_per_parent + 1, parent_id * children_per_parent + 1)
+
+    def site_tenant(self, site_id: int) -> int:
+        return self._parent(site_id, self.config.sites_per_tenant)
+
+    def device_site(self, device_id: int) -> int:
+        return self._parent(device_id, self.config.devices_per_site)
+
+    def interface_device(self, interface_id: int) -> int:
+        return self._parent(interface_id, self.config.interfaces_per_device)
+
+    def circuit_tenant(self, circuit_id: int) -> int:
+        return self._parent(circuit_id, self.config.circuits_per_tenant)
+
+    def circuit_site(self, circuit_id: int) -> int:
+        tenant_id = self.circuit_tenant(circuit_id)
+        first_site, _ = self._children(tenant_id, self.config.sites_per_tenant)
+        return first_site + (circuit_id - 1) % self.config.sites_per_tenant
+
+    def _descendant_range(self, level: str, parent_level: str, parent_id: int) -> Tuple[int, int]:
+        """Intervalo de IDs de 'level' que descendem do objeto 'parent_level'"""
+        chain = ["tenant", "site", "device", "interface"]
+        sizes = {
+            "site": self.config.sites_per_tenant,
+            "device": self.config.devices_per_site,
+            "interface": self.config.interfaces_per_device,
+        }
+        start, end = parent_id, parent_id + 1
+        for child in chain[chain.index(parent_level) + 1:chain.index(level) + 1]:
+            start = (start - 1) * sizes[child] + 1
+            end = (end - 1) * sizes[child] + 1
+        return start, end
+
+    # Filtros -> intervalos de IDs
+    @staticmethod
+    def _intersect(a: Ranges, b: Ranges) -> Ranges:
+        result = []
+        for a_start, a_end in a:
+            for b_start, b_end in b:
+                start, end = max(a_start, b_start), min(a_end, b_end)
+                if start < end:
+                    result.append((start, end))
+        return sorted(result)
+
+    @staticmethod
+    def _ids_to_ranges(ids: Iterable[int], total: int) -> Ranges:
+        return [(i, i + 1) for i in sorted(set(ids)) if 1 <= i <= total]
+
+    def candidate_ranges(self, kind: str, filters: Dict[str, List[str]]) -> Ranges:
+        """
+        Intervalos de IDs de 'kind' que atendem aos filtros suportados
+        (id, tenant_id, site_id, device_id, device_tenant_id)
+        """
+        ranges: Ranges = [(1, self.total[kind] + 1)]
+
+        def ints(name: str) -> List[int]:
+            return [int(v) for v in filters.get(name, []) if str(v).isdigit()]
+
+        if "id" in filters:
+            ranges = self._intersect(ranges, self._ids_to_ranges(ints("id"), self.total[kind]))
+
+        scopes = {
+            "tenant_id": "tenant",
+            "device_tenant_id": "tenant",
+            "site_id": "site",
+            "device_id": "device",
+        }
+        for param, parent_level in scopes.items():
+            if param not in filters:
+                continue
+            if kind == "circuit":
+                ids = ints(param)
+                if parent_level == "tenant":
+                    parent_ranges = [self._children(t, self.config.circuits_per_tenant) for t in ids]
+                elif parent_level == "site":
+                    parent_ranges = [
+                        (c, c + 1)
+                        for s in ids
+                        for c in range(*self._children(self.site_tenant(s), self.config.circuits_per_tenant))
+                        if self.circuit_site(c) == s
+                    ]
+                else:
+                    parent_ranges = []
+            elif kind == "ipaddress":
+                parent_ranges = []
+            elif parent_level == kind:
+                parent_ranges = self._ids_to_ranges(ints(param), self.total[kind])
+            else:
+                chain = ["tenant", "site", "device", "interface"]
+                if chain.index(parent_level) >= chain.index(kind):
+                    parent_ranges = []
+                else:
+                    parent_ranges = [
+                        self._descendant_range(kind, parent_level, parent_id)
+                        for parent_id in ints(param)
+                        if 1 <= parent_id <= self.total[parent_level]
+                    ]
+            ranges = self._intersect(ranges, sorted(parent_ranges))
+
+        return ranges
+
+    @staticmethod
+    def count(ranges: Ranges) -> int:
+        return sum(end - start for start, end in ranges)
+
+    @staticmethod
+    def slice_ids(ranges: Ranges, offset: int, limit: int) -> List[int]:
+        """IDs da página [offset, offset+limit) sobre a lista de intervalos"""
+        ids: List[int] = []
+        for start, end in ranges:
+            size = end - start
+            if offset >= size:
+                offset -= size
+                continue
+            take = min(limit - len(ids), size - offset)
+            ids.extend(range(start + offset, start + offset + take))
+            offset = 0
+            if len(ids) >= limit:
+                break
+        return ids
+
+    # Representações
+    def _url(self, endpoint: str, object_id: int) -> str:
+        return f"{self.base_url}/{endpoint}{object_id}/"
+
+    def tenant_name(self, tenant_id: int) -> str:
+        return f"Cliente {tenant_id:05d} Telecom"
+
+    def tenant(self, tenant_id: int, brief: bool = False) -> Dict:
+        name = self.tenant_name(tenant_id)
+        data = {
+            "id": tenant_id,
+            "url": self._url("tenancy/tenants/", tenant_id),
+            "display": name,
+            "name": name,
+            "slug": f"cliente-{tenant_id:05d}",
+            "description": f"Tenant sintético {tenant_id}",
+        }
+        if brief:
+            return data
+        data.update({"group": None, "comments": "", "tags": [], "created": "2024-01-01T00:00:00Z"})
+        return data
+
+    def site(self, site_id: int, brief: bool = False) -> Dict:
+        name = f"SITE-{site_id:05d}"
+        data = {
+            "id": site_id,
+            "url": self._url("dcim/sites/", site_id),
+            "display": name,
+            "name": name,
+            "slug": f"site-{site_id:05d}",
+            "description": "",
+        }
+        if brief:
+            return data
+        value, label = STATUSES[site_id % len(STATUSES)]
+        region_index = site_id % len(REGIONS)
+        data.update({
+            "status": {"value": value, "label": label},
+            "region": {"id": region_index + 1, "name": REGIONS[region_index], "slug": REGIONS[region_index].lower()},
+            "tenant": self.tenant(self.site_tenant(site_id), brief=True),
+            "tags": [],
+        })
+        return data
+
+    def ip_address(self, ip_id: int, brief: bool = False) -> Dict:
+        device_id = (ip_id + 1) // 2
+        if ip_id % 2:
+            address = f"10.{(device_id >> 16) & 255}.{(device_id >> 8) & 255}.{device_id & 255}/32"
+            family = {"value": 4, "label": "IPv4"}
+        else:
+            address = f"2001:db8:{(device_id >> 16) & 0xffff:x}:{device_id & 0xffff:x}::1/128"
+            family = {"value": 6, "label": "IPv6"}
+        data = {
+            "id": ip_id,
+            "url": self._url("ipam/ip-addresses/", ip_id),
+            "display": address,
+            "family": family,
+            "address": address,
+        }
+        if brief:
+            return data
+        data.update({"status": {"value": "active", "label": "Active"}, "tenant": None, "tags": []})
+        return data
+
+    def device(self, device_id: int, brief: bool = False) -> Dict:
+        name = f"RT-{device_id:06d}"
+        data = {
+            "id": device_id,
+            "url": self._url("dcim/devices/", device_id),
+            "display": name,
+            "name": name,
+            "description": "",
+        }
+        if brief:
+            return data
+        site_id = self.device_site(device_id)
+        value, label = STATUSES[device_id % len(STATUSES)]
+        data.update({
+            "status": {"value": value, "label": label},
+            "site": self.site(site_id, brief=True),
+            "tenant": self.tenant(self.site_tenant(site_id), brief=True),
+            "role": {"id": 1, "name": "RT-BORDA", "slug": "rt-borda"},
+            "device_type": {"id": 1, "display": "NE8000 M8", "model": "NE8000 M8"},
+            "serial": f"SN{device_id:08d}",
+            "primary_ip": self.ip_address(device_id * 2 - 1, brief=True),
+            "primary_ip4": self.ip_address(device_id * 2 - 1, brief=True),
+            "primary_ip6": self.ip_address(device_id * 2, brief=True),
+            "tags": [],
+        })
+        return data
+
+    def interface(self, interface_id: int, brief: bool = False) -> Dict:
+        device_id = self.interface_device(interface_id)
+        index = (interface_id - 1) % self.config.interfaces_per_device
+        name = f"GigabitEthernet0/{index // 48}/{index % 48}"
+        data = {
+            "id": interface_id,
+            "url": self._url("dcim/interfaces/", interface_id),
+            "display": name,
+            "device": self.device(device_id, brief=True),
+            "name": name,
+            "description": "",
+            "cable": None,
+        }
+        if brief:
+            return data
+        value, label = INTERFACE_TYPES[index % len(INTERFACE_TYPES)]
+        data.update({
+            "type": {"value": value, "label": label},
+            "enabled": index % 7 != 6,
+            "mtu": None,
+            "mode": None,
+            "tags": [],
+        })
+        return data
+
+    def circuit(self, circuit_id: int, brief: bool = False) -> Dict:
+        cid = f"CIRC-{circuit_id:06d}"
+        data = {
+            "id": circuit_id,
+            "url": self._url("circuits/circuits/", circuit_id),
+            "display": cid,
+            "cid": cid,
+            "description": "",
+        }
+        if brief:
+            return data
+        data.update({
+            "provider": {"id": 1, "name": "Operadora Exemplo"},
+            "tenant": self.tenant(self.circuit_tenant(circuit_id), brief=True),
+            "termination_a": {"site": self.site(self.circuit_site(circuit_id), brief=True)},
+            "tags": [],
+        })
+        return data
+
+    def build(self, kind: str, object_id: int, brief: bool = False) -> Dict:
+        return getattr(self, kind)(object_id, brief=brief)
+
+    def tenant_search(self, term: str) -> List[int]:
+        """IDs dos tenants cujo nome/slug contém o termo (como o filtro 'q')"""
+        term = term.lower()
+        return [
+            tenant_id for tenant_id in range(1, self.total["tenant"] + 1)
+            if term in self.tenant_name(tenant_id).lower() or term in f"cliente-{tenant_id:05d}"
+        ]
+
+    # GraphQL: inventário do tenant no formato da consulta TenantInventory
+    def tenant_inventory(self, tenant_id: int, interfaces: bool = True) -> List[Dict]:
+        if not 1 <= tenant_id <= self.total["tenant"]:
+            return []
+        sites = []
+        for site_id in range(*self._children(tenant_id, self.config.sites_per_tenant)):
+            site = self.site(site_id)
+            devices = []
+            for device_id in range(*self._children(site_id, self.config.devices_per_site)):
+                device = self.device(device_id)
+                entry = {
+                    "id": str(device_id),
+                    "name": device["name"],
+                    "status": device["status"]["value"].upper(),
+                    "primary_ip4": {"id": str(device["primary_ip4"]["id"]), "address": device["primary_ip4"]["address"]},
+                    "primary_ip6": {"id": str(device["primary_ip6"]["id"]), "address": device["primary_ip6"]["address"]},
+                }
+                if interfaces:
+                    entry["interfaces"] = [
+                        {
+                            "id": str(iface["id"]),
+                            "name": iface["name"],
+                            "enabled": iface["enabled"],
+                            "type": iface["type"]["value"].upper().replace("-", "_"),
+                        }
+                        for iface in (
+                            self.interface(i)
+                            for i in range(*self._children(device_id, self.config.interfaces_per_device))
+                        )
+                    ]
+                devices.append(entry)
+            sites.append({
+                "id": str(site_id),
+                "name": site["name"],
+                "slug": site["slug"],
+                "status": site["status"]["value"].upper(),
+                "region": {"name": site["region"]["name"]},
+                "devices": devices,
+            })
+        return sites
+
+def project(item: Dict, fields: Sequence[str]) -> Dict:
+    """Mantém apenas os campos de primeiro nível pedidos em ?fields="""
+    return {k: v for k, v in item.items() if k in fields}
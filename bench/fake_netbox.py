@@ -0,0 +1,339 @@
+"""
+Servidor Netbox simulado para testes de carga e desenvolvimento offline
+
+Uso:
+    python -m bench.fake_netbox --port 8001 --latency-ms 20
+    NETBOX_URL=http://127.0.0.1:8001/api API_TOKEN=x streamlit run app.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+from bench.dataset import DatasetConfig, FakeNetboxDataset, project
+
+# Endpoints REST implementados -> tipo de objeto do dataset
+ENDPOINTS = {
+    "tenancy/tenants/": "tenant",
+    "dcim/sites/": "site",
+    "dcim/devices/": "device",
+    "dcim/interfaces/": "interface",
+    "ipam/ip-addresses/": "ipaddress",
+    "circuits/circuits/": "circuit",
+}
+
+# Changelog (sempre vazio: o inventário simulado não muda)
+CHANGELOG_ENDPOINTS = ("extras/object-changes/", "core/object-changes/")
+
+@dataclass
+class ServerBehavior:
+    """Comportamento do servidor: latência, paginação e injeção de erros"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    default_page_size: int = 50
+    max_page_size: int = 1000
+    error_rate: float = 0.0  # fração das requisições respondidas com error_status
+    error_status: int = 503
+    retry_after: Optional[float] = None  # cabeçalho Retry-After (s) nas respostas 429/503
+    max_concurrent: int = 0  # acima disso responde 429 (0 = sem limite), como um rate limiter
+    etag: bool = False  # envia ETag e responde 304 a If-None-Match
+    graphql: bool = True
+    seed: Optional[int] = None
+
+class RequestStats:
+    """Contadores de requisições por endpoint, seguros entre threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.by_endpoint: Counter = Counter()
+            self.by_status: Counter = Counter()
+            self.bytes_sent = 0
+
+    def record(self, endpoint: str, status: int, size: int):
+        with self._lock:
+            self.by_endpoint[endpoint] += 1
+            self.by_status[status] += 1
+            self.bytes_sent += size
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": sum(self.by_endpoint.values()),
+                "by_endpoint": dict(self.by_endpoint),
+                "by_status": dict(self.by_status),
+                "bytes_sent": self.bytes_sent,
+            }
+
+class FakeNetboxHandler(BaseHTTPRequestHandler):
+    server: "FakeNetboxServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Silencioso: o volume de requisições em teste de carga poluiria a saída
+        pass
+
+    def _send_json(self, endpoint: str, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if status in (429, 503) and self.server.behavior.retry_after is not None:
+            headers["Retry-After"] = str(self.server.behavior.retry_after)
+
+        if status == 200 and self.server.behavior.etag:
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.server.stats.record(endpoint, status, len(body))
+
+    def _simulate(self, endpoint: str) -> bool:
+        """Aplica latência e, se sorteado, responde com erro; retorna False nesse caso"""
+        behavior = self.server.behavior
+        if behavior.max_concurrent and self.server.in_flight > behavior.max_concurrent:
+            self._send_json(endpoint, 429, {"detail": "Muitas requisições simultâneas"})
+            return False
+        delay = behavior.latency_ms + (self.server.random.uniform(0, behavior.jitter_ms) if behavior.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        if behavior.error_rate and self.server.random.random() < behavior.error_rate:
+            self._send_json(endpoint, behavior.error_status, {"detail": "Erro injetado pelo servidor simulado"})
+            return False
+        return True
+
+    def _route(self, path: str) -> Tuple[Optional[str], Optional[int]]:
+        """Separa '/api/dcim/devices/12/' em ('dcim/devices/', 12)"""
+        match = re.match(r"^/api/([a-z-]+/[a-z-]+/)(?:(\d+)/)?$", path)
+        if not match:
+            return None, None
+        return match.group(1), int(match.group(2)) if match.group(2) else None
+
+    def do_GET(self):
+        with self.server.tracking():
+            self._handle_get()
+
+    def do_POST(self):
+        with self.server.tracking():
+            self._handle_post()
+
+    def _handle_get(self):
+        parts = urlsplit(self.path)
+        endpoint, object_id = self._route(parts.path)
+        query = parse_qs(parts.query)
+
+        if endpoint is None or (endpoint not in ENDPOINTS and endpoint not in CHANGELOG_ENDPOINTS):
+            self._send_json(parts.path, 404, {"detail": "Não encontrado."})
+            return
+        if not self._simulate(endpoint):
+            return
+        if self.headers.get("Authorization", "").split(" ")[0] != "Token":
+            self._send_json(endpoint, 403, {"detail": "As credenciais de autenticação não foram fornecidas."})
+            return
+
+        if endpoint in CHANGELOG_ENDPOINTS:
+            self._send_json(endpoint, 200, {"count": 0, "next": None, "previous": None, "results": []})
+            return
+
+        kind = ENDPOINTS[endpoint]
+        dataset = self.server.dataset
+        brief = query.get("brief", ["false"])[0].lower() in ("1", "true")
+        fields = query.get("fields", [""])[0].split(",") if query.get("fields") else None
+
+        if object_id is not None:
+            if not 1 <= object_id <= dataset.total[kind]:
+                self._send_json(endpoint, 404, {"detail": "Não encontrado."})
+                return
+            item = dataset.build(kind, object_id, brief=brief)
+            self._send_json(endpoint, 200, project(item, fields) if fields else item)
+            return
+
+        self._send_json(endpoint, 200, self._list(endpoint, kind, parts.path, query, brief, fields))
+
+    def _list(self, endpoint: str, kind: str, path: str, query: Dict[str, List[str]], brief: bool, fields) -> Dict:
+        dataset = self.server.dataset
+        behavior = self.server.behavior
+
+        if kind == "tenant" and query.get("q"):
+            query = {**query, "id": [str(i) for i in dataset.tenant_search(query["q"][0])] or ["0"]}
+
+        ranges = dataset.candidate_ranges(kind, query)
+        count = dataset.count(ranges)
+        limit = int(query.get("limit", [behavior.default_page_size])[0] or behavior.default_page_size)
+        limit = min(limit, behavior.max_page_size) if limit > 0 else behavior.max_page_size
+        offset = int(query.get("offset", ["0"])[0] or 0)
+
+        ids = dataset.slice_ids(ranges, offset, limit)
+        results = [dataset.build(kind, object_id, brief=brief) for object_id in ids]
+        if fields:
+            results = [project(item, fields) for item in results]
+
+        def page_url(new_offset: int) -> str:
+            params = {k: v for k, v in query.items() if k not in ("offset", "limit")}
+            params.update({"limit": [str(limit)], "offset": [str(new_offset)]})
+            return f"{self.server.public_url}{path}?{urlencode(params, doseq=True)}"
+
+        return {
+            "count": count,
+            "next": page_url(offset + limit) if offset + limit < count else None,
+            "previous": page_url(max(offset - limit, 0)) if offset > 0 else None,
+            "results": results,
+        }
+
+    def _handle_post(self):
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if parts.path.rstrip("/") != "/graphql" or not self.server.behavior.graphql:
+            self._send_json(parts.path, 404, {"detail": "Não encontrado."})
+            return
+        if not self._simulate("graphql/"):
+            return
+
+        try:
+            query = json.loads(body or b"{}").get("query", "")
+        except ValueError:
+            self._send_json("graphql/", 400, {"errors": [{"message": "JSON inválido"}]})
+            return
+
+        # Apenas a consulta de inventário usada pelo NetboxService é suportada
+        match = re.search(r'site_list\s*\(\s*filters\s*:\s*\{\s*tenant_id\s*:\s*"?(\d+)"?', query)
+        if not match:
+            self._send_json("graphql/", 200, {"data": None, "errors": [{"message": "Consulta não suportada pelo servidor simulado"}]})
+            return
+
+        sites = self.server.dataset.tenant_inventory(int(match.group(1)), interfaces="interfaces" in query)
+        self._send_json("graphql/", 200, {"data": {"site_list": sites}})
+
+class FakeNetboxServer(ThreadingHTTPServer):
+    """Servidor HTTP do Netbox simulado"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, dataset: Optional[DatasetConfig] = None,
+                 behavior: Optional[ServerBehavior] = None):
+        super().__init__((host, port), FakeNetboxHandler)
+        self.behavior = behavior or ServerBehavior()
+        self.random = random.Random(self.behavior.seed)
+        self.public_url = f"http://{host}:{self.server_address[1]}"
+        self.dataset = FakeNetboxDataset(dataset, base_url=f"{self.public_url}/api")
+        self.stats = RequestStats()
+        self.in_flight = 0
+        self.in_flight_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @contextmanager
+    def tracking(self):
+        """Conta as requisições em atendimento (para o limite max_concurrent)"""
+        with self.in_flight_lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self.in_flight_lock:
+                self.in_flight -= 1
+
+    @property
+    def api_url(self) -> str:
+        """Valor a usar em NETBOX_URL"""
+        return f"{self.public_url}/api"
+
+    def start(self) -> "FakeNetboxServer":
+        """Atende em uma thread de fundo (para uso dentro do benchmark)"""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-netbox", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Argumentos de dataset e comportamento compartilhados com o benchmark"""
+    defaults = DatasetConfig()
+    parser.add_argument("--fixture", help="JSON com o tamanho do dataset (e, opcionalmente, 'behavior')")
+    parser.add_argument("--tenants", type=int, default=defaults.tenants)
+    parser.add_argument("--sites-per-tenant", type=int, default=defaults.sites_per_tenant)
+    parser.add_argument("--devices-per-site", type=int, default=defaults.devices_per_site)
+    parser.add_argument("--interfaces-per-device", type=int, default=defaults.interfaces_per_device)
+    parser.add_argument("--circuits-per-tenant", type=int, default=defaults.circuits_per_tenant)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=50, help="Tamanho padrão de página")
+    parser.add_argument("--max-page-size", type=int, default=1000)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After (s) nas respostas 429/503")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Responde 429 acima desse número de requisições simultâneas")
+    parser.add_argument("--etag", action="store_true", help="Envia ETag e responde 304")
+    parser.add_argument("--no-graphql", action="store_true", help="Desativa o endpoint GraphQL")
+    parser.add_argument("--seed", type=int, default=None)
+
+def config_from_args(args) -> Tuple[DatasetConfig, ServerBehavior]:
+    """Monta o dataset e o comportamento a partir dos argumentos (a fixture tem precedência)"""
+    dataset = DatasetConfig(
+        tenants=args.tenants,
+        sites_per_tenant=args.sites_per_tenant,
+        devices_per_site=args.devices_per_site,
+        interfaces_per_device=args.interfaces_per_device,
+        circuits_per_tenant=args.circuits_per_tenant,
+    )
+    behavior = ServerBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        default_page_size=args.page_size,
+        max_page_size=args.max_page_size,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        max_concurrent=args.max_concurrent,
+        etag=args.etag,
+        graphql=not args.no_graphql,
+        seed=args.seed,
+    )
+    if args.fixture:
+        dataset = DatasetConfig.from_fixture(args.fixture)
+        with open(args.fixture, "r", encoding="utf-8") as f:
+            overrides = json.load(f).get("behavior", {})
+        for name, value in overrides.items():
+            if hasattr(behavior, name):
+                setattr(behavior, name, value)
+    return dataset, behavior
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor Netbox simulado")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    dataset, behavior = config_from_args(args)
+    server = FakeNetboxServer(args.host, args.port, dataset, behavior)
+    print(f"Netbox simulado em {server.api_url}: {server.dataset.summary()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark de carregamento das páginas contra o Netbox simulado
+
+Sobe o servidor simulado em uma thread, executa o app.py com o AppTest do
+Streamlit em cenários do gerador de configurações e das consultas, e mede
+o tempo de cada carga e as requisições que chegaram ao "Netbox".
+
+Uso:
+    python -m bench.page_load --tenants 200 --latency-ms 20 --runs 3
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from bench.fake_netbox import FakeNetboxServer, add_server_arguments, config_from_args
+
+APP_PATH = str(BASE_DIR / "app.py")
+
+def _tenant_session(page: str, tenant_id: int, tenant_name: str, **extra) -> Dict:
+    return {"current_page": page, "selected_tenant_id": tenant_id, "selected_tenant_name": tenant_name, **extra}
+
+def build_scenarios(server: FakeNetboxServer, tenant_id: int) -> Dict[str, Callable]:
+    """Cenários medidos; cada um recebe um AppTest novo (sessão nova) e o executa"""
+    tenant_name = server.dataset.tenant_name(tenant_id)
+    search_term = tenant_name.split()[1]
+
+    def with_state(state: Dict):
+        def scenario(at):
+            for key, value in state.items():
+                at.session_state[key] = value
+            at.run()
+        return scenario
+
+    def consulta_cliente(at):
+        at.session_state["current_page"] = "consulta.cliente"
+        at.run()
+        at.text_input(key="consulta_cliente_query").input(search_term).run()
+        at.selectbox(key="consulta_cliente_select").select(tenant_id).run()
+
+    return {
+        "gera_config_resumo": with_state(_tenant_session("gera_config", tenant_id, tenant_name)),
+        "gera_config_l2vpn_vlan": with_state(
+            _tenant_session("gera_config", tenant_id, tenant_name, selected_service="l2vpn-vlan")
+        ),
+        "gera_config_bgp_transito": with_state(
+            _tenant_session("gera_config", tenant_id, tenant_name, selected_service="bgp_cl_trans")
+        ),
+        "consulta_cliente": consulta_cliente,
+        "consulta_dispositivo": with_state({"current_page": "consulta.dispositivo"}),
+    }
+
+def reset_process_caches():
+    """Esvazia os caches compartilhados do processo (carga "fria")"""
+    from services.response_cache import RESPONSE_CACHE, LAST_KNOWN_GOOD
+    from services.snapshot_store import SNAPSHOTS
+
+    RESPONSE_CACHE.invalidate()
+    LAST_KNOWN_GOOD.invalidate()
+    SNAPSHOTS.invalidate("")
+
+def run_scenario(server: FakeNetboxServer, scenario: Callable, timeout: float) -> Dict:
+    """Executa um cenário em uma sessão nova, retornando tempo e requisições"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    server.stats.reset()
+    started = time.perf_counter()
+    scenario(at)
+    elapsed = time.perf_counter() - started
+
+    stats = server.stats.snapshot()
+    return {
+        "seconds": elapsed,
+        "requests": stats["requests"],
+        "bytes": stats["bytes_sent"],
+        "by_endpoint": stats["by_endpoint"],
+        "errors": [e.value for e in at.error],
+        "exceptions": [e.value for e in at.exception],
+    }
+
+def summarize(results: List[Dict]) -> Dict:
+    seconds = [r["seconds"] for r in results]
+    return {
+        "runs": len(results),
+        "p50_s": round(statistics.median(seconds), 3),
+        "max_s": round(max(seconds), 3),
+        "requests": results[-1]["requests"],
+        "kbytes": round(results[-1]["bytes"] / 1024, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das páginas contra o Netbox simulado")
+    add_server_arguments(parser)
+    parser.add_argument("--tenant-id", type=int, default=1, help="Tenant usado nos cenários")
+    parser.add_argument("--runs", type=int, default=3, help="Execuções por cenário (cada uma em sessão nova)")
+    parser.add_argument("--scenario", action="append", help="Executa só os cenários informados")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Tempo máximo por execução do app (s)")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args()
+
+    dataset, behavior = config_from_args(args)
+    server = FakeNetboxServer(dataset=dataset, behavior=behavior).start()
+
+    # Precisa acontecer antes de importar config.settings (lido na importação)
+    os.environ["NETBOX_URL"] = server.api_url
+    os.environ["API_TOKEN"] = "benchmark"
+    os.environ.pop("NETBOX_GRAPHQL_URL", None)
+    os.chdir(BASE_DIR)
+    # Avisos de "missing ScriptRunContext" emitidos fora da execução do AppTest
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+
+    # Cópias locais (stale-while-revalidate) em diretório temporário
+    from services.snapshot_store import SNAPSHOTS
+    SNAPSHOTS.directory = Path(tempfile.mkdtemp(prefix="netbox_snapshots_"))
+
+    scenarios = build_scenarios(server, args.tenant_id)
+    selected = args.scenario or list(scenarios)
+
+    report = {"dataset": server.dataset.summary(), "behavior": vars(behavior), "scenarios": {}}
+    try:
+        for name in selected:
+            reset_process_caches()
+            cold = run_scenario(server, scenarios[name], args.timeout)
+            warm = [run_scenario(server, scenarios[name], args.timeout) for _ in range(max(args.runs - 1, 0))]
+            report["scenarios"][name] = {
+                "cold": summarize([cold]),
+                "warm": summarize(warm) if warm else None,
+                "cold_by_endpoint": cold["by_endpoint"],
+                "errors": cold["errors"] + cold["exceptions"],
+            }
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+
+    print(f"Dataset: {report['dataset']}")
+    print(f"{'cenário':<26} {'fria (s)':>9} {'req':>6} {'KB':>10} {'quente p50 (s)':>15} {'req':>6}")
+    for name, result in report["scenarios"].items():
+        cold, warm = result["cold"], result["warm"] or {}
+        print(
+            f"{name:<26} {cold['p50_s']:>9} {cold['requests']:>6} {cold['kbytes']:>10} "
+            f"{warm.get('p50_s', '-'):>15} {warm.get('requests', '-'):>6}"
+        )
+        for error in result["errors"]:
+            print(f"    ! {str(error)[:120]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark da agregação de prefixos
+
+Gera listas sintéticas (mistura de IPv4 e IPv6, com prefixos contidos e
+irmãos adjacentes) e mede remove_covered e aggregate em cada tamanho. O
+algoritmo antigo (comparação de todos os pares) só roda até --legacy-max.
+
+Uso:
+    python -m bench.prefix_aggregation --sizes 1000 100000 1000000
+"""
+import argparse
+import ipaddress
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from services.prefix_aggregation import aggregate, format_prefix, remove_covered
+
+def generate_prefixes(count: int, ipv6_ratio: float = 0.2, seed: int = 42) -> List[str]:
+    """Prefixos de um 'cone de clientes': blocos /16-/24 (v4) e /32-/48 (v6) com sub-redes deles"""
+    rng = random.Random(seed)
+    prefixes = []
+    while len(prefixes) < count:
+        family = 6 if rng.random() < ipv6_ratio else 4
+        bits, lengths = (128, (32, 48)) if family == 6 else (32, (16, 24))
+        length = rng.randint(*lengths)
+        start = rng.getrandbits(length) << (bits - length)
+        prefixes.append(format_prefix(family, start, length))
+        # Alguns mais específicos dentro do bloco e, às vezes, o par completo
+        for _ in range(rng.randint(0, 3)):
+            sub = min(length + rng.randint(1, 4), bits)
+            offset = rng.getrandbits(sub - length) << (bits - sub)
+            prefixes.append(format_prefix(family, start + offset, sub))
+            if rng.random() < 0.3:
+                prefixes.append(format_prefix(family, (start + offset) ^ (1 << (bits - sub)), sub))
+    prefixes = prefixes[:count]
+    rng.shuffle(prefixes)
+    return prefixes
+
+def legacy_filter(prefixes: List[str]) -> List[str]:
+    """Implementação anterior de ConfigService.filter_less_specific_prefixes (O(n²))"""
+    networks = [ipaddress.ip_network(prefix) for prefix in prefixes]
+    return [
+        str(net) for net in networks
+        if not any(net.version == other.version and net.subnet_of(other) for other in networks if net != other)
+    ]
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da agregação de prefixos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--ipv6-ratio", type=float, default=0.2)
+    parser.add_argument("--legacy-max", type=int, default=2000, help="Maior tamanho em que o algoritmo antigo é medido")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'prefixos':>10} {'remove_covered':>15} {'aggregate':>12} {'antigo':>10} {'restantes':>10} {'agregados':>10}")
+    for size in args.sizes:
+        prefixes = generate_prefixes(size, args.ipv6_ratio, args.seed)
+        kept, t_covered = _timed(remove_covered, prefixes)
+        merged, t_aggregate = _timed(aggregate, prefixes)
+
+        legacy = "-"
+        if size <= args.legacy_max:
+            expected, t_legacy = _timed(legacy_filter, prefixes)
+            # O antigo mantém repetições; o resultado deve ser o mesmo conjunto
+            assert set(expected) == set(kept), "resultado difere do algoritmo antigo"
+            legacy = f"{t_legacy:.3f}s"
+
+        print(f"{size:>10} {t_covered:>14.3f}s {t_aggregate:>11.3f}s {legacy:>10} {len(kept):>10} {len(merged):>10}")
+
+if __name__ == "__main__":
+    main()
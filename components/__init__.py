@@ -1,5 +1,7 @@
 from .service_tree import ServiceTreeBuilder, ServiceNode
 from .config_forms import ConfigForms
 from .bgp_config import BGPConfigComponent
+from .tenant_picker import TenantPicker
+from .bulk_import_panel import BulkImportPanel
 
-__all__ = ['ServiceTreeBuilder', 'ServiceNode', 'ConfigForms', 'BGPConfigComponent']
\ No newline at end of file
+__all__ = ['ServiceTreeBuilder', 'ServiceNode', 'ConfigForms', 'BGPConfigComponent', 'TenantPicker', 'BulkImportPanel']
\ No newline at end of file
@@ -3,10 +3,11 @@ Componente especializado para configurações BGP
 """
 import streamlit as st
 from typing import Dict, List, Optional, Tuple, Any
-import requests
 import re
 import ipaddress
 from services.netbox_service import NetboxService
+from services.ripestat_service import OVERVIEW, RipeStatService
+from utils.prefix_array import parse_prefixes
 
 class BGPConfigComponent:
     """Componente para gerenciar configurações BGP"""
@@ -93,7 +94,10 @@ class BGPConfigComponent:
         
         if st.button("✅ Validar Prefixos IPv4", key=f"validate_ipv4_{service_type}"):
             if ipv4_text.strip():
-                valid_prefixes, invalid_prefixes = self._parse_ipv4_prefixes(ipv4_text)
+                valid_prefixes, invalid_prefixes, corrected_prefixes = self._parse_ipv4_prefixes(ipv4_text)
+                
+                if corrected_prefixes:
+                    st.warning(f"⚠️ {len(corrected_prefixes)} prefixos com bits de host foram ajustados para o endereço de rede: {', '.join(corrected_prefixes[:5])}")
                 
                 if valid_prefixes:
                     st.session_state[ipv4_key] = valid_prefixes
@@ -130,7 +134,10 @@ class BGPConfigComponent:
         
         if st.button("✅ Validar Prefixos IPv6", key=f"validate_ipv6_{service_type}"):
             if ipv6_text.strip():
-                valid_prefixes, invalid_prefixes = self._parse_ipv6_prefixes(ipv6_text)
+                valid_prefixes, invalid_prefixes, corrected_prefixes = self._parse_ipv6_prefixes(ipv6_text)
+                
+                if corrected_prefixes:
+                    st.warning(f"⚠️ {len(corrected_prefixes)} prefixos com bits de host foram ajustados para o endereço de rede: {', '.join(corrected_prefixes[:5])}")
                 
                 if valid_prefixes:
                     st.session_state[ipv6_key] = valid_prefixes
@@ -329,56 +336,19 @@ class BGPConfigComponent:
         return communities
     
     def _lookup_asn_info(self, asn: str) -> str:
-        """Busca informações do ASN via API RIPE"""
-        try:
-            asn_num = asn.replace("AS", "").strip()
-            url = f"https://stat.ripe.net/data/as-overview/data.json?resource={asn_num}"
-            
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("data", {}).get("holder", "")
-            
-        except Exception:
-            pass
-        
-        return ""
+        """Busca o titular do ASN via API RIPE (com cache local)"""
+        info = RipeStatService().lookup(asn, parts=(OVERVIEW,))
+        return info.get("holder", "")
     
-    def _parse_ipv4_prefixes(self, text: str) -> Tuple[List[str], List[str]]:
-        """Parse e validação de prefixos IPv4"""
-        pattern = r'\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\/(?:3[0-2]|[1-2]?[0-9])\b'
-        matches = re.findall(pattern, text)
-        
-        valid = []
-        invalid = []
-        
-        for match in matches:
-            try:
-                ipaddress.IPv4Network(match, strict=False)
-                valid.append(match)
-            except:
-                invalid.append(match)
-        
-        return valid, invalid
+    def _parse_ipv4_prefixes(self, text: str) -> Tuple[List[str], List[str], List[str]]:
+        """Parse e validação de prefixos IPv4 (em lote; retorna válidos, inválidos e corrigidos)"""
+        parsed = parse_prefixes(text, family=4)
+        return parsed.texts(), parsed.invalid, parsed.host_bits
     
-    def _parse_ipv6_prefixes(self, text: str) -> Tuple[List[str], List[str]]:
-        """Parse e validação de prefixos IPv6"""
-        # Pattern simplificado para IPv6/CIDR
-        pattern = r'\b(?:[0-9a-fA-F]{1,4}:){1,7}[0-9a-fA-F]{0,4}\/(?:12[0-8]|1[0-1][0-9]|[1-9]?[0-9])\b'
-        matches = re.findall(pattern, text)
-        
-        valid = []
-        invalid = []
-        
-        for match in matches:
-            try:
-                ipaddress.IPv6Network(match, strict=False)
-                valid.append(match)
-            except:
-                invalid.append(match)
-        
-        return valid, invalid
+    def _parse_ipv6_prefixes(self, text: str) -> Tuple[List[str], List[str], List[str]]:
+        """Parse e validação de prefixos IPv6 (em lote; retorna válidos, inválidos e corrigidos)"""
+        parsed = parse_prefixes(text, family=6)
+        return parsed.texts(), parsed.invalid, parsed.host_bits
     
     def _validate_ipv4(self, ip: str) -> bool:
         """Valida endereço IPv4"""
@@ -0,0 +1,100 @@
+import streamlit as st
+import requests
+from services.bulk_import import BulkImporter, SPECS, read_table
+
+class BulkImportPanel:
+    """Upload de planilha, validação e envio em lote de um tipo de objeto ao Netbox"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.spec = SPECS[kind]
+        self.importer = BulkImporter(self.spec)
+
+    def render(self):
+        spec = self.spec
+        st.subheader(f"📦 Importação em Lote de {spec.label}")
+        st.markdown(
+            f"Envie um CSV ou XLSX com as colunas **{', '.join(spec.columns)}** "
+            f"(obrigatórias: {', '.join(spec.required)}). Referências a outros objetos usam o *slug*. "
+            f"Linhas que já existem no Netbox (mesmo {' + '.join(spec.key_fields)}) são atualizadas."
+        )
+        st.download_button(
+            "⬇️ Baixar modelo CSV",
+            data=spec.template_csv(),
+            file_name=f"modelo_{self.kind}.csv",
+            mime="text/csv",
+            key=f"bulk_template_{self.kind}"
+        )
+
+        uploaded = st.file_uploader("Planilha", type=["csv", "xlsx"], key=f"bulk_file_{self.kind}")
+        if uploaded is None:
+            return
+
+        state_key = f"bulk_validated_{self.kind}"
+        file_id = f"{uploaded.name}:{uploaded.size}"
+        if st.session_state.get(f"{state_key}_file") != file_id:
+            try:
+                raw = read_table(uploaded)
+                with st.spinner("Validando planilha..."):
+                    st.session_state[state_key] = self.importer.validate(raw)
+                st.session_state[f"{state_key}_file"] = file_id
+            except requests.exceptions.RequestException as e:
+                st.error(f"❌ Erro ao consultar o Netbox durante a validação: {str(e)}")
+                return
+            except Exception as e:
+                st.error(f"❌ Não foi possível ler a planilha: {str(e)}")
+                return
+
+        validated = st.session_state[state_key]
+        self._render_validation(validated)
+
+        valid_count = int((validated["erros"] == "").sum())
+        if valid_count and st.button(f"🚀 Enviar {valid_count} linha(s) ao Netbox", type="primary", key=f"bulk_submit_{self.kind}"):
+            progress = st.progress(0.0, text="Enviando...")
+            report = self.importer.submit(
+                validated,
+                on_progress=lambda done, total: progress.progress(done / total, text=f"{done}/{total} linhas enviadas")
+            )
+            progress.empty()
+            st.session_state.pop(f"{state_key}_file", None)
+            self._render_report(report)
+
+    def _render_validation(self, validated):
+        invalid = validated[validated["erros"] != ""]
+        new_rows = int(((validated["erros"] == "") & (validated["acao"] == "criar")).sum())
+        updates = int(((validated["erros"] == "") & (validated["acao"] == "atualizar")).sum())
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Novos", new_rows)
+        with col2:
+            st.metric("Atualizações", updates)
+        with col3:
+            st.metric("Com erro", len(invalid))
+
+        if validated.attrs.get("ignored_columns"):
+            st.caption(f"Colunas ignoradas: {', '.join(validated.attrs['ignored_columns'])}")
+
+        if len(invalid):
+            st.warning("⚠️ Linhas com erro não serão enviadas:")
+            st.dataframe(invalid[["linha"] + self.spec.columns + ["erros"]], hide_index=True, use_container_width=True)
+
+        with st.expander("🔍 Pré-visualização"):
+            st.dataframe(validated.drop(columns=["erros"]), hide_index=True, use_container_width=True)
+
+    def _render_report(self, report):
+        ok = int((report["status"] == "ok").sum())
+        failed = len(report) - ok
+        if failed:
+            st.warning(f"⚠️ {ok} linha(s) gravada(s), {failed} com erro")
+        else:
+            st.success(f"✅ {ok} linha(s) gravada(s) no Netbox")
+
+        st.dataframe(report, hide_index=True, use_container_width=True)
+        st.download_button(
+            "⬇️ Baixar relatório",
+            data=report.to_csv(index=False).encode("utf-8"),
+            file_name=f"relatorio_{self.kind}.csv",
+            mime="text/csv",
+            key=f"bulk_report_{self.kind}"
+        )
@@ -1,15 +1,29 @@
 import streamlit as st
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 import re
 import requests
 import ipaddress
+import pandas as pd
 from services.netbox_service import NetboxService
+from services.ripestat_service import SOURCE_LOCAL, RipeStatService, empty_asn_info, format_as_of, merge_part, normalize_asn
+from services import rpki_validator
+from services.rpki_validator import VRPS
+from services.irr_index import IRR
+from services.bogon_filter import BOGONS
+from services import max_prefix
 
 class ConfigForms:
     """Gerencia todos os formulários de configuração com lógica completa"""
     
+    # Serviços cujas listas PREFIX-PREFERENCE passam pela validação RPKI
+    RPKI_SERVICE_TYPES = ("cliente_transito", "upstream_comm")
+    
+    # Serviços em que o par anuncia só o próprio cone: max-prefix pelo histórico do ASN remoto
+    MAX_PREFIX_SERVICE_TYPES = ("cliente_transito", "cdn_comm")
+    
     def __init__(self):
         self.netbox = NetboxService()
+        self.ripestat = RipeStatService()
     
     # Padrões de validação
     IPV4_PATTERN = r"(\b25[0-5]|\b2[0-4][0-9]|\b[01]?[0-9][0-9]?)(\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)){3}"
@@ -38,74 +52,61 @@ class ConfigForms:
         Returns:
             Dict com informações do ASN e prefixos
         """
-        try:
-            if asn.startswith("AS"):
-                asn_num = asn[2:]
-            else:
-                asn_num = asn
-            
-            # Informações básicas do ASN
-            url_overview = f"https://stat.ripe.net/data/as-overview/data.json?resource={asn_num}"
-            response_overview = requests.get(url_overview, timeout=10)
-            
-            asn_info = {
-                "holder": "",
-                "country": "",
-                "ipv4_prefixes": [],
-                "ipv6_prefixes": [],
-                "success": False
-            }
-            
-            if response_overview.status_code == 200:
-                data_overview = response_overview.json()
-                asn_data = data_overview.get("data", {})
-                asn_info["holder"] = asn_data.get("holder", "")
-                asn_info["country"] = asn_data.get("country", "")
-                asn_info["success"] = True
-            
-            # Buscar prefixos anunciados pelo ASN
-            url_prefixes = f"https://stat.ripe.net/data/announced-prefixes/data.json?resource={asn_num}"
-            response_prefixes = requests.get(url_prefixes, timeout=15)
-            
-            if response_prefixes.status_code == 200:
-                data_prefixes = response_prefixes.json()
-                prefixes = data_prefixes.get("data", {}).get("prefixes", [])
-                
-                # Separar IPv4 e IPv6
-                for prefix_info in prefixes:
-                    prefix = prefix_info.get("prefix", "")
-                    
-                    if ":" in prefix:
-                        # IPv6
-                        asn_info["ipv6_prefixes"].append(prefix)
-                    else:
-                        # IPv4
-                        asn_info["ipv4_prefixes"].append(prefix)
-            
-            return asn_info
-            
-        except requests.RequestException as e:
-            st.error(f"Erro de rede ao buscar ASN: {str(e)}")
-            return {"success": False, "error": str(e)}
-        except Exception as e:
-            st.error(f"Erro ao processar dados do ASN: {str(e)}")
-            return {"success": False, "error": str(e)}
+        info = self.ripestat.lookup(asn)
+        for error in info.get("errors", []):
+            st.error(f"Erro de rede ao buscar ASN: {error}")
+        return info
 
-    def _lookup_multiple_asns(self, asn_local: str, asn_remoto: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    def _lookup_multiple_asns(
+        self,
+        asn_local: str,
+        asn_remoto: str,
+        on_update: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Busca informações de múltiplos ASNs
         
+        As quatro consultas (overview e prefixos de cada ASN) são feitas em
+        paralelo; a espera total é a da consulta mais lenta.
+        
         Args:
             asn_local: ASN local
             asn_remoto: ASN remoto
+            on_update: Chamado com ('local'|'remoto', info parcial) a cada resposta
             
         Returns:
             Tupla com (info_local, info_remoto)
         """
-        info_local = self._lookup_asn_info(asn_local)
-        info_remoto = self._lookup_asn_info(asn_remoto)
+        roles = {"local": normalize_asn(asn_local), "remoto": normalize_asn(asn_remoto)}
+        infos = {asn: empty_asn_info() for asn in roles.values()}
+        
+        for asn, part, result in self.ripestat.iter_lookups(list(roles.values())):
+            merge_part(infos[asn], part, result)
+            if on_update:
+                for role, role_asn in roles.items():
+                    if role_asn == asn:
+                        on_update(role, infos[asn])
         
-        return info_local, info_remoto
+        # ASNs iguais compartilham a consulta, mas cada papel recebe sua cópia
+        return dict(infos[roles["local"]]), dict(infos[roles["remoto"]])
+
+    def _get_site_devices(self, tenant_sites: List[Dict], site_id: int) -> List[Dict]:
+        """Retorna os dispositivos do site, usando o inventário do tenant quando disponível"""
+        site = next((s for s in tenant_sites if s["id"] == site_id), None)
+        if site is not None and "devices" in site:
+            return site["devices"]
+        return self.netbox.get_devices(site_id=site_id, fields=NetboxService.DEVICE_FIELDS)
+
+    def _get_device_interfaces(self, tenant_sites: List[Dict], device_id: int) -> List[Dict]:
+        """Retorna as interfaces do dispositivo, usando o inventário do tenant ou a pré-carga do site"""
+        for site in tenant_sites:
+            for device in site.get("devices", []):
+                if device["id"] == device_id and "interfaces" in device:
+                    return device["interfaces"]
+        preloaded = self.netbox.get_preloaded_interfaces(device_id)
+        if preloaded is not None:
+            return preloaded
+        return self.netbox.get_device_interfaces(device_id, fields=NetboxService.INTERFACE_FIELDS)
 
     def _render_device_selection(self, tenant_sites: List[Dict], key_suffix: str = "", allow_multiple_interfaces: bool = False) -> Optional[Tuple[int, int, List[int]]]:
         """Renderiza seleção de dispositivo comum
@@ -128,12 +129,16 @@ class ConfigForms:
             key=f"device_site{key_suffix}"
         )
         
-        site_devices = self.netbox.get_devices(site_id=selected_site)
+        site_devices = self._get_site_devices(tenant_sites, selected_site)
         
         if not site_devices:
             st.warning("⚠️ Nenhum dispositivo encontrado neste site")
             return None
         
+        # Sem inventário, pré-carrega as interfaces de todo o site em uma única listagem
+        if not all("interfaces" in device for device in site_devices):
+            self.netbox.preload_site_interfaces(selected_site, [d["id"] for d in site_devices])
+        
         col1, col2 = st.columns([0.75, 0.25])
         
         with col1:
@@ -156,7 +161,7 @@ class ConfigForms:
             )
         
         if selected_device:
-            interfaces = self.netbox.get_device_interfaces(selected_device)
+            interfaces = self._get_device_interfaces(tenant_sites, selected_device)
             
             if interfaces:
                 # Filtrar apenas interfaces ativas
@@ -273,31 +278,34 @@ class ConfigForms:
         # Botão para buscar informações dos ASNs
         if asn_local and asn_remoto and st.button("🔍 Buscar Informações e Prefixos dos ASNs", key=f"lookup_asns_{service_type}"):
             
-            # Mostrar spinner durante a busca
-            with st.spinner("Buscando informações dos ASNs e prefixos..."):
-                info_local, info_remoto = self._lookup_multiple_asns(asn_local, asn_remoto)
-                
-                # Salvar informações na sessão
-                st.session_state[f'asn_local_info_{service_type}'] = info_local
-                st.session_state[f'asn_remoto_info_{service_type}'] = info_remoto
-                
-                if info_local.get("success"):
-                    st.success(f"✅ **ASN Local encontrado:** {info_local.get('holder', 'N/A')}")
-                    if info_local.get('ipv4_prefixes'):
-                        st.info(f"📡 **IPv4 Prefixos (Local):** {len(info_local['ipv4_prefixes'])} encontrados")
-                    if info_local.get('ipv6_prefixes'):
-                        st.info(f"🌐 **IPv6 Prefixos (Local):** {len(info_local['ipv6_prefixes'])} encontrados")
-                else:
-                    st.warning("⚠️ Não foi possível obter informações do ASN Local")
-                
-                if info_remoto.get("success"):
-                    st.success(f"✅ **ASN Remoto encontrado:** {info_remoto.get('holder', 'N/A')}")
-                    if info_remoto.get('ipv4_prefixes'):
-                        st.info(f"📡 **IPv4 Prefixos (Remoto):** {len(info_remoto['ipv4_prefixes'])} encontrados")
-                    if info_remoto.get('ipv6_prefixes'):
-                        st.info(f"🌐 **IPv6 Prefixos (Remoto):** {len(info_remoto['ipv6_prefixes'])} encontrados")
-                else:
-                    st.warning("⚠️ Não foi possível obter informações do ASN Remoto")
+            # Resultados parciais exibidos conforme cada consulta responde
+            placeholders = {"local": st.empty(), "remoto": st.empty()}
+            labels = {"local": "Local", "remoto": "Remoto"}
+            for role, placeholder in placeholders.items():
+                placeholder.info(f"⏳ Buscando ASN {labels[role]}...")
+            
+            def show_partial(role: str, info: Dict[str, Any]):
+                lines = []
+                if info.get("success"):
+                    lines.append(f"✅ **ASN {labels[role]} encontrado:** {info.get('holder', 'N/A')}")
+                if info.get('ipv4_prefixes'):
+                    lines.append(f"📡 **IPv4 Prefixos ({labels[role]}):** {len(info['ipv4_prefixes'])} encontrados")
+                if info.get('ipv6_prefixes'):
+                    lines.append(f"🌐 **IPv6 Prefixos ({labels[role]}):** {len(info['ipv6_prefixes'])} encontrados")
+                if lines:
+                    placeholders[role].success("  \n".join(lines))
+            
+            info_local, info_remoto = self._lookup_multiple_asns(asn_local, asn_remoto, on_update=show_partial)
+            
+            # Salvar informações na sessão
+            st.session_state[f'asn_local_info_{service_type}'] = info_local
+            st.session_state[f'asn_remoto_info_{service_type}'] = info_remoto
+            
+            for role, info in (("local", info_local), ("remoto", info_remoto)):
+                for error in info.get("errors", []):
+                    st.error(f"Erro de rede ao buscar ASN {labels[role]}: {error}")
+                if not info.get("success"):
+                    placeholders[role].warning(f"⚠️ Não foi possível obter informações do ASN {labels[role]}")
         
         # Exibir informações salvas na sessão
         info_local = st.session_state.get(f'asn_local_info_{service_type}', {})
@@ -309,7 +317,9 @@ class ConfigForms:
                 st.info(f"**ASN Remoto:** {asn_name}")
         
         # Seção de seleção de prefixos
-        if info_local.get("success") or info_remoto.get("success"):
+        # Sem o RIPEstat, os prefixos podem vir só da base local
+        has_prefixes = any(info.get(k) for info in (info_local, info_remoto) for k in ("ipv4_prefixes", "ipv6_prefixes"))
+        if info_local.get("success") or info_remoto.get("success") or has_prefixes:
             st.markdown("### 📊 Seleção de Prefixos")
             
             # Determinar qual ASN usar para prefixos baseado no tipo de serviço
@@ -323,6 +333,10 @@ class ConfigForms:
                 source_label = "Local"
             
             st.info(f"ℹ️ **Usando prefixos do ASN {source_label}**")
+            if source_info.get("source") == SOURCE_LOCAL:
+                st.caption(f"🕒 RIPEstat indisponível: prefixos do índice local de {format_as_of(source_info.get('local_as_of'))}")
+            elif source_info.get("as_of"):
+                st.caption(f"🕒 Dados do RIPEstat de {format_as_of(source_info['as_of'])}")
             
             # IPv4 Prefixes
             if source_info.get('ipv4_prefixes'):
@@ -426,7 +440,7 @@ class ConfigForms:
             # Buscar nomes das interfaces selecionadas
             interfaces = []
             try:
-                device_interfaces = self.netbox.get_device_interfaces(selected_device)
+                device_interfaces = self._get_device_interfaces(tenant_sites, selected_device)
                 interface_dict = {iface["id"]: iface for iface in device_interfaces}
                 
                 for interface_id in selected_interfaces:
@@ -512,7 +526,7 @@ class ConfigForms:
             
             # Buscar nomes das interfaces
             try:
-                interfaces_a = self.netbox.get_device_interfaces(selected_device_a)
+                interfaces_a = self._get_device_interfaces(tenant_sites, selected_device_a)
                 for iface in interfaces_a:
                     if iface["id"] == selected_interface_a:
                         interface_name_a = iface["name"]
@@ -521,7 +535,7 @@ class ConfigForms:
                 pass
             
             try:
-                interfaces_b = self.netbox.get_device_interfaces(selected_device_b)
+                interfaces_b = self._get_device_interfaces(tenant_sites, selected_device_b)
                 for iface in interfaces_b:
                     if iface["id"] == selected_interface_b:
                         interface_name_b = iface["name"]
@@ -532,7 +546,7 @@ class ConfigForms:
             # Buscar nomes dos dispositivos
             try:
                 for site in tenant_sites:
-                    site_devices = self.netbox.get_devices(site_id=site["id"])
+                    site_devices = self._get_site_devices(tenant_sites, site["id"])
                     for device in site_devices:
                         if device["id"] == selected_device_a:
                             device_name_a = device["name"]
@@ -574,6 +588,315 @@ class ConfigForms:
         
         return None
 
+    def render_l2vpn_ptmp_form(self, tenant_sites: List[Dict]) -> Optional[Dict[str, Any]]:
+        """Formulário para L2VPN Point-to-Multipoint (VPLS LDP)"""
+        st.markdown("## 🔧 Configuração L2VPN - Point to Multipoint")
+        st.markdown("---")
+        
+        col1, col2, col3 = st.columns([0.35, 0.50, 0.15])
+        with col1:
+            customer_name = st.text_input(
+                "Nome da VPLS *",
+                placeholder="PTMP-100-FULANO",
+                key="customer_name_l2vpn_ptmp"
+            )
+        with col2:
+            description = st.text_input(
+                "Descrição",
+                placeholder="Descreva o serviço e o cliente",
+                key="description_l2vpn_ptmp"
+            )
+        with col3:
+            vpls_id = st.number_input("VPLS ID *", min_value=1, max_value=40000000, step=1, key="vpls_id_l2vpn_ptmp")
+        
+        if not customer_name:
+            st.warning("⚠️ Informe o nome da VPLS")
+            return None
+        
+        # Site A
+        st.markdown("### 📍 Site A")
+        device_selection_a = self._render_device_selection(tenant_sites, key_suffix="_ptmp_a")
+        if not device_selection_a:
+            return None
+        
+        selected_device_a, vlan_id, selected_interface_a = device_selection_a
+        site_a = st.session_state.get("device_site_ptmp_a")
+        
+        # Demais sites: um dispositivo e uma interface por site
+        st.markdown("### 📍 Demais Sites")
+        site_options_b = {site["id"]: site["name"] for site in tenant_sites if site["id"] != site_a}
+        selected_sites_b = st.multiselect(
+            "Sites *",
+            options=list(site_options_b.keys()),
+            format_func=lambda sid: site_options_b[sid],
+            key="sites_b_l2vpn_ptmp"
+        )
+        if not selected_sites_b:
+            st.warning("⚠️ Selecione pelo menos um site")
+            return None
+        
+        sites_b = []
+        for site_id in selected_sites_b:
+            site_devices = self._get_site_devices(tenant_sites, site_id)
+            if not site_devices:
+                st.warning(f"⚠️ Nenhum dispositivo encontrado no site {site_options_b[site_id]}")
+                return None
+            if not all("interfaces" in device for device in site_devices):
+                self.netbox.preload_site_interfaces(site_id, [d["id"] for d in site_devices])
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                device_dict = {d["id"]: d["name"] for d in site_devices}
+                device_id = st.selectbox(
+                    f"Dispositivo ({site_options_b[site_id]}) *",
+                    options=list(device_dict.keys()),
+                    format_func=lambda did: device_dict[did],
+                    key=f"device_ptmp_b_{site_id}"
+                )
+            with col2:
+                interfaces = [i for i in self._get_device_interfaces(tenant_sites, device_id) if i.get("enabled", True)]
+                interface_dict = {i["id"]: i["name"] for i in interfaces}
+                interface_id = st.selectbox(
+                    f"Interface ({site_options_b[site_id]}) *",
+                    options=list(interface_dict.keys()),
+                    format_func=lambda iid: interface_dict[iid],
+                    key=f"interface_ptmp_b_{site_id}"
+                )
+            if not interface_id:
+                return None
+            sites_b.append({
+                "site_id": site_id,
+                "site_name": site_options_b[site_id],
+                "device_id": device_id,
+                "device_name": device_dict[device_id],
+                "interface_id": interface_id,
+                "interface_name": interface_dict[interface_id],
+            })
+        
+        if st.button("🎯 Gerar Configuração L2VPN PtMP", type="primary"):
+            # Loopbacks (IP primário) de todos os dispositivos em uma única resolução em lote
+            device_ids = [selected_device_a] + [site["device_id"] for site in sites_b]
+            primary_ips = self.netbox.get_devices_primary_ips(device_ids)
+            for site in sites_b:
+                site["loopback"] = primary_ips[site["device_id"]]["primary"]
+            loopback_a = primary_ips[selected_device_a]["primary"]
+            
+            without_loopback = [site["device_name"] for site in sites_b if not site["loopback"]]
+            if not loopback_a:
+                without_loopback.insert(0, f"Device-{selected_device_a}")
+            if without_loopback:
+                st.error(f"⚠️ Dispositivo(s) sem IP primário no Netbox: {', '.join(without_loopback)}")
+                return None
+            
+            device_name_a = next(
+                (d["name"] for d in self._get_site_devices(tenant_sites, site_a) if d["id"] == selected_device_a),
+                f"Device-{selected_device_a}"
+            )
+            interface_name_a = next(
+                (i["name"] for i in self._get_device_interfaces(tenant_sites, selected_device_a) if i["id"] == selected_interface_a[0]),
+                f"Interface-{selected_interface_a[0]}"
+            )
+            
+            return {
+                "service_type": "l2vpn_ptmp",
+                "customer_name": customer_name,
+                "description": description or customer_name,
+                "vpls_id": vpls_id,
+                "vlan_id": vlan_id,
+                "device_name_a": device_name_a,
+                "selected_interface_a": interface_name_a,
+                "loopback_a": loopback_a,
+                "sites_b": sites_b,
+                "site_b_loopbacks": [site["loopback"] for site in sites_b],
+            }
+        
+        return None
+
+    def _render_bogon_filter(
+        self,
+        service_type: str,
+        ipv4_prefixes: List[str],
+        ipv6_prefixes: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Aponta bogons, martians e prefixos mais específicos que /24 (IPv4) ou
+        /48 (IPv6) e, por padrão, os remove antes das prefix-lists
+        
+        Returns:
+            Tupla com (ipv4_prefixes, ipv6_prefixes) a usar na configuração
+        """
+        # Chaves no texto de entrada: '10.0.0.1/8' também sai da lista
+        _, flagged = BOGONS.filter(ipv4_prefixes + ipv6_prefixes)
+        if not flagged:
+            return ipv4_prefixes, ipv6_prefixes
+        
+        st.warning(f"⚠️ {len(flagged)} prefixo(s) bogon, martian ou muito específico(s) (lista: {BOGONS.source})")
+        with st.expander("Ver prefixos rejeitados"):
+            st.dataframe(
+                pd.DataFrame(sorted(flagged.items()), columns=["Prefixo", "Motivo"]),
+                hide_index=True,
+                use_container_width=True
+            )
+        if st.checkbox("Excluir bogons e martians da configuração", value=True, key=f"bogon_exclude_{service_type}"):
+            ipv4_prefixes = [p for p in ipv4_prefixes if p not in flagged]
+            ipv6_prefixes = [p for p in ipv6_prefixes if p not in flagged]
+        return ipv4_prefixes, ipv6_prefixes
+
+    def _render_rpki_validation(
+        self,
+        service_type: str,
+        origin: str,
+        ipv4_prefixes: List[str],
+        ipv6_prefixes: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Valida (prefixo, origem) contra os VRPs locais e, se pedido, remove os inválidos
+        
+        Returns:
+            Tupla com (ipv4_prefixes, ipv6_prefixes) a usar na configuração
+        """
+        st.markdown("### 🛡️ Validação RPKI")
+        try:
+            if not VRPS.load():
+                st.caption("ℹ️ Nenhum arquivo de VRPs configurado (RPKI_VRP_FILE ou data/vrps.json); validação RPKI desativada")
+                return ipv4_prefixes, ipv6_prefixes
+            results = VRPS.validate_many(ipv4_prefixes + ipv6_prefixes, origin)
+        except (OSError, ValueError) as e:
+            st.error(f"Erro na validação RPKI: {str(e)}")
+            return ipv4_prefixes, ipv6_prefixes
+        
+        states = {r["prefix"]: r["state"] for r in results}
+        counts = {
+            state: sum(1 for r in results if r["state"] == state)
+            for state in (rpki_validator.VALID, rpki_validator.INVALID, rpki_validator.NOT_FOUND, rpki_validator.MALFORMED)
+        }
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("✅ Válidos", counts[rpki_validator.VALID])
+        with col2:
+            st.metric("❌ Inválidos", counts[rpki_validator.INVALID])
+        with col3:
+            st.metric("❔ Sem ROA", counts[rpki_validator.NOT_FOUND])
+        with col4:
+            st.metric("⚠️ Ilegíveis", counts[rpki_validator.MALFORMED])
+        skipped = f" ({VRPS.skipped} linha(s) malformada(s) ignorada(s))" if VRPS.skipped else ""
+        st.caption(f"{VRPS.count} VRPs de {VRPS.source.name}{skipped}, origem AS{normalize_asn(origin)}")
+        
+        with st.expander("🔍 Resultado por prefixo", expanded=counts[rpki_validator.INVALID] + counts[rpki_validator.MALFORMED] > 0):
+            st.dataframe(
+                pd.DataFrame(
+                    [(r["prefix"], r["state"], r.get("error") or ", ".join(r["vrps"])) for r in results],
+                    columns=["Prefixo", "Estado", "VRPs"]
+                ),
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        if counts[rpki_validator.MALFORMED]:
+            malformed = [r["prefix"] for r in results if r["state"] == rpki_validator.MALFORMED]
+            st.warning(f"⚠️ {len(malformed)} prefixo(s) ilegível(is), não validado(s): {', '.join(malformed)}")
+        
+        if counts[rpki_validator.INVALID]:
+            st.warning(f"⚠️ {counts[rpki_validator.INVALID]} prefixo(s) RPKI inválido(s) para a origem AS{normalize_asn(origin)}")
+            if st.checkbox("Excluir prefixos RPKI inválidos da configuração", value=False, key=f"rpki_exclude_{service_type}"):
+                ipv4_prefixes = [p for p in ipv4_prefixes if states[p] != rpki_validator.INVALID]
+                ipv6_prefixes = [p for p in ipv6_prefixes if states[p] != rpki_validator.INVALID]
+        
+        return ipv4_prefixes, ipv6_prefixes
+
+    def _render_irr_verification(
+        self,
+        service_type: str,
+        asn_remoto: str,
+        ipv4_prefixes: List[str],
+        ipv6_prefixes: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Confere se os prefixos do cliente têm route/route6 no IRR local, para o
+        ASN do cliente ou para os ASNs do seu AS-SET
+        
+        Returns:
+            Tupla com (ipv4_prefixes, ipv6_prefixes) a usar na configuração
+        """
+        st.markdown("### 📚 Verificação IRR")
+        if not IRR.available():
+            st.caption("ℹ️ Índice IRR local não importado (python -m services.irr_index <dumps>); verificação desativada")
+            return ipv4_prefixes, ipv6_prefixes
+        
+        as_set = st.text_input(
+            "AS-SET do cliente (opcional)",
+            placeholder="AS-CLIENTE",
+            help="Sem AS-SET, vale só o ASN remoto",
+            key=f"irr_as_set_{service_type}"
+        )
+        asns, warnings = IRR.expand_as_set(as_set or f"AS{normalize_asn(asn_remoto)}")
+        if as_set:
+            cone, _ = IRR.customer_cone(as_set)
+            st.caption(
+                f"{as_set.upper()}: {len(asns)} ASNs, {len(cone['ipv4_prefixes'])} prefixos IPv4 e "
+                f"{len(cone['ipv6_prefixes'])} IPv6 registrados"
+            )
+        if warnings:
+            with st.expander(f"⚠️ {len(warnings)} aviso(s) na expansão do AS-SET"):
+                st.write(", ".join(warnings[:50]))
+        
+        registered = IRR.verify(ipv4_prefixes + ipv6_prefixes, asns)
+        missing = [p for p, ok in registered.items() if not ok]
+        if not missing:
+            st.success(f"✅ Todos os {len(registered)} prefixos têm route object no IRR")
+            return ipv4_prefixes, ipv6_prefixes
+        
+        st.warning(f"⚠️ {len(missing)} de {len(registered)} prefixo(s) sem route object para o cliente no IRR")
+        with st.expander("Ver prefixos sem route object"):
+            for prefix in missing:
+                st.code(prefix)
+        if st.checkbox("Excluir prefixos sem route object da configuração", value=False, key=f"irr_exclude_{service_type}"):
+            ipv4_prefixes = [p for p in ipv4_prefixes if registered[p]]
+            ipv6_prefixes = [p for p in ipv6_prefixes if registered[p]]
+        return ipv4_prefixes, ipv6_prefixes
+
+    def _render_max_prefix(self, service_type: str, asn_remoto: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Sugere o max-prefix (route-limit) por família a partir do histórico
+        local de prefixos anunciados pelo ASN remoto; o valor pode ser ajustado
+        
+        Returns:
+            Tupla com (max_prefix_v4, max_prefix_v6); None/0 omite o route-limit
+        """
+        st.markdown("### 🚦 Max-prefix")
+        rec = max_prefix.recommend_for(normalize_asn(asn_remoto))
+        if rec is None:
+            st.caption("ℹ️ Sem contagens de prefixos do ASN remoto no cache; preencha o limite manualmente se desejar")
+            rec = {"ipv4": None, "ipv6": None}
+        else:
+            st.caption(
+                f"Recomendado pelo histórico de {rec['samples']} amostra(s) desde {format_as_of(rec['since'])}: "
+                f"pico × crescimento p{max_prefix.GROWTH_PERCENTILE} em {max_prefix.GROWTH_WINDOW_DAYS} dias "
+                f"(IPv4 {rec['growth_v4']:.2f}×, IPv6 {rec['growth_v6']:.2f}×) + {max_prefix.HEADROOM:.0%} de folga"
+            )
+            if not rec["windows"]:
+                st.caption(f"⚠️ Histórico com menos de {max_prefix.GROWTH_WINDOW_DAYS} dias: só a folga é aplicada")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            max_prefix_v4 = st.number_input(
+                f"Max-prefix IPv4 (anunciados: {rec.get('current_v4', '-')})",
+                min_value=0,
+                value=rec["ipv4"] or 0,
+                help="0 = sem route-limit",
+                key=f"max_prefix_v4_{service_type}"
+            )
+        with col2:
+            max_prefix_v6 = st.number_input(
+                f"Max-prefix IPv6 (anunciados: {rec.get('current_v6', '-')})",
+                min_value=0,
+                value=rec["ipv6"] or 0,
+                help="0 = sem route-limit",
+                key=f"max_prefix_v6_{service_type}"
+            )
+        return int(max_prefix_v4) or None, int(max_prefix_v6) or None
+
     def render_bgp_form(self, service_type: str, tenant_sites: List[Dict]) -> Optional[Dict[str, Any]]:
         """Formulário para configurações BGP com busca automática de prefixos"""
         self._init_session_state()
@@ -618,6 +941,21 @@ class ConfigForms:
             st.warning("⚠️ Por favor, preencha os campos ASN Local e ASN Remoto")
             return None
         
+        # Bogons e martians saem antes das demais validações
+        if ipv4_prefixes or ipv6_prefixes:
+            ipv4_prefixes, ipv6_prefixes = self._render_bogon_filter(service_type, ipv4_prefixes, ipv6_prefixes)
+        
+        # Validação RPKI dos prefixos que entram nas listas PREFIX-PREFERENCE
+        if service_type in self.RPKI_SERVICE_TYPES and (ipv4_prefixes or ipv6_prefixes):
+            origin = asn_remoto if service_type == "cliente_transito" else asn_local
+            ipv4_prefixes, ipv6_prefixes = self._render_rpki_validation(service_type, origin, ipv4_prefixes, ipv6_prefixes)
+        if service_type == "cliente_transito" and (ipv4_prefixes or ipv6_prefixes):
+            ipv4_prefixes, ipv6_prefixes = self._render_irr_verification(service_type, asn_remoto, ipv4_prefixes, ipv6_prefixes)
+        
+        max_prefix_v4, max_prefix_v6 = None, None
+        if service_type in self.MAX_PREFIX_SERVICE_TYPES:
+            max_prefix_v4, max_prefix_v6 = self._render_max_prefix(service_type, asn_remoto)
+        
         # Seleção de dispositivo
         device_selection = self._render_device_selection(tenant_sites, key_suffix=f"_{service_type}")
         if not device_selection:
@@ -698,6 +1036,8 @@ class ConfigForms:
                 "check_md5": check_md5,
                 "md5_v4": md5_v4 if check_md5 else "",
                 "md5_v6": md5_v6 if check_md5 else "",
+                "max_prefix_v4": max_prefix_v4,
+                "max_prefix_v6": max_prefix_v6,
                 "circuito": circuito.zfill(2),  # Usando o valor do campo ID, formatado com dois dígitos
                 **peer_info
             }
@@ -0,0 +1,58 @@
+import streamlit as st
+from typing import Dict, Optional, Tuple
+from services.netbox_service import NetboxService, TENANT_SEARCH_MIN_CHARS
+
+class TenantPicker:
+    """Seletor de cliente com busca no servidor (search-as-you-type)"""
+
+    PLACEHOLDER = "< Selecione o Cliente >"
+
+    def __init__(self, key: str, limit: int = 20):
+        self.key = key
+        self.limit = limit
+        self.netbox = NetboxService()
+
+    def render(self, label: str = "Cliente", selected: Optional[Tuple[int, str]] = None) -> Optional[Tuple[int, str]]:
+        """
+        Renderiza o campo de busca e a lista com os melhores resultados
+
+        Args:
+            label: Rótulo do seletor
+            selected: (id, nome) do cliente já selecionado, mantido entre as buscas
+
+        Returns:
+            Tupla (tenant_id, tenant_name) do cliente escolhido ou None
+        """
+        query = st.text_input(
+            f"🔍 Buscar {label.lower()}",
+            placeholder="Digite parte do nome do cliente...",
+            help=f"Digite pelo menos {TENANT_SEARCH_MIN_CHARS} caracteres",
+            key=f"{self.key}_query"
+        )
+
+        tenant_options: Dict[int, str] = {}
+        if selected:
+            tenant_options[selected[0]] = selected[1]
+
+        if query:
+            matches = self.netbox.search_tenants(query, limit=self.limit)
+            if not matches and len(query.strip()) >= TENANT_SEARCH_MIN_CHARS:
+                st.caption("Nenhum cliente encontrado")
+            for tenant in matches:
+                tenant_options[tenant["id"]] = tenant["name"]
+
+        if not tenant_options:
+            return None
+
+        options = [self.PLACEHOLDER] + list(tenant_options.keys())
+        selected_id = st.selectbox(
+            label,
+            options=options,
+            index=1 if selected else 0,
+            format_func=lambda x: tenant_options[x] if x in tenant_options else x,
+            key=f"{self.key}_select"
+        )
+
+        if selected_id == self.PLACEHOLDER:
+            return None
+        return selected_id, tenant_options[selected_id]
@@ -1,6 +1,6 @@
 import os
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,12 +9,28 @@ load_dotenv()
 class NetboxConfig:
     url: str
     api_token: str
+    graphql_url: Optional[str] = None
+    field_projection: bool = True  # Netbox 4.0+ aceita o parâmetro ?fields=
+    timeout: float = 30.0  # segundos por requisição
+    changefeed_endpoint: str = "extras/object-changes/"  # Netbox 4.1+: core/object-changes/
+    max_concurrency: int = 8  # teto de requisições simultâneas ao host, somando todas as sessões
+    latency_target: float = 2.0  # segundos; respostas mais lentas reduzem a concorrência
+    max_retries: int = 3  # novas tentativas após 429/503
+    stream_json: bool = True  # decodifica listagens projetadas item a item, sem manter a página bruta em memória
     
     @classmethod
     def from_env(cls):
         return cls(
             url=os.getenv('NETBOX_URL'),
-            api_token=os.getenv('API_TOKEN')
+            api_token=os.getenv('API_TOKEN'),
+            graphql_url=os.getenv('NETBOX_GRAPHQL_URL'),
+            field_projection=os.getenv('NETBOX_FIELD_PROJECTION', '1') == '1',
+            timeout=float(os.getenv('NETBOX_TIMEOUT', '30')),
+            changefeed_endpoint=os.getenv('NETBOX_CHANGEFEED_ENDPOINT', 'extras/object-changes/'),
+            max_concurrency=int(os.getenv('NETBOX_MAX_CONCURRENCY', '8')),
+            latency_target=float(os.getenv('NETBOX_LATENCY_TARGET', '2')),
+            max_retries=int(os.getenv('NETBOX_MAX_RETRIES', '3')),
+            stream_json=os.getenv('NETBOX_STREAM_JSON', '1') == '1'
         )
 
 @dataclass
@@ -92,4 +108,9 @@ class AppConfig:
     SIDEBAR_WIDTH_EXPANDED = 280
 
     # Configurações de cache
-    CACHE_TTL = 3600 # 1hora
+    CACHE_TTL = int(os.getenv('CACHE_TTL', 3600)) # 1hora; pode ser maior com o feed de mudanças ativo
+    SNAPSHOT_SOFT_TTL = 300 # 5 minutos: listas servidas da cópia local e atualizadas em segundo plano
+    NETBOX_CHANGEFEED_INTERVAL = float(os.getenv('NETBOX_CHANGEFEED_INTERVAL', 0)) # segundos entre consultas ao changelog (0 = desativado)
+    ASN_CACHE_TTL = int(os.getenv('ASN_CACHE_TTL', 86400)) # 1 dia: dados do RIPEstat servidos do cache local e atualizados em segundo plano
+    RPKI_VRP_FILE = os.getenv('RPKI_VRP_FILE', '') # export JSON/CSV de VRPs (Routinator, rpki-client); padrão data/vrps.json
+    BOGON_FILE = os.getenv('BOGON_FILE', '') # lista de bogons 'prefixo [categoria]' (ex.: fullbogons); padrão data/bogons.txt, senão a lista embutida
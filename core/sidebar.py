@@ -67,36 +67,23 @@ class Sidebar:
     
     def _render_tenant_selector(self):
         """Renderiza o seletor de tenant (cliente) na sidebar"""
-        from services.netbox_service import NetboxService
+        from components.tenant_picker import TenantPicker
         
         #st.markdown("---")
         st.subheader("📋 Seleção de Cliente")
         
-        # Inicializar serviço do Netbox
-        netbox = NetboxService()
+        # Busca no servidor: apenas os melhores resultados são carregados
+        current = None
+        if self.state.get('selected_tenant_id'):
+            current = (self.state.get('selected_tenant_id'), self.state.get('selected_tenant_name'))
         
-        # Buscar tenants
-        with st.spinner("Carregando clientes..."):
-            tenants = netbox.get_tenants()
-        
-        if not tenants:
-            st.error("❌ Nenhum tenant encontrado")
-            return
-        
-        tenant_options = {tenant["id"]: tenant["name"] for tenant in tenants}
-        tenant_list = ["< Selecione o Cliente >"] + list(tenant_options.keys())
-        
-        selected_tenant_id = st.selectbox(
-            "Cliente",
-            options=tenant_list,
-            format_func=lambda x: tenant_options[x] if x in tenant_options else x,
-            key="tenant_selector_main"
-        )
+        selection = TenantPicker(key="tenant_selector_main").render("Cliente", selected=current)
         
         # Armazenar o tenant selecionado no estado da sessão
-        if selected_tenant_id != "< Selecione o Cliente >":
+        if selection:
+            selected_tenant_id, selected_tenant_name = selection
             self.state.set('selected_tenant_id', selected_tenant_id)
-            self.state.set('selected_tenant_name', tenant_options[selected_tenant_id])
+            self.state.set('selected_tenant_name', selected_tenant_name)
     
     def _render_service_tree(self):
         """Renderiza a árvore de serviços na sidebar"""
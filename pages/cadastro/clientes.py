@@ -1,6 +1,7 @@
 import streamlit as st
 from services.netbox_service import NetboxService
 from core.session_state import SessionStateManager
+from components.bulk_import_panel import BulkImportPanel
 
 def render():
     """Renderiza a página de cadastro de clientes"""
@@ -9,13 +10,16 @@ def render():
     st.markdown("Gerencie os clientes cadastrados no sistema")
     
     # Tabs para organizar cadastro e listagem
-    tab_list, tab_new = st.tabs(["📋 Listar Clientes", "➕ Novo Cliente"])
+    tab_list, tab_new, tab_bulk = st.tabs(["📋 Listar Clientes", "➕ Novo Cliente", "📦 Importação em Lote"])
     
     with tab_list:
         _render_client_list()
     
     with tab_new:
         _render_new_client_form()
+    
+    with tab_bulk:
+        BulkImportPanel("tenants").render()
 
 def _render_client_list():
     """Renderiza a lista de clientes"""
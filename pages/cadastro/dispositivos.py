@@ -1,9 +1,9 @@
 import streamlit as st
+from components.bulk_import_panel import BulkImportPanel
 
 def render():
     """Renderiza a página de cadastro de dispositivos"""
     st.title("🖥️ Cadastro de Dispositivos")
-    st.info("⚙️ Funcionalidade em desenvolvimento")
     
     st.markdown("""
     Esta página permitirá:
@@ -11,4 +11,7 @@ def render():
     - Listar dispositivos existentes
     - Editar configurações de dispositivos
     - Vincular dispositivos a sites
-    """)
\ No newline at end of file
+    """)
+    
+    st.divider()
+    BulkImportPanel("devices").render()
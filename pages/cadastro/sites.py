@@ -1,9 +1,9 @@
 import streamlit as st
+from components.bulk_import_panel import BulkImportPanel
 
 def render():
     """Renderiza a página de cadastro de sites"""
     st.title("📍 Cadastro de Sites")
-    st.info("⚙️ Funcionalidade em desenvolvimento")
     
     st.markdown("""
     Esta página permitirá:
@@ -11,4 +11,7 @@ def render():
     - Listar sites existentes
     - Editar informações de sites
     - Vincular sites a clientes
-    """)
\ No newline at end of file
+    """)
+    
+    st.divider()
+    BulkImportPanel("sites").render()
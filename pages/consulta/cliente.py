@@ -1,5 +1,6 @@
 import streamlit as st
 from services.netbox_service import NetboxService
+from components.tenant_picker import TenantPicker
 
 def render():
     """Renderiza a página de consulta de cliente"""
@@ -7,21 +8,14 @@ def render():
     
     service = NetboxService()
     
-    # Buscar clientes
-    with st.spinner("Carregando clientes..."):
-        tenants = service.get_tenants()
+    # Seletor de cliente com busca no servidor
+    selection = TenantPicker(key="consulta_cliente").render("Selecione o Cliente")
     
-    if not tenants:
-        st.warning("Nenhum cliente encontrado no sistema")
+    if not selection:
+        st.info("Digite parte do nome para buscar o cliente")
         return
     
-    # Seletor de cliente
-    tenant_options = {t['id']: t['name'] for t in tenants}
-    selected_id = st.selectbox(
-        "Selecione o Cliente",
-        options=list(tenant_options.keys()),
-        format_func=lambda x: tenant_options[x]
-    )
+    selected_id, _ = selection
     
     if selected_id:
         tenant = service.get_tenant_by_id(selected_id)
@@ -46,7 +40,7 @@ def render():
             st.divider()
             st.subheader("Sites Vinculados")
             
-            sites = service.get_sites(tenant_id=selected_id)
+            sites = service.get_sites(tenant_id=selected_id, fields=NetboxService.SITE_FIELDS)
             
             if sites:
                 for site in sites:
@@ -4,8 +4,13 @@ from services.netbox_service import NetboxService
 from services.template_service import TemplateService
 from components.service_tree import ServiceTreeBuilder
 from components.config_forms import ConfigForms
+from services.prefix_aggregation import compact_prefix_list
 import base64
 
+# less-equal aplicado aos prefixos do cliente nas prefix-lists dos templates
+PREFIX_LIST_LE_V4 = 24
+PREFIX_LIST_LE_V6 = 48
+
 def render():
     """Renderiza a página de geração de configurações"""
     
@@ -54,9 +59,11 @@ def render():
         
         return
     
-    # Buscar sites do tenant
+    # Buscar sites do tenant (inventário completo via GraphQL, com fallback para REST)
     with st.spinner(f"Carregando sites de {selected_tenant_name}..."):
-        tenant_sites = netbox.get_sites(tenant_id=selected_tenant_id)
+        tenant_sites = netbox.get_tenant_inventory(selected_tenant_id)
+        if tenant_sites is None:
+            tenant_sites = netbox.get_sites(tenant_id=selected_tenant_id, fields=NetboxService.SITE_FIELDS)
     
     if not tenant_sites:
         st.warning(f"⚠️ Nenhum site encontrado para o cliente {selected_tenant_name}")
@@ -72,8 +79,10 @@ def render():
     if not selected_service_dict or not selected_service_dict.get("checked"):
         st.info("👈 Selecione um tipo de serviço na árvore ao lado para começar")
         
-        # Mostrar estatísticas do cliente
-        col1, col2, col3 = st.columns(3)
+        # Mostrar estatísticas do cliente (contagens com limit=1, em paralelo)
+        counts = netbox.get_counts(tenant_id=selected_tenant_id)
+        
+        col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
             st.metric("Cliente Selecionado", selected_tenant_name)
@@ -82,8 +91,13 @@ def render():
             st.metric("Total de Sites", len(tenant_sites))
         
         with col3:
-            devices = netbox.get_devices(tenant_id=selected_tenant_id)
-            st.metric("Total de Dispositivos", len(devices))
+            st.metric("Total de Dispositivos", counts["devices"])
+        
+        with col4:
+            st.metric("Total de Interfaces", counts["interfaces"])
+        
+        with col5:
+            st.metric("Total de Circuitos", counts["circuits"])
         
         st.divider()
         
@@ -124,9 +138,7 @@ def render():
             config_data = forms.render_l2vpn_ptp_form(tenant_sites)
         
         elif service_value == "l2vpn-ptmp":
-            st.warning("⚠️ Formulário L2VPN Point-to-Multipoint ainda não implementado")
-            st.info("Este serviço está em desenvolvimento. Em breve estará disponível!")
-            return
+            config_data = forms.render_l2vpn_ptmp_form(tenant_sites)
         
         elif service_value == "cl_dedicado":
             st.warning("⚠️ Formulário Cliente Dedicado ainda não implementado")
@@ -187,6 +199,10 @@ def render():
             # Preparar dados para o template
             template_data = config_data.copy()
             
+            # Prefix-lists compactadas (ge/le): menos linhas com o mesmo conjunto de rotas aceitas
+            if config_data.get("ipv4_prefixes") or config_data.get("ipv6_prefixes"):
+                template_data.update(build_prefix_lists(config_data))
+            
             # Para L2VPN VLAN, buscar nome do dispositivo
             if service_value == "l2vpn-vlan":
                 try:
@@ -202,6 +218,12 @@ def render():
             
             # Exibir resultado
             st.success("✅ Configuração gerada com sucesso!")
+            if "default_prefix_v4" in template_data:
+                st.caption(
+                    f"📦 Prefix-lists: {len(config_data.get('ipv4_prefixes', []))} prefixos IPv4 em "
+                    f"{len(template_data['default_prefix_v4'])} entradas, {len(config_data.get('ipv6_prefixes', []))} "
+                    f"IPv6 em {len(template_data['default_prefix_v6'])}"
+                )
             
             # Tabs para visualização
             tab_config, tab_preview, tab_summary = st.tabs([
@@ -245,6 +267,17 @@ def render():
                 st.markdown("**Dados Recebidos:**")
                 st.json(config_data)
 
+def build_prefix_lists(config_data: dict) -> dict:
+    """Entradas de prefix-list (default_prefix_v4/v6) a partir dos prefixos selecionados"""
+    ipv4_prefixes = config_data.get("ipv4_prefixes", [])
+    ipv6_prefixes = config_data.get("ipv6_prefixes", [])
+    return {
+        "default_prefix_v4": compact_prefix_list(ipv4_prefixes, less_equal=PREFIX_LIST_LE_V4),
+        "default_prefix_v6": compact_prefix_list(ipv6_prefixes, less_equal=PREFIX_LIST_LE_V6),
+        # Lista de preferência IPv6 casa só o prefixo exato
+        "default_prefix_v6_exact": compact_prefix_list(ipv6_prefixes),
+    }
+
 def generate_filename(service_type: str, config_data: dict) -> str:
     """Gera nome do arquivo de configuração"""
     customer = config_data.get('customer_name', 'config').replace(' ', '_')
@@ -1,5 +1,6 @@
 import streamlit as st
 from datetime import datetime
+from services.netbox_service import NetboxService
 
 def render():
     """Renderiza a página inicial"""
@@ -75,6 +76,33 @@ def render():
     
     st.divider()
     
+    # Cache de requisições condicionais ao Netbox
+    st.subheader("🗄️ Cache do Netbox")
+    
+    cache_stats = NetboxService().get_cache_stats()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Requisições", cache_stats["requests"])
+    
+    with col2:
+        st.metric("Não Modificadas (304)", cache_stats["not_modified"])
+    
+    with col3:
+        st.metric("Baixados", f"{cache_stats['bytes_downloaded'] / 1024:,.1f} KB")
+    
+    with col4:
+        st.metric("Economizados", f"{cache_stats['bytes_saved'] / 1024:,.1f} KB")
+    
+    concurrency = NetboxService().get_concurrency_stats()
+    st.caption(
+        f"Concorrência ao Netbox: {concurrency['in_flight']}/{concurrency['limit']} "
+        f"(teto {concurrency['max_limit']}) · respostas 429/503: {concurrency['throttled']}"
+    )
+    
+    st.divider()
+    
     # Informações do sistema
     col1, col2 = st.columns(2)
     
@@ -0,0 +1,154 @@
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import requests
+
+# Respostas que indicam sobrecarga do servidor (reduzem a concorrência e são repetidas)
+THROTTLE_STATUSES = (429, 503)
+
+class NetboxThrottledError(requests.exceptions.Timeout):
+    """Nenhuma vaga de concorrência liberada para o host dentro do tempo limite"""
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite de requisições simultâneas a um host, ajustado no estilo AIMD
+
+    - aumento aditivo: cada resposta rápida soma 1/limite (≈ +1 por "rodada");
+    - redução multiplicativa: 429/503 ou latência acima do alvo multiplicam o
+      limite por 'backoff', no máximo uma vez por intervalo de latência, para
+      que uma rajada de respostas lentas não derrube o limite de uma vez;
+    - Retry-After: bloqueia novas requisições ao host até o instante indicado.
+
+    O limite nunca passa de 'max_limit' (teto global do host) nem fica abaixo
+    de 'min_limit'.
+    """
+
+    def __init__(self, max_limit: int, latency_target: float, min_limit: int = 1, backoff: float = 0.5):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._cond = threading.Condition()
+        self._limit = float(self.max_limit)
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._stats = {"throttled": 0, "slow": 0, "waits": 0}
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda uma vaga; retorna False se o tempo limite acabar antes"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waited = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now >= self._blocked_until and self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    if waited:
+                        self._stats["waits"] += 1
+                    return True
+
+                wait = self._blocked_until - now if now < self._blocked_until else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining) if wait is not None else remaining
+                waited = True
+                self._cond.wait(wait)
+
+    def release(self, latency: float, status: Optional[int] = None, retry_after: Optional[float] = None):
+        """Libera a vaga e ajusta o limite conforme a resposta observada"""
+        with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+
+            if status in THROTTLE_STATUSES:
+                self._stats["throttled"] += 1
+                self._decrease(now, latency)
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+            elif status is not None:
+                if latency > self.latency_target:
+                    self._stats["slow"] += 1
+                    self._decrease(now, latency)
+                else:
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+            self._cond.notify_all()
+
+    def _decrease(self, now: float, latency: float):
+        # Uma redução por janela: respostas da mesma rajada não somam reduções
+        if now - self._last_decrease < max(latency, self.latency_target):
+            return
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._last_decrease = now
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        """
+        Contexto que ocupa uma vaga durante a requisição
+
+        Use 'observe(response)' dentro do bloco para alimentar o ajuste; sem
+        resposta (erro de rede) a vaga é liberada sem alterar o limite.
+        """
+        if not self.acquire(timeout):
+            raise NetboxThrottledError("Limite de concorrência do Netbox atingido")
+        observed: Dict = {}
+        started = time.monotonic()
+        try:
+            yield observed.update
+        finally:
+            self.release(
+                time.monotonic() - started,
+                observed.get("status"),
+                observed.get("retry_after"),
+            )
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "limit": int(self._limit),
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "blocked_for": max(self._blocked_until - time.monotonic(), 0.0),
+            }
+
+class HostLimiterRegistry:
+    """Um limitador por host, compartilhado por todas as sessões do processo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+    def for_url(self, url: str, max_limit: int, latency_target: float) -> AdaptiveConcurrencyLimiter:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = AdaptiveConcurrencyLimiter(max_limit, latency_target)
+            return self._limiters[host]
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {host: limiter.stats() for host, limiter in limiters.items()}
+
+# Instância única compartilhada pelo processo
+HOST_LIMITERS = HostLimiterRegistry()
@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from core.paths import DATA_DIR
+
+# Colunas de cada parte da consulta de ASN (ver services.ripestat_service)
+PART_COLUMNS = {
+    "overview": ("holder", "country"),
+    "prefixes": ("ipv4_prefixes", "ipv6_prefixes"),
+}
+
+class AsnCache:
+    """
+    Cache persistente (SQLite) de titular, país e prefixos anunciados por ASN
+
+    Cada parte (overview / prefixes) guarda o instante em que foi obtida, para
+    expirar e ser atualizada separadamente. Cada obtenção de prefixos também
+    registra as contagens IPv4/IPv6 em prefix_counts, o histórico usado na
+    recomendação de max-prefix. O arquivo fica em DATA_DIR e é
+    compartilhado por todas as sessões (e processos) que usam o mesmo volume.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS asn_info (
+                    asn TEXT PRIMARY KEY,
+                    holder TEXT,
+                    country TEXT,
+                    overview_at REAL,
+                    ipv4_prefixes TEXT,
+                    ipv6_prefixes TEXT,
+                    prefixes_at REAL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS prefix_counts (
+                    asn TEXT,
+                    at REAL,
+                    ipv4 INTEGER,
+                    ipv6 INTEGER,
+                    PRIMARY KEY (asn, at)
+                )
+                """
+            )
+            # Caches anteriores ao histórico: a última obtenção vira a primeira amostra
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO prefix_counts
+                SELECT asn, prefixes_at, json_array_length(ipv4_prefixes), json_array_length(ipv6_prefixes)
+                FROM asn_info
+                WHERE prefixes_at IS NOT NULL AND asn NOT IN (SELECT DISTINCT asn FROM prefix_counts)
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, asn: str, part: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Retorna (dados da parte, instante da obtenção) ou None se nunca foi obtida"""
+        columns = PART_COLUMNS[part]
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    f"SELECT {', '.join(columns)}, {part}_at FROM asn_info WHERE asn = ?", (asn,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[-1] is None:
+            return None
+
+        data = dict(zip(columns, row[:-1]))
+        if part == "prefixes":
+            data = {name: json.loads(value or "[]") for name, value in data.items()}
+        else:
+            data = {name: value or "" for name, value in data.items()}
+        return data, row[-1]
+
+    def put(self, asn: str, part: str, data: Dict[str, Any], fetched_at: Optional[float] = None):
+        """Grava uma parte da consulta do ASN"""
+        columns = PART_COLUMNS[part]
+        values = [json.dumps(data[c]) if part == "prefixes" else data.get(c, "") for c in columns]
+        fetched_at = fetched_at or time.time()
+        assignments = ", ".join(f"{c} = excluded.{c}" for c in columns + (f"{part}_at",))
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    f"INSERT INTO asn_info (asn, {', '.join(columns)}, {part}_at) VALUES (?, ?, ?, ?) "
+                    f"ON CONFLICT(asn) DO UPDATE SET {assignments}",
+                    (asn, *values, fetched_at),
+                )
+                if part == "prefixes":
+                    conn.execute(
+                        "INSERT OR IGNORE INTO prefix_counts VALUES (?, ?, ?, ?)",
+                        (asn, fetched_at, len(data["ipv4_prefixes"]), len(data["ipv6_prefixes"])),
+                    )
+                conn.commit()
+        except sqlite3.Error:
+            # Cache é best-effort: a consulta já foi respondida
+            pass
+
+    def count_history(self, asns: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[float, int, int]]]:
+        """
+        Histórico de contagens de prefixos anunciados, em uma única consulta
+
+        Args:
+            asns: ASNs desejados; None para todos os do cache
+
+        Returns:
+            {asn: [(instante, ipv4, ipv6)]} em ordem cronológica
+        """
+        sql = "SELECT asn, at, ipv4, ipv6 FROM prefix_counts"
+        params: List[str] = []
+        if asns is not None:
+            params = sorted(set(asns))
+            if not params:
+                return {}
+            sql += f" WHERE asn IN ({', '.join('?' * len(params))})"
+        try:
+            with self._lock:
+                rows = self._connection().execute(sql + " ORDER BY asn, at", params).fetchall()
+        except sqlite3.Error:
+            return {}
+
+        history: Dict[str, List[Tuple[float, int, int]]] = {}
+        for asn, at, ipv4, ipv6 in rows:
+            history.setdefault(asn, []).append((at, ipv4, ipv6))
+        return history
+
+    def invalidate(self, asn: Optional[str] = None):
+        """Remove um ASN (ou todos) do cache"""
+        with self._lock:
+            conn = self._connection()
+            if asn is None:
+                conn.execute("DELETE FROM asn_info")
+            else:
+                conn.execute("DELETE FROM asn_info WHERE asn = ?", (asn,))
+            conn.commit()
+
+# Instância única compartilhada pelo processo
+ASN_CACHE = AsnCache(DATA_DIR / "asn_cache.sqlite3")
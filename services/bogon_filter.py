@@ -0,0 +1,184 @@
+"""
+Pré-filtro de bogons e martians para as listas de prefixos dos clientes
+
+A lista de bogons (arquivo local, com a lista embutida como padrão) é
+agrupada por tamanho de prefixo em arrays ordenados; a classificação de
+uma lista inteira é um searchsorted por tamanho, sem ipaddress por prefixo.
+"""
+import ipaddress
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config.settings import AppConfig
+from core.paths import DATA_DIR
+from utils.prefix_array import ParsedPrefixes, parse_prefixes
+
+# Lista padrão (RFC 6890 e afins); o arquivo local, se existir, substitui esta
+DEFAULT_BOGONS = """
+0.0.0.0/8 reservado
+10.0.0.0/8 rfc1918
+100.64.0.0/10 rfc6598
+127.0.0.0/8 loopback
+169.254.0.0/16 link-local
+172.16.0.0/12 rfc1918
+192.0.0.0/24 reservado
+192.0.2.0/24 documentação
+192.168.0.0/16 rfc1918
+198.18.0.0/15 benchmark
+198.51.100.0/24 documentação
+203.0.113.0/24 documentação
+224.0.0.0/4 multicast
+240.0.0.0/4 reservado
+::/8 reservado
+100::/64 discard
+2001:2::/48 benchmark
+2001:10::/28 orchid
+2001:db8::/32 documentação
+2002::/16 6to4
+3ffe::/16 6bone
+fc00::/7 ula
+fe80::/10 link-local
+fec0::/10 site-local
+ff00::/8 multicast
+::/3 fora-de-2000::/3
+4000::/2 fora-de-2000::/3
+8000::/1 fora-de-2000::/3
+"""
+
+DEFAULT_ROUTE = "rota-default"
+TOO_SPECIFIC = "muito-específico"
+INVALID = "inválido"
+
+def parse_bogon_list(text: str) -> List[Tuple[str, str]]:
+    """
+    Linhas 'prefixo [categoria]'; '#' inicia comentário. Arquivos como o
+    fullbogons da Team Cymru (só prefixos) recebem a categoria 'bogon'.
+    """
+    entries = []
+    for line in text.splitlines():
+        fields = line.split("#", 1)[0].split()
+        if fields:
+            entries.append((fields[0], fields[1] if len(fields) > 1 else "bogon"))
+    return entries
+
+class BogonFilter:
+    """
+    Classificação vetorizada de prefixos contra a lista de bogons
+
+    Para cada tamanho L presente na lista há um array ordenado com os inícios
+    dos bogons; um prefixo de tamanho >= L é bogon se o seu início truncado
+    em L estiver no array. O mais específico define a categoria. O arquivo é
+    relido quando muda (mtime), permitindo atualizá-lo sem reiniciar.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._tables: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self.source = "padrão"
+
+    def _resolve_path(self) -> Path:
+        if self.path:
+            return self.path
+        return Path(AppConfig.BOGON_FILE) if AppConfig.BOGON_FILE else DATA_DIR / "bogons.txt"
+
+    def _build(self, entries: List[Tuple[str, str]]) -> Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]:
+        by_category: Dict[str, List[str]] = {}
+        for prefix, category in entries:
+            by_category.setdefault(category, []).append(prefix)
+
+        groups: Dict[Tuple[int, int], Tuple[List[np.ndarray], List[np.ndarray]]] = {}
+        for category, prefixes in by_category.items():
+            parsed = parse_prefixes(prefixes)
+            # IPv6 compara só os 64 bits altos: bogons mais longos que /64 valem para o /64 inteiro
+            lengths = np.where(parsed.family == 4, parsed.length, np.minimum(parsed.length, 64))
+            for family, length in set(zip(parsed.family.tolist(), lengths.tolist())):
+                mask = (parsed.family == family) & (lengths == length)
+                keys = parsed.lo[mask] if family == 4 else parsed.hi[mask]
+                group = groups.setdefault((family, length), ([], []))
+                group[0].append(keys)
+                group[1].append(np.full(len(keys), category, dtype=object))
+
+        tables = {}
+        for key, (keys, labels) in groups.items():
+            keys, labels = np.concatenate(keys), np.concatenate(labels)
+            order = np.argsort(keys, kind="stable")
+            tables[key] = (keys[order], labels[order])
+        return tables
+
+    def _load(self) -> Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]:
+        path = self._resolve_path()
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            mtime = None
+        with self._lock:
+            if not self._tables or mtime != self._mtime:
+                if mtime is None:
+                    entries, source = parse_bogon_list(DEFAULT_BOGONS), "padrão"
+                else:
+                    entries, source = parse_bogon_list(path.read_text(encoding="utf-8")), path.name
+                self._tables, self._mtime, self.source = self._build(entries), mtime, source
+            return self._tables
+
+    def classify(self, parsed: ParsedPrefixes, max_length_v4: int = 24, max_length_v6: int = 48) -> np.ndarray:
+        """
+        Motivo de rejeição de cada prefixo ('' quando aceito)
+
+        Ordem de prioridade: rota default, bogon (categoria do mais específico)
+        e prefixo mais longo que o máximo da família.
+        """
+        reasons = np.full(len(parsed), "", dtype=object)
+        for (family, length), (keys, labels) in sorted(self._load().items(), key=lambda item: -item[0][1]):
+            candidates = (parsed.family == family) & (parsed.length >= length) & (reasons == "")
+            if not candidates.any():
+                continue
+            bits = 32 if family == 4 else 64
+            words = parsed.lo if family == 4 else parsed.hi
+            mask = np.uint64(((1 << bits) - 1) ^ ((1 << (bits - length)) - 1))
+            truncated = words[candidates] & mask
+            position = np.minimum(np.searchsorted(keys, truncated), len(keys) - 1)
+            hit = keys[position] == truncated
+            indexes = np.flatnonzero(candidates)
+            reasons[indexes[hit]] = labels[position[hit]]
+
+        too_long = np.where(parsed.family == 4, parsed.length > max_length_v4, parsed.length > max_length_v6)
+        reasons[(reasons == "") & too_long] = TOO_SPECIFIC
+        reasons[parsed.length == 0] = DEFAULT_ROUTE
+        return reasons
+
+    def filter(self, prefixes: List[str], max_length_v4: int = 24, max_length_v6: int = 48) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Separa os prefixos aceitos dos rejeitados
+
+        Os rejeitados vêm com o texto informado (ex.: '10.0.0.1/8', com bits de
+        host), para que quem chamou possa tirá-los da própria lista.
+
+        Returns:
+            (aceitos em forma canônica, {prefixo rejeitado como informado: motivo})
+        """
+        parsed = parse_prefixes(prefixes)
+        reasons = self.classify(parsed, max_length_v4, max_length_v6)
+        by_canonical = dict(zip(parsed.texts(), reasons))
+        kept = [t for t, r in by_canonical.items() if not r]
+
+        flagged = {}
+        for prefix in prefixes:
+            text = prefix.strip()
+            if "/" not in text:
+                continue  # ignorado por parse_prefixes
+            # A maioria já vem canônica; só as demais passam pelo ipaddress
+            reason = by_canonical.get(text)
+            if reason is None:
+                try:
+                    reason = by_canonical.get(str(ipaddress.ip_network(text, strict=False)), INVALID)
+                except ValueError:
+                    reason = INVALID
+            if reason:
+                flagged[prefix] = reason
+        return kept, flagged
+
+# Instância única compartilhada pelo processo
+BOGONS = BogonFilter()
@@ -0,0 +1,309 @@
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+import requests
+from services.netbox_service import NetboxService
+
+# Objetos por requisição de escrita em lote
+BULK_WRITE_CHUNK = 100
+
+# Requisições de escrita simultâneas por importação (o teto global do host continua valendo)
+BULK_WRITE_WORKERS = 4
+
+SLUG_PATTERN = r"[a-z0-9_-]+"
+
+@dataclass
+class Reference:
+    """Coluna que referencia outro objeto pelo slug (convertida para o ID no envio)"""
+    endpoint: str
+    lookup_field: str = "slug"
+
+@dataclass
+class BulkSpec:
+    """Descrição de um tipo de objeto importável em lote"""
+    label: str
+    endpoint: str
+    columns: List[str]
+    required: List[str]
+    key_fields: Tuple[str, ...]  # identificam um objeto existente (PATCH em vez de POST)
+    references: Dict[str, Reference] = field(default_factory=dict)
+    choices: Dict[str, List[str]] = field(default_factory=dict)
+    integers: List[str] = field(default_factory=list)
+    slug_from: Optional[str] = None  # coluna usada para gerar o slug quando vazio
+    defaults: Dict[str, str] = field(default_factory=dict)
+
+    def template_csv(self) -> bytes:
+        """Cabeçalho de exemplo para download"""
+        return (",".join(self.columns) + "\n").encode("utf-8")
+
+SITE_STATUSES = ["planned", "staging", "active", "decommissioning", "retired"]
+DEVICE_STATUSES = ["offline", "active", "planned", "staged", "failed", "inventory", "decommissioning"]
+CIRCUIT_STATUSES = ["planned", "provisioning", "active", "offline", "deprovisioning", "decommissioned"]
+
+SPECS = {
+    "tenants": BulkSpec(
+        label="Clientes",
+        endpoint="tenancy/tenants/",
+        columns=["name", "slug", "group", "description", "comments"],
+        required=["name"],
+        key_fields=("slug",),
+        references={"group": Reference("tenancy/tenant-groups/")},
+        slug_from="name",
+    ),
+    "sites": BulkSpec(
+        label="Sites",
+        endpoint="dcim/sites/",
+        columns=["name", "slug", "status", "tenant", "region", "facility", "description"],
+        required=["name"],
+        key_fields=("slug",),
+        references={"tenant": Reference("tenancy/tenants/"), "region": Reference("dcim/regions/")},
+        choices={"status": SITE_STATUSES},
+        slug_from="name",
+        defaults={"status": "active"},
+    ),
+    "devices": BulkSpec(
+        label="Dispositivos",
+        endpoint="dcim/devices/",
+        columns=["name", "site", "device_type", "role", "tenant", "status", "serial", "description"],
+        required=["name", "site", "device_type", "role"],
+        key_fields=("name", "site"),
+        references={
+            "site": Reference("dcim/sites/"),
+            "device_type": Reference("dcim/device-types/"),
+            "role": Reference("dcim/device-roles/"),
+            "tenant": Reference("tenancy/tenants/"),
+        },
+        choices={"status": DEVICE_STATUSES},
+        defaults={"status": "active"},
+    ),
+    "circuits": BulkSpec(
+        label="Circuitos",
+        endpoint="circuits/circuits/",
+        columns=["cid", "provider", "type", "status", "tenant", "commit_rate", "description"],
+        required=["cid", "provider", "type"],
+        key_fields=("cid", "provider"),
+        references={
+            "provider": Reference("circuits/providers/"),
+            "type": Reference("circuits/circuit-types/"),
+            "tenant": Reference("tenancy/tenants/"),
+        },
+        choices={"status": CIRCUIT_STATUSES},
+        integers=["commit_rate"],
+        defaults={"status": "active"},
+    ),
+}
+
+def read_table(uploaded_file) -> pd.DataFrame:
+    """Lê um CSV ou XLSX enviado pelo usuário, com todas as colunas como texto"""
+    name = getattr(uploaded_file, "name", "").lower()
+    data = uploaded_file.getvalue() if hasattr(uploaded_file, "getvalue") else uploaded_file.read()
+
+    if name.endswith((".xlsx", ".xls")):
+        df = pd.read_excel(io.BytesIO(data), dtype=str)
+    else:
+        df = pd.read_csv(io.BytesIO(data), dtype=str, sep=None, engine="python", encoding="utf-8-sig")
+
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    return df
+
+def slugify(values: pd.Series) -> pd.Series:
+    """Gera slugs no padrão do Netbox para uma coluna inteira"""
+    return (
+        values.str.normalize("NFKD")
+        .str.encode("ascii", errors="ignore")
+        .str.decode("ascii")
+        .str.lower()
+        .str.replace(r"[^a-z0-9_-]+", "-", regex=True)
+        .str.strip("-")
+    )
+
+class BulkImporter:
+    """
+    Importação em lote de objetos do Netbox a partir de uma planilha
+
+    1. validate(): normaliza e valida todas as linhas de uma vez (operações
+       vetorizadas do pandas), resolve slugs de referência em lote e separa
+       linhas novas (POST) de existentes (PATCH);
+    2. submit(): envia os objetos válidos em blocos com corpo em lista,
+       em paralelo, devolvendo o resultado de cada linha.
+    """
+
+    def __init__(self, spec: BulkSpec, netbox: Optional[NetboxService] = None):
+        self.spec = spec
+        self.netbox = netbox or NetboxService()
+
+    # Validação
+    def validate(self, raw: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns:
+            DataFrame com as colunas do tipo, mais 'linha' (na planilha), 'acao'
+            ('criar'/'atualizar'), 'id' (existente) e 'erros' (vazio se válida)
+        """
+        spec = self.spec
+        df = pd.DataFrame(index=raw.index)
+        for column in spec.columns:
+            values = raw[column].astype("string").str.strip() if column in raw else pd.Series(pd.NA, index=raw.index, dtype="string")
+            df[column] = values.replace("", pd.NA)
+
+        for column, default in spec.defaults.items():
+            df[column] = df[column].fillna(default)
+        if spec.slug_from:
+            df["slug"] = df["slug"].fillna(slugify(df[spec.slug_from].fillna("")).replace("", pd.NA))
+
+        errors = pd.Series("", index=df.index, dtype="string")
+
+        def flag(mask: pd.Series, message: str):
+            nonlocal errors
+            errors = errors.mask(mask.fillna(False).astype(bool), errors + message + "; ")
+
+        extra = sorted(set(raw.columns) - set(spec.columns))
+        for column in spec.required:
+            flag(df[column].isna(), f"'{column}' é obrigatório")
+        if "slug" in spec.columns:
+            flag(df["slug"].notna() & ~df["slug"].str.fullmatch(SLUG_PATTERN).fillna(False), "slug inválido")
+        for column, allowed in spec.choices.items():
+            flag(df[column].notna() & ~df[column].str.lower().isin(allowed), f"'{column}' deve ser um de: {', '.join(allowed)}")
+            df[column] = df[column].str.lower()
+        for column in spec.integers:
+            numbers = pd.to_numeric(df[column], errors="coerce")
+            invalid = df[column].notna() & (numbers.isna() | (numbers % 1 != 0) | (numbers.abs() >= 2 ** 63))
+            flag(invalid, f"'{column}' deve ser inteiro: " + df[column])
+            # "10.0" vira 10; o valor convertido é o que vai no envio
+            df[column] = numbers.where(~invalid).astype("Int64")
+
+        ids = self._resolve_references(df, flag)
+        flag(df.duplicated(subset=list(spec.key_fields), keep=False) & df[list(spec.key_fields)].notna().all(axis=1),
+             "linha duplicada na planilha")
+
+        existing = self._find_existing(df, ids)
+
+        result = df.copy()
+        result.insert(0, "linha", df.index + 2)  # cabeçalho é a linha 1
+        result["id"] = existing
+        result["acao"] = existing.notna().map({True: "atualizar", False: "criar"})
+        result["erros"] = errors.str.rstrip("; ")
+        result.attrs["reference_ids"] = ids
+        result.attrs["ignored_columns"] = extra
+        return result
+
+    def _resolve_references(self, df: pd.DataFrame, flag: Callable) -> Dict[str, pd.Series]:
+        """Converte os slugs de cada coluna de referência em IDs (uma busca em lote por coluna)"""
+        ids = {}
+        for column, reference in self.spec.references.items():
+            values = df[column].dropna().unique().tolist()
+            found = self.netbox.lookup_ids(reference.endpoint, reference.lookup_field, values) if values else []
+            mapping = {obj[reference.lookup_field]: obj["id"] for obj in found}
+            ids[column] = df[column].map(mapping)
+            flag(df[column].notna() & ids[column].isna(), f"'{column}' não encontrado no Netbox")
+        return ids
+
+    def _find_existing(self, df: pd.DataFrame, ids: Dict[str, pd.Series]) -> pd.Series:
+        """IDs dos objetos já cadastrados com a mesma chave (NA para os novos)"""
+        key_fields = self.spec.key_fields
+        lookup_field = key_fields[0]
+        found = self.netbox.lookup_ids(
+            self.spec.endpoint, lookup_field, df[lookup_field].dropna().unique().tolist(), extra_fields=key_fields[1:]
+        )
+
+        def object_key(obj: Dict) -> Tuple:
+            return tuple(obj[f]["id"] if isinstance(obj.get(f), dict) else obj.get(f) for f in key_fields)
+
+        existing = {object_key(obj): obj["id"] for obj in found}
+        key_columns = [ids[f] if f in ids else df[f] for f in key_fields]
+        keys = pd.Series(list(zip(*key_columns)), index=df.index)
+        return keys.map(existing).astype("Int64")
+
+    # Envio
+    def _payload(self, validated: pd.DataFrame, index) -> Dict:
+        row = validated.loc[index]
+        ids = validated.attrs["reference_ids"]
+        payload = {}
+        for column in self.spec.columns:
+            value = ids[column].loc[index] if column in ids else row[column]
+            if pd.isna(value):
+                continue
+            if column in self.spec.integers or column in ids:
+                value = int(value)
+            payload[column] = value
+        if pd.notna(row["id"]):
+            payload["id"] = int(row["id"])
+        return payload
+
+    def _send_chunk(self, method: str, indexes: List, payloads: List[Dict]) -> Dict:
+        """
+        Envia um bloco; em erro de validação, registra os erros por linha e
+        reenvia uma vez as linhas sem erro (o Netbox descarta o bloco inteiro)
+        """
+        outcome = {}
+        try:
+            status, body = self.netbox.bulk_write(method, self.spec.endpoint, payloads)
+        except requests.exceptions.RequestException as e:
+            return {index: ("erro", None, f"Falha de comunicação: {e}") for index in indexes}
+
+        if 200 <= status < 300 and isinstance(body, list):
+            return {index: ("ok", obj.get("id"), "") for index, obj in zip(indexes, body)}
+
+        if status == 400 and isinstance(body, list) and len(body) == len(payloads):
+            retry = [(index, payload) for index, payload, error in zip(indexes, payloads, body) if not error]
+            for index, error in zip(indexes, body):
+                if error:
+                    outcome[index] = ("erro", None, self._format_error(error))
+            if retry and len(retry) < len(payloads):
+                outcome.update(self._send_chunk(method, [i for i, _ in retry], [p for _, p in retry]))
+            else:
+                outcome.update({index: ("erro", None, "Bloco rejeitado") for index, _ in retry})
+            return outcome
+
+        message = self._format_error(body) or f"HTTP {status}"
+        return {index: ("erro", None, message) for index in indexes}
+
+    @staticmethod
+    def _format_error(error) -> str:
+        if isinstance(error, dict):
+            return "; ".join(
+                f"{name}: {' '.join(map(str, messages)) if isinstance(messages, list) else messages}"
+                for name, messages in error.items()
+            )
+        return str(error)[:300]
+
+    def _chunks(self, validated: pd.DataFrame) -> Iterator[Tuple[str, List, List[Dict]]]:
+        valid = validated[validated["erros"] == ""]
+        for action, method in (("criar", "POST"), ("atualizar", "PATCH")):
+            indexes = valid.index[valid["acao"] == action].tolist()
+            for start in range(0, len(indexes), BULK_WRITE_CHUNK):
+                chunk = indexes[start:start + BULK_WRITE_CHUNK]
+                yield method, chunk, [self._payload(validated, index) for index in chunk]
+
+    def submit(self, validated: pd.DataFrame, on_progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        Envia as linhas válidas ao Netbox em blocos paralelos
+
+        Returns:
+            DataFrame com 'linha', 'acao', 'status' ('ok'/'erro'), 'id' e 'mensagem'
+            para todas as linhas (as inválidas aparecem com o erro da validação)
+        """
+        chunks = list(self._chunks(validated))
+        total = sum(len(indexes) for _, indexes, _ in chunks)
+        outcome: Dict = {}
+        done = 0
+
+        with ThreadPoolExecutor(max_workers=BULK_WRITE_WORKERS) as executor:
+            futures = [executor.submit(self._send_chunk, method, indexes, payloads) for method, indexes, payloads in chunks]
+            for future in as_completed(futures):
+                result = future.result()
+                outcome.update(result)
+                done += len(result)
+                if on_progress:
+                    on_progress(done, total)
+
+        report = validated[["linha", "acao"]].copy()
+        report["status"] = "erro"
+        report["id"] = validated["id"]
+        report["mensagem"] = validated["erros"]
+        for index, (status, object_id, message) in outcome.items():
+            report.loc[index, ["status", "mensagem"]] = [status, message]
+            if object_id:
+                report.loc[index, "id"] = object_id
+        return report
@@ -0,0 +1,32 @@
+import threading
+import time
+from typing import Dict, Iterable
+
+class TagInvalidator:
+    """
+    Registro de invalidações por tag, compartilhado por todas as sessões
+
+    Cada entrada de cache guarda as tags dos objetos de que depende
+    (ex.: 'tenant:5', 'site:12', 'device:40'). Invalidar uma tag faz com que
+    toda entrada armazenada antes desse instante seja tratada como ausente,
+    inclusive nos caches de outras sessões, que não são acessíveis daqui.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._invalidated_at: Dict[str, float] = {}
+
+    def invalidate(self, tags: Iterable[str]):
+        """Marca as tags como alteradas agora"""
+        now = time.time()
+        with self._lock:
+            for tag in tags:
+                self._invalidated_at[tag] = now
+
+    def is_stale(self, tags: Iterable[str], stored_at: float) -> bool:
+        """Indica se alguma das tags foi invalidada depois do armazenamento"""
+        with self._lock:
+            return any(self._invalidated_at.get(tag, 0.0) >= stored_at for tag in tags)
+
+# Instância única compartilhada pelo processo
+INVALIDATIONS = TagInvalidator()
@@ -0,0 +1,106 @@
+import threading
+import time
+import requests
+from typing import Dict, Optional
+
+class NetboxUnavailableError(requests.exceptions.ConnectionError):
+    """Requisição não enviada porque o circuit breaker do Netbox está aberto"""
+
+class CircuitBreaker:
+    """
+    Circuit breaker para o cliente do Netbox
+
+    - fechado: requisições passam normalmente;
+    - aberto: após N falhas consecutivas (erros de conexão, 5xx ou respostas
+      acima do SLO de latência) as requisições são recusadas até o fim do
+      tempo de espera;
+    - meio-aberto: uma única requisição de teste é liberada; sucesso fecha o
+      circuito, falha o abre novamente.
+
+    allow_request() devolve um token que o chamador repassa a release_probe();
+    só o token da requisição de teste libera a vaga de teste.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Token das requisições admitidas com o circuito fechado (não são teste)
+    ADMITTED = object()
+
+    def __init__(self, failure_threshold: int = 5, latency_slo: float = 5.0, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.latency_slo = latency_slo
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe: Optional[object] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def is_open(self) -> bool:
+        """Indica se o circuito não está fechado (modo degradado)"""
+        return self.state != self.CLOSED
+
+    def allow_request(self) -> Optional[object]:
+        """
+        Admite (ou não) a requisição ao Netbox
+
+        Returns:
+            None se recusada; senão o token a devolver em release_probe()
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return self.ADMITTED
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probe = None
+            if self._state == self.HALF_OPEN and self._probe is None:
+                self._probe = object()
+                return self._probe
+            return None
+
+    def record_success(self, latency: float):
+        """Registra uma resposta; acima do SLO de latência conta como falha"""
+        if latency > self.latency_slo:
+            self.record_failure()
+            return
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe = None
+
+    def record_failure(self):
+        """Registra uma falha, abrindo o circuito quando necessário"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe = None
+
+    def release_probe(self, token: Optional[object]):
+        """
+        Libera a requisição de teste do meio-aberto sem registrar resultado
+
+        Chamado ao fim de toda requisição admitida (sucesso, falha ou
+        desfecho que não diz nada sobre o Netbox, como fila local cheia);
+        sem isso o circuito ficaria meio-aberto recusando tudo. Tokens de
+        requisições admitidas com o circuito fechado não liberam nada: uma
+        delas terminando já no meio-aberto deixaria passar um segundo teste.
+        """
+        with self._lock:
+            if token is not None and token is self._probe:
+                self._probe = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures}
+
+# Instância única compartilhada pelo processo
+NETBOX_BREAKER = CircuitBreaker()
@@ -1,7 +1,9 @@
-import requests
 from typing import List, Dict, Tuple
 import re
 import ipaddress
+from services.prefix_aggregation import remove_covered
+from services.ripestat_service import RipeStatService
+from utils.prefix_array import parse_prefixes
 
 class ConfigService:
     """Serviço para geração de configurações de rede"""
@@ -24,44 +26,19 @@ class ConfigService:
     
     @staticmethod
     def get_asn_prefixes(asn: str) -> Tuple[List[str], List[str], str]:
-        """Busca prefixos de um ASN usando RIPE API"""
-        try:
-            asn_number = str(asn).lstrip('AS')
-            
-            # Buscar prefixos
-            response = requests.get(
-                f"https://stat.ripe.net/data/announced-prefixes/data.json?resource=AS{asn_number}",
-                timeout=10
-            )
-            
-            # Buscar informações do ASN
-            asn_info_response = requests.get(
-                f"https://stat.ripe.net/data/as-overview/data.json?resource=AS{asn_number}",
-                timeout=10
-            )
-            
-            data = response.json()
-            asn_info = asn_info_response.json()
-            
-            full_asn_name = asn_info.get('data', {}).get('holder', 'Unknown ASN')
-            asn_name = full_asn_name.split()[0] if full_asn_name else 'Unknown'
-            
-            ipv4_prefixes = []
-            ipv6_prefixes = []
-            
-            if 'data' in data and 'prefixes' in data['data']:
-                for prefix_entry in data['data']['prefixes']:
-                    if 'prefix' in prefix_entry:
-                        prefix = prefix_entry['prefix']
-                        if ConfigService.is_ipv4(prefix):
-                            ipv4_prefixes.append(prefix)
-                        elif ConfigService.is_ipv6(prefix):
-                            ipv6_prefixes.append(prefix)
-            
-            return ipv4_prefixes, ipv6_prefixes, asn_name
-            
-        except Exception as e:
-            return [], [], f"Error: {str(e)}"
+        """Busca prefixos de um ASN usando RIPE API (com cache local)"""
+        info = RipeStatService().lookup(asn)
+        # Prefixos da base local ainda servem quando só o titular falhou
+        if info.get("errors") and not (info['ipv4_prefixes'] or info['ipv6_prefixes']):
+            return [], [], f"Error: {info['errors'][0]}"
+        
+        full_asn_name = info.get('holder') or 'Unknown ASN'
+        asn_name = full_asn_name.split()[0]
+        
+        # Validação em lote (NumPy) em vez das regexes por prefixo
+        ipv4_prefixes = parse_prefixes(info['ipv4_prefixes'], family=4).texts()
+        ipv6_prefixes = parse_prefixes(info['ipv6_prefixes'], family=6).texts()
+        return ipv4_prefixes, ipv6_prefixes, asn_name
     
     @staticmethod
     def split_prefix_mask(prefix_cidr: str) -> Tuple[str, str]:
@@ -96,13 +73,8 @@ class ConfigService:
     
     @staticmethod
     def filter_less_specific_prefixes(prefixes: List[str]) -> List[str]:
-        """Filtra prefixos menos específicos"""
+        """Filtra prefixos contidos em outros da lista (mantém os menos específicos)"""
         try:
-            networks = [ipaddress.ip_network(prefix) for prefix in prefixes]
-            filtered = [
-                str(net) for net in networks 
-                if not any(net.subnet_of(other) for other in networks if net != other)
-            ]
-            return filtered
-        except:
+            return remove_covered(prefixes)
+        except ValueError:
             return prefixes
\ No newline at end of file
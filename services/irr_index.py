@@ -0,0 +1,365 @@
+"""
+Índice local de objetos IRR (route/route6 e as-set)
+
+Importa dumps RPSL (split files do RIPE, RADB etc.) para um SQLite indexado
+por origem e por prefixo, e expande AS-SETs recursivamente (com memória e
+detecção de ciclos) para montar o cone de clientes sem consultas externas.
+
+Uso:
+    python -m services.irr_index ripe.db.route.gz ripe.db.route6.gz ripe.db.as-set.gz
+"""
+import argparse
+import ipaddress
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.paths import DATA_DIR
+from services.prefix_origin import open_text
+
+INDEX_PATH = DATA_DIR / "irr.sqlite3"
+
+# Classes e atributos RPSL aproveitados; o resto do dump é descartado na leitura
+OBJECT_CLASSES = ("route", "route6", "as-set")
+ATTRIBUTES = {"route", "route6", "origin", "source", "as-set", "members", "mp-members"}
+
+IMPORT_BATCH_SIZE = 50000
+QUERY_CHUNK_SIZE = 500
+
+def iter_rpsl_objects(lines: Iterable[str], classes: Tuple[str, ...] = OBJECT_CLASSES) -> Iterator[Dict[str, List[str]]]:
+    """
+    Percorre um dump RPSL entregando os objetos das classes pedidas
+
+    Objetos de outras classes são pulados sem processar os atributos. Linhas
+    de continuação (espaço, tab ou '+') são anexadas ao atributo anterior.
+
+    Yields:
+        {"class": [classe], atributo: [valores]}
+    """
+    obj: Optional[Dict[str, List[str]]] = None
+    skipping = False
+    key = None
+    for line in lines:
+        if not line.strip():
+            if obj is not None:
+                yield obj
+            obj, skipping, key = None, False, None
+            continue
+        if skipping or line[0] in "#%":
+            continue
+        if line[0] in " \t+":
+            if key is not None:
+                obj[key][-1] += " " + line[1:].split("#", 1)[0].strip()
+            continue
+
+        name, _, value = line.partition(":")
+        name = name.strip().lower()
+        if obj is None:
+            if name not in classes:
+                skipping = True
+                continue
+            obj = {"class": [name]}
+        if name in ATTRIBUTES:
+            obj.setdefault(name, []).append(value.split("#", 1)[0].strip())
+            key = name
+        else:
+            key = None
+    if obj is not None:
+        yield obj
+
+def _parse_origin(value: str) -> Optional[int]:
+    value = value.strip().upper()
+    return int(value[2:]) if value.startswith("AS") and value[2:].isdigit() else None
+
+def canonical_prefix(prefix: str) -> str:
+    """
+    Forma canônica usada no índice: rede sem bits de host, IPv6 comprimido
+    em minúsculas (ex.: '2001:DB8:0::1/32' -> '2001:db8::/32')
+
+    Raises:
+        ValueError: prefixo inválido
+    """
+    return str(ipaddress.ip_network(prefix.strip(), strict=False))
+
+def _set_members(obj: Dict[str, List[str]]) -> List[str]:
+    members = []
+    for value in obj.get("members", []) + obj.get("mp-members", []):
+        members.extend(m.strip().upper() for m in value.replace(" ", ",").split(",") if m.strip())
+    return members
+
+def build_index(sources: List[Path], target: Path = INDEX_PATH) -> Dict[str, int]:
+    """
+    Importa os dumps para um SQLite novo e o substitui atomicamente
+
+    Returns:
+        Quantidade de objetos route, route6 e as-set importados
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    if tmp.exists():
+        tmp.unlink()
+
+    conn = sqlite3.connect(str(tmp))
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("CREATE TABLE route (prefix TEXT, origin INTEGER, source TEXT)")
+    conn.execute("CREATE TABLE as_set (name TEXT, members TEXT, source TEXT)")
+
+    counts = {"route": 0, "route6": 0, "as-set": 0}
+    routes: List[Tuple[str, int, str]] = []
+    sets: List[Tuple[str, str, str]] = []
+
+    def flush():
+        conn.executemany("INSERT INTO route VALUES (?, ?, ?)", routes)
+        conn.executemany("INSERT INTO as_set VALUES (?, ?, ?)", sets)
+        routes.clear()
+        sets.clear()
+
+    for source in sources:
+        with open_text(Path(source)) as f:
+            for obj in iter_rpsl_objects(f):
+                cls = obj["class"][0]
+                src = obj.get("source", [""])[0].upper()
+                if cls == "as-set":
+                    sets.append((obj["as-set"][0].upper(), json.dumps(_set_members(obj)), src))
+                else:
+                    origin = _parse_origin(obj.get("origin", [""])[0])
+                    prefix = obj[cls][0]
+                    if origin is None:
+                        continue
+                    # Objetos com bits de host ou IPv6 em outra escrita caem na mesma chave das consultas
+                    try:
+                        prefix = canonical_prefix(prefix)
+                    except ValueError:
+                        continue
+                    routes.append((prefix, origin, src))
+                counts[cls] += 1
+                if len(routes) + len(sets) >= IMPORT_BATCH_SIZE:
+                    flush()
+    flush()
+
+    # Índices criados depois da carga: bem mais rápido que manter durante os inserts
+    conn.execute("CREATE INDEX route_origin ON route (origin)")
+    conn.execute("CREATE INDEX route_prefix ON route (prefix)")
+    conn.execute("CREATE INDEX as_set_name ON as_set (name)")
+    conn.commit()
+    conn.close()
+    os.replace(tmp, target)
+    return counts
+
+class IrrIndex:
+    """
+    Consultas ao índice IRR gerado por build_index
+
+    A expansão de AS-SETs guarda os resultados completos (ASNs e avisos) em
+    memória, por geração do arquivo: ao regerá-lo, a memória é trocada por
+    uma nova (nunca esvaziada no lugar), e uma expansão que começou na
+    geração anterior grava só na memória antiga, já descartada.
+    """
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._mtime: Optional[float] = None
+        # AS-SET -> (ASNs, avisos); um único dict para que as duas partes sejam gravadas juntas
+        self._expanded: Dict[str, Tuple[Set[int], List[str]]] = {}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return None
+        if self._conn is None or mtime != self._mtime:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._mtime = mtime
+            self._expanded = {}
+        return self._conn
+
+    def available(self) -> bool:
+        with self._lock:
+            return self._connection() is not None
+
+    def _memo(self) -> Dict[str, Tuple[Set[int], List[str]]]:
+        """Memória da expansão (ASNs, avisos) da geração atual do índice"""
+        with self._lock:
+            self._connection()
+            return self._expanded
+
+    def _query(self, sql: str, params: Iterable) -> List[Tuple]:
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+            return conn.execute(sql, tuple(params)).fetchall()
+
+    def origins_of(self, prefix: str) -> List[int]:
+        """ASNs com route/route6 registrado para o prefixo exato"""
+        rows = self._query("SELECT DISTINCT origin FROM route WHERE prefix = ?", (canonical_prefix(prefix),))
+        return sorted(r[0] for r in rows)
+
+    def prefixes_of(self, asns: Iterable[int]) -> Dict[str, List[str]]:
+        """Prefixos com route/route6 de qualquer um dos ASNs, no formato de RipeStatService.fetch_prefixes"""
+        asns = sorted(set(asns))
+        prefixes: Set[str] = set()
+        for i in range(0, len(asns), QUERY_CHUNK_SIZE):
+            chunk = asns[i:i + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            prefixes.update(r[0] for r in self._query(f"SELECT DISTINCT prefix FROM route WHERE origin IN ({placeholders})", chunk))
+        return {
+            "ipv4_prefixes": sorted(p for p in prefixes if ":" not in p),
+            "ipv6_prefixes": sorted(p for p in prefixes if ":" in p),
+        }
+
+    def _members(self, name: str) -> Optional[List[str]]:
+        rows = self._query("SELECT members FROM as_set WHERE name = ?", (name,))
+        if not rows:
+            return None
+        members: List[str] = []
+        for (value,) in rows:
+            members.extend(json.loads(value))
+        return members
+
+    def expand_as_set(self, name: str) -> Tuple[Set[int], List[str]]:
+        """
+        Expande um AS-SET (ou ASN) para o conjunto de ASNs
+
+        Busca em profundidade iterativa (Tarjan): conjuntos que se referenciam
+        em ciclo formam um componente e recebem o mesmo resultado; cada
+        conjunto é lido uma única vez e o resultado de todos os visitados
+        (com os avisos da sua subárvore) fica memorizado para as próximas
+        chamadas.
+
+        Returns:
+            (ASNs, avisos: conjuntos inexistentes e ciclos encontrados)
+        """
+        name = name.strip().upper()
+        asn = _parse_origin(name)
+        if asn is not None:
+            return {asn}, []
+        memo = self._memo()
+        if name in memo:
+            asns, warnings = memo[name]
+            return set(asns), list(warnings)
+
+        order: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        acc: Dict[str, Set[int]] = {}
+        # Avisos por conjunto (dict como conjunto ordenado), propagados como os ASNs
+        warned: Dict[str, Dict[str, None]] = {}
+        on_stack: Set[str] = set()
+        component: List[str] = []
+
+        def visit(set_name: str) -> Iterator[str]:
+            """Registra o conjunto e devolve os AS-SETs membros a visitar"""
+            order[set_name] = low[set_name] = len(order)
+            on_stack.add(set_name)
+            component.append(set_name)
+            members = self._members(set_name)
+            warned[set_name] = {}
+            if members is None:
+                warned[set_name][f"{set_name} não encontrado"] = None
+                members = []
+            acc[set_name] = {a for a in map(_parse_origin, members) if a is not None}
+            # route-sets e outros membros não entram no cone de ASNs
+            return iter([m for m in members if _parse_origin(m) is None and "AS-" in m])
+
+        path = [(name, visit(name))]
+        while path:
+            current, children = path[-1]
+            child = next(children, None)
+            if child is not None:
+                if child in memo:
+                    child_asns, child_warnings = memo[child]
+                    acc[current] |= child_asns
+                    warned[current].update(dict.fromkeys(child_warnings))
+                elif child not in order:
+                    path.append((child, visit(child)))
+                elif child in on_stack:
+                    warned[current][f"ciclo em {child}"] = None
+                    low[current] = min(low[current], order[child])
+                continue
+
+            path.pop()
+            if path:
+                parent = path[-1][0]
+                low[parent] = min(low[parent], low[current])
+            if low[current] == order[current]:
+                # Raiz do componente: todos os membros do ciclo têm o mesmo resultado
+                members = []
+                while True:
+                    member = component.pop()
+                    on_stack.discard(member)
+                    members.append(member)
+                    if member == current:
+                        break
+                total = set().union(*(acc[m] for m in members))
+                total_warnings: Dict[str, None] = {}
+                for member in reversed(members):
+                    total_warnings.update(warned[member])
+                for member in members:
+                    memo[member] = (total, list(total_warnings))
+                if path:
+                    acc[path[-1][0]] |= total
+                    warned[path[-1][0]].update(total_warnings)
+
+        asns, warnings = memo[name]
+        return set(asns), list(warnings)
+
+    def customer_cone(self, name: str) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Prefixos registrados no IRR para todos os ASNs do AS-SET (ou do ASN)"""
+        asns, warnings = self.expand_as_set(name)
+        return self.prefixes_of(asns), warnings
+
+    def verify(self, prefixes: Iterable[str], asns: Set[int]) -> Dict[str, bool]:
+        """
+        Para cada prefixo, se há route/route6 com origem em 'asns'
+
+        Os prefixos são consultados em lote (QUERY_CHUNK_SIZE por consulta);
+        bits de host são ignorados e prefixos inválidos contam como sem registro.
+        """
+        canonical: Dict[str, Optional[str]] = {}
+        for prefix in prefixes:
+            try:
+                canonical[prefix] = canonical_prefix(prefix)
+            except ValueError:
+                canonical[prefix] = None
+
+        keys = sorted({c for c in canonical.values() if c is not None})
+        registered: Set[str] = set()
+        for i in range(0, len(keys), QUERY_CHUNK_SIZE):
+            chunk = keys[i:i + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._query(f"SELECT DISTINCT prefix, origin FROM route WHERE prefix IN ({placeholders})", chunk)
+            registered.update(prefix for prefix, origin in rows if origin in asns)
+        return {prefix: canonical[prefix] in registered for prefix in canonical}
+
+# Instância única compartilhada pelo processo
+IRR = IrrIndex()
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa dumps RPSL (route, route6, as-set) para o índice IRR local")
+    parser.add_argument("sources", type=Path, nargs="+", help="Dumps RPSL (.gz/.bz2 aceitos), ex.: ripe.db.route.gz")
+    parser.add_argument("--output", type=Path, default=INDEX_PATH, help=f"Índice gerado (padrão: {INDEX_PATH})")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = build_index(args.sources, args.output)
+    print(
+        f"{counts['route']} route, {counts['route6']} route6, {counts['as-set']} as-set "
+        f"em {time.perf_counter() - started:.1f}s -> {args.output}"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+import requests
+
+# Tamanho dos blocos lidos da resposta
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+class _StreamReader:
+    """Buffer de texto sobre um iterador de blocos, descartando o que já foi lido"""
+
+    def __init__(self, chunks: Iterator[str]):
+        self.chunks = chunks
+        self.buffer = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo caractere significativo (sem consumi-lo)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("JSON truncado")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON inválido: esperado '{char}' na posição {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodifica o próximo valor JSON completo, lendo mais blocos se preciso"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Um número no fim do buffer pode continuar no próximo bloco
+            if end == len(self.buffer) and isinstance(value, (int, float)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+def iter_page(chunks: Iterable[str], meta: Dict) -> Iterator[Any]:
+    """
+    Percorre uma página da API do Netbox, entregando os itens de 'results'
+    um a um conforme chegam
+
+    As demais chaves do objeto (count, next, previous) são gravadas em 'meta'.
+    """
+    reader = _StreamReader(iter(chunks))
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+
+        if key == "results" and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    separator = reader.peek()
+                    reader.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError(f"JSON inválido na posição {reader.pos}")
+        else:
+            meta[key] = reader.value()
+
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"JSON inválido na posição {reader.pos}")
+
+def decode_page(response, transform: Optional[Callable[[Dict], Dict]] = None) -> Tuple[Dict, int]:
+    """
+    Decodifica a resposta (requisitada com stream=True) sem montar o JSON inteiro
+
+    Cada item de 'results' passa por 'transform' assim que é lido, de modo que
+    apenas os itens já reduzidos ficam em memória. Eles ainda são reunidos
+    em uma lista: o chamador só os recebe ao fim da página, já que a página
+    inteira é o que os caches de resposta guardam. Para consumir os itens
+    enquanto chegam, use iter_page.
+
+    Returns:
+        Tupla (página, bytes lidos)
+
+    Raises:
+        requests.exceptions.InvalidJSONError: corpo truncado ou malformado
+        (tratado como as demais falhas de requisição)
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    received = 0
+
+    def chunks() -> Iterator[str]:
+        nonlocal received
+        for block in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            received += len(block)
+            yield decoder.decode(block)
+        yield decoder.decode(b"", final=True)
+
+    meta: Dict = {}
+    try:
+        results = [transform(item) if transform else item for item in iter_page(chunks(), meta)]
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(f"Resposta JSON inválida: {e}", response=response) from e
+    return {**meta, "results": results}, received
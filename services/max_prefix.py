@@ -0,0 +1,97 @@
+"""
+Recomendação de max-prefix (peer ... route-limit) por família
+
+Usa o histórico local de contagens de prefixos anunciados (services.asn_cache)
+em vez de uma única leitura: o limite é o pico observado, projetado pelo
+percentil do crescimento em janelas de GROWTH_WINDOW_DAYS, mais uma folga.
+Todas as recomendações saem de uma consulta ao cache, sem acessar o RIPEstat.
+
+Uso:
+    python -m services.max_prefix [ASN ...]
+"""
+import argparse
+import math
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.asn_cache import ASN_CACHE
+
+GROWTH_WINDOW_DAYS = 90
+GROWTH_PERCENTILE = 95
+HEADROOM = 0.2  # folga sobre o pico projetado
+MIN_LIMIT = 10
+DAY = 86400
+
+def _round_up(value: float) -> int:
+    """Arredonda para cima em dois algarismos significativos (137 -> 140, 1234 -> 1300)"""
+    value = math.ceil(value)
+    step = 10 ** max(0, len(str(value)) - 2)
+    return -(-value // step) * step
+
+def growth_factor(times: np.ndarray, counts: np.ndarray) -> Tuple[float, int]:
+    """
+    Percentil do crescimento (razão entre contagens) em janelas de GROWTH_WINDOW_DAYS
+
+    Cada amostra é comparada à última anterior que esteja a pelo menos uma
+    janela de distância; razões abaixo de 1 (redução) contam como 1.
+
+    Returns:
+        (fator de crescimento, quantidade de janelas usadas)
+    """
+    earlier = np.searchsorted(times, times - GROWTH_WINDOW_DAYS * DAY, side="right") - 1
+    usable = (earlier >= 0) & (counts > 0)
+    usable[usable] &= counts[earlier[usable]] > 0
+    if not usable.any():
+        return 1.0, 0
+    ratios = counts[usable] / counts[earlier[usable]]
+    return max(1.0, float(np.percentile(ratios, GROWTH_PERCENTILE))), int(usable.sum())
+
+def recommend(history: List[Tuple[float, int, int]]) -> Dict:
+    """
+    Max-prefix recomendado a partir do histórico de um ASN
+
+    Returns:
+        {"ipv4", "ipv6" (None quando a família nunca foi anunciada), "current_v4",
+         "current_v6", "growth_v4", "growth_v6", "samples", "windows", "since"}
+    """
+    data = np.array(history, dtype=np.float64).reshape(-1, 3)
+    result: Dict = {"samples": len(data), "since": float(data[0, 0]) if len(data) else None, "windows": 0}
+    for column, suffix in ((1, "v4"), (2, "v6")):
+        counts = data[:, column]
+        growth, windows = growth_factor(data[:, 0], counts) if len(data) else (1.0, 0)
+        peak = float(counts.max()) if len(data) else 0.0
+        result[f"current_{suffix}"] = int(counts[-1]) if len(data) else 0
+        result[f"growth_{suffix}"] = growth
+        result[f"ip{suffix}"] = max(MIN_LIMIT, _round_up(peak * growth * (1 + HEADROOM))) if peak else None
+        result["windows"] = max(result["windows"], windows)
+    return result
+
+def recommend_many(asns: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """Recomendações para vários ASNs (None = todos do cache) com uma única consulta ao histórico"""
+    return {asn: recommend(history) for asn, history in ASN_CACHE.count_history(asns).items()}
+
+def recommend_for(asn: str) -> Optional[Dict]:
+    """Recomendação para um ASN; None se ainda não há contagens no cache"""
+    return recommend_many([asn]).get(asn)
+
+def main():
+    parser = argparse.ArgumentParser(description="Max-prefix recomendado a partir do histórico local de prefixos anunciados")
+    parser.add_argument("asns", nargs="*", help="ASNs (padrão: todos os do cache)")
+    args = parser.parse_args()
+
+    asns = [a.upper().replace("AS", "") for a in args.asns] or None
+    recommendations = recommend_many(asns)
+    print(f"{'ASN':>10} {'IPv4':>8} {'limite':>8} {'IPv6':>8} {'limite':>8} {'amostras':>9}")
+    for asn, rec in sorted(recommendations.items(), key=lambda item: int(item[0]) if item[0].isdigit() else 0):
+        print(
+            f"{'AS' + asn:>10} {rec['current_v4']:>8} {rec['ipv4'] or '-':>8} "
+            f"{rec['current_v6']:>8} {rec['ipv6'] or '-':>8} {rec['samples']:>9}"
+        )
+
+if __name__ == "__main__":
+    main()
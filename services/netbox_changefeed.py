@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+import requests
+from typing import Dict, List, Optional, Set
+from urllib.parse import urljoin
+from config.settings import AppConfig
+from services.adaptive_limiter import HOST_LIMITERS
+from services.cache_invalidation import INVALIDATIONS
+from services.snapshot_store import SNAPSHOTS
+
+logger = logging.getLogger(__name__)
+
+# Registros do changelog lidos por requisição
+CHANGEFEED_PAGE_SIZE = 500
+
+# Tipo de objeto do Netbox -> prefixo da tag usada nos caches
+OBJECT_TYPE_TAGS = {
+    "tenancy.tenant": "tenant",
+    "dcim.site": "site",
+    "dcim.device": "device",
+    "dcim.interface": "interface",
+    "ipam.ipaddress": "ip",
+    "circuits.circuit": "circuit",
+}
+
+# Campos dos dados pré/pós alteração que apontam para objetos cacheados
+RELATED_FIELDS = {
+    "tenant": "tenant",
+    "site": "site",
+    "device": "device",
+    "primary_ip4": "ip",
+    "primary_ip6": "ip",
+}
+
+# Endpoint da API -> tipo de objeto (para tratar escritas locais como alterações)
+ENDPOINT_OBJECT_TYPES = {
+    "tenancy/tenants/": "tenancy.tenant",
+    "dcim/sites/": "dcim.site",
+    "dcim/devices/": "dcim.device",
+    "dcim/interfaces/": "dcim.interface",
+    "ipam/ip-addresses/": "ipam.ipaddress",
+    "circuits/circuits/": "circuits.circuit",
+}
+
+def _object_type(value) -> Optional[str]:
+    # Netbox 3.x/4.x serializam o content type como "app.model"
+    if isinstance(value, dict):
+        return f"{value.get('app_label')}.{value.get('model')}"
+    return value
+
+def _related_id(value) -> Optional[int]:
+    if isinstance(value, dict):
+        return value.get("id")
+    return value if isinstance(value, int) else None
+
+def change_tags(change: Dict) -> Set[str]:
+    """Tags dos objetos afetados por um registro do changelog"""
+    tags: Set[str] = set()
+
+    kind = OBJECT_TYPE_TAGS.get(_object_type(change.get("changed_object_type")))
+    if kind:
+        tags.add(f"{kind}:{change.get('changed_object_id')}")
+
+    related_kind = OBJECT_TYPE_TAGS.get(_object_type(change.get("related_object_type")))
+    if related_kind and change.get("related_object_id"):
+        tags.add(f"{related_kind}:{change['related_object_id']}")
+
+    for data in (change.get("prechange_data"), change.get("postchange_data")):
+        for field, related in RELATED_FIELDS.items():
+            related_id = _related_id((data or {}).get(field))
+            if related_id:
+                tags.add(f"{related}:{related_id}")
+
+    # Listas e contagens que dependem da existência dos objetos
+    if kind == "tenant":
+        tags.add("tenants")
+    if kind in ("site", "device", "interface", "circuit"):
+        tags.add("counts")
+    return tags
+
+def apply_change(change: Dict):
+    """Invalida os caches afetados por um registro do changelog"""
+    tags = change_tags(change)
+    if not tags:
+        return
+    INVALIDATIONS.invalidate(tags)
+
+    if "tenants" in tags:
+        SNAPSHOTS.expire_family("tenants_list")
+    if _object_type(change.get("changed_object_type")) == "dcim.site":
+        SNAPSHOTS.expire_family("sites_all")
+        for tag in tags:
+            if tag.startswith("tenant:"):
+                SNAPSHOTS.expire_family(f"sites_{tag.split(':', 1)[1]}")
+
+def apply_local_write(endpoint: str, objects: List[Dict]):
+    """Invalida os caches após uma escrita feita por este processo (sem esperar o changelog)"""
+    object_type = ENDPOINT_OBJECT_TYPES.get(endpoint)
+    if not object_type:
+        return
+    for obj in objects:
+        if isinstance(obj, dict) and obj.get("id"):
+            apply_change({"changed_object_type": object_type, "changed_object_id": obj["id"], "postchange_data": obj})
+
+class NetboxChangeFeed:
+    """
+    Acompanha o changelog do Netbox (object-changes) e invalida os caches afetados
+
+    Consulta periodicamente os registros com ID acima do último processado
+    (cursor) e traduz cada alteração nas tags dos objetos envolvidos: o próprio
+    objeto e os tenants/sites/dispositivos/IPs que ele referencia antes e depois
+    da mudança. Entradas de cache com essas tags deixam de ser servidas em
+    todas as sessões, e as listas locais (tenants/sites) são atualizadas em
+    segundo plano. Assim os caches podem usar TTLs longos.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.config = AppConfig.NETBOX
+        self.url = urljoin(f"{self.config.url.rstrip('/')}/", self.config.changefeed_endpoint.lstrip('/'))
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Token {self.config.api_token}",
+            "Accept": "application/json"
+        })
+        self.cursor: Optional[int] = None
+        self._stats = {"polls": 0, "changes": 0, "errors": 0, "last_poll": None}
+
+    def _fetch(self, params: Dict) -> Dict:
+        limiter = HOST_LIMITERS.for_url(self.url, self.config.max_concurrency, self.config.latency_target)
+        with limiter.slot(timeout=self.config.timeout) as observe:
+            response = self.session.get(self.url, params=params, timeout=self.config.timeout)
+            observe(status=response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+    def _init_cursor(self):
+        """Começa a partir do registro mais recente, sem reprocessar o histórico"""
+        data = self._fetch({"ordering": "-id", "limit": 1})
+        results = data.get("results") or []
+        self.cursor = results[0]["id"] if results else 0
+
+    def poll(self) -> int:
+        """Processa os registros novos do changelog; retorna quantos foram lidos"""
+        if self.cursor is None:
+            self._init_cursor()
+            return 0
+
+        processed = 0
+        while True:
+            data = self._fetch({"id__gt": self.cursor, "ordering": "id", "limit": CHANGEFEED_PAGE_SIZE})
+            results = data.get("results") or []
+            for change in results:
+                apply_change(change)
+                self.cursor = max(self.cursor, change["id"])
+            processed += len(results)
+            if len(results) < CHANGEFEED_PAGE_SIZE:
+                break
+
+        self._stats["polls"] += 1
+        self._stats["changes"] += processed
+        self._stats["last_poll"] = time.time()
+        return processed
+
+    def stats(self) -> Dict:
+        return {**self._stats, "cursor": self.cursor}
+
+    def run(self):
+        while True:
+            try:
+                self.poll()
+            except (requests.exceptions.RequestException, ValueError, KeyError):
+                # Netbox fora ou resposta inesperada: tenta de novo no próximo ciclo
+                self._stats["errors"] += 1
+            except Exception:
+                # Qualquer outro erro não pode derrubar a thread: a invalidação pararia de vez
+                self._stats["errors"] += 1
+                logger.exception("Falha ao processar o changelog do Netbox")
+            time.sleep(self.interval)
+
+_feed: Optional[NetboxChangeFeed] = None
+_feed_lock = threading.Lock()
+
+def ensure_started() -> Optional[NetboxChangeFeed]:
+    """
+    Inicia (uma única vez por processo) a thread que acompanha o changelog
+
+    Desativado quando AppConfig.NETBOX_CHANGEFEED_INTERVAL é 0.
+    """
+    global _feed
+    if AppConfig.NETBOX_CHANGEFEED_INTERVAL <= 0 or not AppConfig.NETBOX.url:
+        return None
+    with _feed_lock:
+        if _feed is None:
+            _feed = NetboxChangeFeed(AppConfig.NETBOX_CHANGEFEED_INTERVAL)
+            threading.Thread(target=_feed.run, name="netbox-changefeed", daemon=True).start()
+    return _feed
@@ -1,15 +1,100 @@
+import time
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Optional, Sequence, Tuple
 from config.settings import AppConfig
 from core.session_state import SessionStateManager
+from services.response_cache import RESPONSE_CACHE, LAST_KNOWN_GOOD
+from services.circuit_breaker import NETBOX_BREAKER, NetboxUnavailableError
+from services.single_flight import SINGLE_FLIGHT
+from services.snapshot_store import SNAPSHOTS
+from services.cache_invalidation import INVALIDATIONS
+from services.adaptive_limiter import HOST_LIMITERS, THROTTLE_STATUSES, NetboxThrottledError, parse_retry_after
+from services.json_stream import decode_page
+from services.netbox_changefeed import apply_local_write
 import streamlit as st
 
+# Quantidade máxima de IDs por requisição filtrada (mantém a URL em tamanho seguro)
+BULK_FILTER_CHUNK = 100
+
+# Consulta GraphQL do inventário do tenant: apenas os campos renderizados na UI
+TENANT_INVENTORY_QUERY = """
+query TenantInventory {
+  site_list(filters: {tenant_id: "%(tenant_id)s"}) {
+    id
+    name
+    slug
+    status
+    region { name }
+    devices {
+      id
+      name
+      status
+      primary_ip4 { id address }
+      primary_ip6 { id address }
+      interfaces { id name enabled type }
+    }
+  }
+}
+"""
+
+# Espera base (s) entre tentativas após 429/503 sem Retry-After (dobra a cada tentativa)
+RETRY_BACKOFF_BASE = 0.5
+
+# Tamanho de página para listagens grandes de interfaces
+INTERFACE_PAGE_SIZE = 1000
+
+# Busca de tenants (autocomplete): tamanho mínimo do termo e validade do cache por termo
+TENANT_SEARCH_MIN_CHARS = 2
+TENANT_SEARCH_TTL = 60
+
+# Campos da representação "brief" do Netbox por endpoint
+BRIEF_FIELDS = {
+    "tenancy/tenants/": {"id", "url", "display", "name", "slug", "description"},
+    "dcim/sites/": {"id", "url", "display", "name", "slug", "description"},
+    "dcim/devices/": {"id", "url", "display", "name", "description"},
+    "dcim/interfaces/": {"id", "url", "display", "device", "name", "description", "cable"},
+}
+
+def project_fields(item: Dict, fields: Sequence[str]) -> Dict:
+    """
+    Mantém apenas os campos informados de um objeto do Netbox
+    
+    Aceita caminhos aninhados com ponto, ex.: ('id', 'status.label', 'region.name')
+    """
+    nested: Dict[str, List[str]] = {}
+    result = {}
+    
+    for path in fields:
+        head, _, rest = path.partition('.')
+        if head not in item:
+            continue
+        if rest:
+            nested.setdefault(head, []).append(rest)
+        else:
+            result[head] = item[head]
+    
+    for head, sub_fields in nested.items():
+        if head in result:
+            continue
+        value = item[head]
+        result[head] = project_fields(value, sub_fields) if isinstance(value, dict) else value
+    
+    return result
+
 class NetboxService:
     """Serviço para interação com a API do Netbox"""
     
+    # Projeções com os campos efetivamente usados pela UI
+    TENANT_FIELDS = ('id', 'name', 'slug')
+    SITE_FIELDS = ('id', 'name', 'slug', 'status.label', 'region.name')
+    DEVICE_FIELDS = ('id', 'name', 'status.label', 'primary_ip4.address', 'primary_ip6.address')
+    INTERFACE_FIELDS = ('id', 'name', 'enabled', 'type')
+    
     def __init__(self):
         self.config = AppConfig.NETBOX
         self.base_url = self.config.url
+        self.graphql_url = self.config.graphql_url or self._default_graphql_url()
         self.headers = {
             "Authorization": f"Token {self.config.api_token}",
             "Content-Type": "application/json",
@@ -17,51 +102,355 @@ class NetboxService:
         }
         self.state = SessionStateManager()
     
+    def _get_json(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        allow_stale: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict:
+        """
+        GET protegido pelo circuit breaker
+        
+        Com o circuito aberto (ou em falha de conexão/5xx), serve a última resposta
+        boa conhecida, se houver e 'allow_stale' for verdadeiro; caso contrário
+        propaga o erro. Com 'fields', os itens de 'results' já vêm reduzidos a
+        esses campos (e é assim que ficam nos caches).
+        
+        O objeto retornado é o mesmo guardado nos caches de resposta: chame
+        sempre através do SINGLE_FLIGHT, que entrega uma cópia a cada chamador.
+        """
+        cache_key = RESPONSE_CACHE.make_key(url, params)
+        if fields:
+            cache_key += (tuple(fields),)
+        
+        admission = NETBOX_BREAKER.allow_request()
+        if admission is None:
+            error = NetboxUnavailableError("Netbox indisponível (circuit breaker aberto)")
+            return self._serve_stale(cache_key, error, allow_stale)
+        
+        try:
+            data, wire_time = self._conditional_get(url, params, cache_key, fields)
+        except NetboxThrottledError as e:
+            # Fila local cheia: não é falha do Netbox
+            return self._serve_stale(cache_key, e, allow_stale)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code < 500 and e.response.status_code != 429:
+                # Erro do cliente (4xx): não diz nada sobre a saúde do Netbox.
+                # Já o 429 que persiste após as novas tentativas é sobrecarga, como um 5xx
+                raise
+            NETBOX_BREAKER.record_failure()
+            return self._serve_stale(cache_key, e, allow_stale)
+        except requests.exceptions.RequestException as e:
+            NETBOX_BREAKER.record_failure()
+            return self._serve_stale(cache_key, e, allow_stale)
+        else:
+            NETBOX_BREAKER.record_success(wire_time)
+        finally:
+            NETBOX_BREAKER.release_probe(admission)
+        
+        LAST_KNOWN_GOOD.store(cache_key, data)
+        return data
+    
+    def _serve_stale(self, cache_key, error: Exception, allow_stale: bool) -> Dict:
+        """Retorna a última resposta boa conhecida ou propaga o erro"""
+        stale = LAST_KNOWN_GOOD.get(cache_key) if allow_stale else None
+        if stale is None:
+            raise error
+        return stale
+    
+    def _conditional_get(self, url: str, params: Optional[Dict], cache_key, fields: Optional[Sequence[str]] = None) -> Tuple[Dict, float]:
+        """
+        GET condicional: envia If-None-Match / If-Modified-Since quando há validadores
+        armazenados e, em caso de 304, reaproveita o corpo já decodificado
+        
+        Listagens com 'fields' são decodificadas em streaming (se habilitado):
+        cada item é reduzido aos campos pedidos assim que é lido, sem manter o
+        corpo bruto nem os objetos completos em memória. A página reduzida
+        ainda é montada por inteiro antes de retornar, pois é ela que vai
+        para os caches.
+        
+        Returns:
+            Tupla (dados, tempo de rede das requisições em segundos)
+        """
+        headers = {**self.headers, **RESPONSE_CACHE.conditional_headers(cache_key)}
+        stream = bool(fields) and self.config.stream_json
+        
+        response = self._send("GET", url, headers=headers, params=params, stream=stream)
+        wire_time = response.wire_time
+        
+        if response.status_code == 304:
+            payload = RESPONSE_CACHE.not_modified(cache_key)
+            if payload is not None:
+                return payload, wire_time
+            # Validador descartado entre o envio e a resposta: busca completa
+            response = self._send("GET", url, headers=self.headers, params=params, stream=stream)
+            wire_time += response.wire_time
+        
+        response.raise_for_status()
+        
+        if stream:
+            with response:
+                data, size = decode_page(response, lambda item: project_fields(item, fields))
+        else:
+            data, size = response.json(), len(response.content)
+            if fields and "results" in data:
+                data = {**data, "results": [project_fields(item, fields) for item in data["results"]]}
+        
+        RESPONSE_CACHE.store(cache_key, response.headers, data, size)
+        return data, wire_time
+    
+    def _send(self, method: str, url: str, retry: bool = True, **kwargs) -> requests.Response:
+        """
+        Envia a requisição dentro do limite de concorrência adaptativo do host
+        
+        O limite é compartilhado por todas as sessões do processo. Respostas
+        429/503 reduzem a concorrência e são repetidas (até max_retries),
+        respeitando o Retry-After ou, na falta dele, um backoff exponencial.
+        Com retry=False a resposta 429/503 é devolvida sem nova tentativa
+        (escritas não idempotentes).
+        
+        A resposta traz 'wire_time': a duração da última tentativa, sem a
+        espera por vaga, Retry-After ou backoff, que é a latência que o
+        circuit breaker deve julgar.
+        """
+        limiter = HOST_LIMITERS.for_url(url, self.config.max_concurrency, self.config.latency_target)
+        max_retries = self.config.max_retries if retry else 0
+        
+        for attempt in range(max_retries + 1):
+            with limiter.slot(timeout=self.config.timeout) as observe:
+                sent = time.monotonic()
+                response = requests.request(method, url, timeout=self.config.timeout, **kwargs)
+                response.wire_time = time.monotonic() - sent
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                observe(status=response.status_code, retry_after=retry_after)
+            
+            if response.status_code not in THROTTLE_STATUSES or attempt == max_retries:
+                return response
+            response.close()
+            if retry_after is None:
+                # Com Retry-After o próprio limitador segura as próximas requisições ao host
+                time.sleep(RETRY_BACKOFF_BASE * 2 ** attempt)
+        
+        return response
+    
+    @staticmethod
+    def is_degraded() -> bool:
+        """Indica se o Netbox está em modo degradado (circuit breaker aberto)"""
+        return NETBOX_BREAKER.is_open()
+    
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Faz requisição para a API do Netbox"""
         try:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            flight_key = ("get", RESPONSE_CACHE.make_key(url, params))
+            return SINGLE_FLIGHT.do(flight_key, lambda: self._get_json(url, params=params))
         except requests.exceptions.RequestException as e:
-            st.error(f"Erro ao conectar com Netbox: {str(e)}")
+            # Com o circuito aberto o aviso de modo degradado já é exibido
+            if not isinstance(e, NetboxUnavailableError):
+                st.error(f"Erro ao conectar com Netbox: {str(e)}")
             return {"results": [], "count": 0}
     
-    def _get_paginated_results(self, endpoint: str, params: Optional[Dict] = None) -> List[Dict]:
-        """Obtém todos os resultados paginados"""
+    def _default_graphql_url(self) -> Optional[str]:
+        """Deriva o endpoint GraphQL a partir da URL da API REST"""
+        if not self.base_url:
+            return None
+        root = self.base_url.rstrip('/')
+        if root.endswith('/api'):
+            root = root[:-len('/api')]
+        return f"{root}/graphql/"
+    
+    def _graphql_query(self, query: str) -> Optional[Dict]:
+        """Executa uma consulta GraphQL, retornando None em caso de falha"""
+        if not self.graphql_url:
+            return None
+        admission = NETBOX_BREAKER.allow_request()
+        if admission is None:
+            return None
+        try:
+            response = self._send("POST", self.graphql_url, headers=self.headers, json={"query": query})
+            if response.status_code >= 500:
+                NETBOX_BREAKER.record_failure()
+                return None
+            if not response.ok:
+                # 4xx (GraphQL desativado, sem permissão): o chamador recorre ao REST
+                return None
+            payload = response.json()
+        except NetboxThrottledError:
+            return None
+        except requests.exceptions.RequestException:
+            # Conexão, timeout ou corpo que não é JSON
+            NETBOX_BREAKER.record_failure()
+            return None
+        else:
+            NETBOX_BREAKER.record_success(response.wire_time)
+        finally:
+            NETBOX_BREAKER.release_probe(admission)
+        
+        if payload.get("errors") or not payload.get("data"):
+            return None
+        return payload["data"]
+    
+    def _projection_params(self, endpoint: str, fields: Optional[Sequence[str]]) -> Dict:
+        """
+        Parâmetros de projeção no servidor: 'brief' quando a representação resumida
+        cobre os campos pedidos, senão 'fields' (Netbox 4.0+)
+        """
+        if not fields:
+            return {}
+        top_level = {path.split('.')[0] for path in fields}
+        if top_level <= BRIEF_FIELDS.get(endpoint, set()):
+            return {"brief": "true"}
+        if self.config.field_projection:
+            return {"fields": ",".join(sorted(top_level))}
+        return {}
+    
+    def _get_paginated_results(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        fields: Optional[Sequence[str]] = None,
+        strict: bool = False
+    ) -> List[Dict]:
+        """
+        Obtém todos os resultados paginados
+        
+        Com 'fields', pede ao Netbox apenas esses campos e poda os objetos
+        no cliente, para que o cache guarde somente o necessário. Chamadas
+        idênticas concorrentes (de qualquer sessão) compartilham a mesma busca.
+        Com 'strict', erros de rede propagam em vez de retornar resultados parciais.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        params = {**(params or {}), **self._projection_params(endpoint, fields)} or None
+        
+        flight_key = ("pages", RESPONSE_CACHE.make_key(url, params), tuple(fields or ()), strict)
+        return SINGLE_FLIGHT.do(flight_key, lambda: self._fetch_all_pages(url, params, fields, strict))
+    
+    def _fetch_all_pages(
+        self,
+        next_url: str,
+        params: Optional[Dict],
+        fields: Optional[Sequence[str]],
+        strict: bool = False
+    ) -> List[Dict]:
+        """Percorre as páginas seguindo o link 'next'"""
         all_results = []
-        next_url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
         while next_url:
             try:
-                response = requests.get(next_url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(next_url, params=params, allow_stale=not strict, fields=fields)
                 all_results.extend(data.get("results", []))
                 next_url = data.get("next")
                 params = None  # Params já estão na next_url
             except requests.exceptions.RequestException as e:
-                st.error(f"Erro ao buscar dados paginados: {str(e)}")
+                if strict:
+                    raise
+                if not isinstance(e, NetboxUnavailableError):
+                    st.error(f"Erro ao buscar dados paginados: {str(e)}")
                 break
         
         return all_results
     
+    # Cache da sessão com expiração
+    def _cache_get(self, key: str, ttl: Optional[int] = None) -> Any:
+        """
+        Retorna o valor do cache da sessão se ainda estiver dentro do TTL
+        e nenhuma das suas tags tiver sido invalidada (feed de mudanças)
+        """
+        entry = self.state.get('cache', {}).get(key)
+        if not entry:
+            return None
+        if time.time() - entry['stored_at'] > (ttl or AppConfig.CACHE_TTL):
+            return None
+        if INVALIDATIONS.is_stale(entry.get('tags', ()), entry['stored_at']):
+            return None
+        return entry['value']
+    
+    def _cache_set(self, key: str, value: Any, tags: Sequence[str] = ()):
+        """Armazena um valor no cache da sessão, com as tags dos objetos de que depende"""
+        cache = self.state.get('cache', {})
+        cache[key] = {'value': value, 'stored_at': time.time(), 'tags': tuple(tags)}
+        self.state.set('cache', cache)
+    
+    @staticmethod
+    def _fields_cache_key(base_key: str, fields: Optional[Sequence[str]]) -> str:
+        """Chave de cache que distingue objetos completos de projeções"""
+        return f"{base_key}:{','.join(fields)}" if fields else base_key
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Contadores das requisições condicionais (304 e bytes economizados) e das chamadas coalescidas"""
+        return {**RESPONSE_CACHE.stats(), "coalesced": SINGLE_FLIGHT.stats()["coalesced"]}
+    
+    def get_concurrency_stats(self) -> Dict:
+        """Estado do limite de concorrência adaptativo do host do Netbox"""
+        limiter = HOST_LIMITERS.for_url(self.base_url or "", self.config.max_concurrency, self.config.latency_target)
+        return limiter.stats()
+    
     # Métodos para Tenants
-    def get_tenants(self) -> List[Dict]:
+    def _get_snapshot_list(self, key: str, endpoint: str, params: Optional[Dict], fields: Optional[Sequence[str]]) -> List[Dict]:
+        """
+        Lista servida da última cópia conhecida (memória/disco), atualizada em segundo plano
+        após AppConfig.SNAPSHOT_SOFT_TTL. Só bloqueia na primeira carga.
+        """
+        loader = lambda: self._get_paginated_results(endpoint, params=params, fields=fields, strict=True)
+        try:
+            return SNAPSHOTS.get(key, loader, soft_ttl=AppConfig.SNAPSHOT_SOFT_TTL)
+        except requests.exceptions.RequestException as e:
+            if not isinstance(e, NetboxUnavailableError):
+                st.error(f"Erro ao buscar dados paginados: {str(e)}")
+            return []
+    
+    def has_snapshot(self, key: str) -> bool:
+        """Indica se já existe cópia local da lista (a leitura não vai bloquear)"""
+        return SNAPSHOTS.age(key) is not None
+    
+    def tenants_snapshot_key(self, fields: Optional[Sequence[str]] = None) -> str:
+        """Chave da cópia local da lista de tenants"""
+        return self._fields_cache_key('tenants_list', fields)
+    
+    def get_tenants(self, fields: Optional[Sequence[str]] = None) -> List[Dict]:
         """Busca todos os tenants"""
-        cache_key = 'tenants_list'
-        cached = self.state.get('cache', {}).get(cache_key)
+        return self._get_snapshot_list(self.tenants_snapshot_key(fields), "tenancy/tenants/", None, fields)
+    
+    def search_tenants(self, query: str, limit: int = 20, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        Busca tenants pelo nome/slug, retornando apenas os N melhores resultados
         
-        if cached:
-            return cached
+        Usa a cópia local da lista de tenants quando existir; caso contrário faz
+        uma consulta ?q= limitada no Netbox. A lista completa nunca é baixada aqui.
+        """
+        query = query.strip()
+        if len(query) < TENANT_SEARCH_MIN_CHARS:
+            return []
         
-        results = self._get_paginated_results("tenancy/tenants/")
+        fields = fields or self.TENANT_FIELDS
+        mirror = SNAPSHOTS.peek(self.tenants_snapshot_key(fields))
+        if mirror is not None:
+            needle = query.lower()
+            matches = [
+                t for t in mirror
+                if needle in (t.get('name') or '').lower() or needle in (t.get('slug') or '').lower()
+            ]
+            # Nomes que começam com o termo aparecem primeiro
+            matches.sort(key=lambda t: (not (t.get('name') or '').lower().startswith(needle), t.get('name') or ''))
+            return matches[:limit]
         
-        # Salvar no cache
-        cache = self.state.get('cache', {})
-        cache[cache_key] = results
-        self.state.set('cache', cache)
+        cache_key = f'tenant_search:{query.lower()}:{limit}'
+        cached = self._cache_get(cache_key, ttl=TENANT_SEARCH_TTL)
+        if cached is not None:
+            return cached
+        
+        url = f"{self.base_url}/tenancy/tenants/"
+        params = {"q": query, "limit": limit, **self._projection_params("tenancy/tenants/", fields)}
+        try:
+            data = SINGLE_FLIGHT.do(("get", RESPONSE_CACHE.make_key(url, params)), lambda: self._get_json(url, params=params))
+        except requests.exceptions.RequestException as e:
+            # Sem cache: a próxima tecla tenta de novo
+            if not isinstance(e, NetboxUnavailableError):
+                st.error(f"Erro ao conectar com Netbox: {str(e)}")
+            return []
+        results = [project_fields(item, fields) for item in data.get("results", [])]
+        self._cache_set(cache_key, results, tags=("tenants",))
         
         return results
     
@@ -70,11 +459,95 @@ class NetboxService:
         data = self._make_request(f"tenancy/tenants/{tenant_id}/")
         return data if data.get('id') else None
     
+    # Inventário completo do tenant (GraphQL)
+    def get_tenant_inventory(self, tenant_id: int) -> Optional[List[Dict]]:
+        """
+        Busca sites -> dispositivos -> interfaces -> IPs primários do tenant em uma única consulta GraphQL
+        
+        Returns:
+            Lista de sites no formato da API REST, cada um com a chave 'devices'
+            (e cada dispositivo com 'interfaces'), ou None se o GraphQL estiver indisponível
+            e o chamador deve recorrer aos métodos REST
+        """
+        cache_key = f'inventory_{tenant_id}'
+        cached = self._cache_get(cache_key)
+        
+        if cached is not None:
+            return cached
+        
+        data = self._graphql_query(TENANT_INVENTORY_QUERY % {"tenant_id": int(tenant_id)})
+        if data is None:
+            return None
+        
+        sites = [self._normalize_inventory_site(site) for site in data.get("site_list") or []]
+        self._cache_set(cache_key, sites, tags=self._inventory_tags(tenant_id, sites))
+        
+        return sites
+    
+    @staticmethod
+    def _inventory_tags(tenant_id: int, sites: List[Dict]) -> List[str]:
+        """Tags de todos os objetos contidos no inventário do tenant"""
+        tags = [f"tenant:{tenant_id}"]
+        for site in sites:
+            tags.append(f"site:{site['id']}")
+            for device in site["devices"]:
+                tags.append(f"device:{device['id']}")
+                for field in ("primary_ip4", "primary_ip6"):
+                    if device.get(field) and device[field].get("id"):
+                        tags.append(f"ip:{device[field]['id']}")
+        return tags
+    
+    @staticmethod
+    def _normalize_status(status: Optional[str]) -> Optional[Dict]:
+        """Converte o enum de status do GraphQL no formato {value, label} da API REST"""
+        if not status:
+            return None
+        value = str(status).lower()
+        return {"value": value, "label": value.replace('_', ' ').title()}
+    
+    @staticmethod
+    def _normalize_nested_ip(ip: Optional[Dict]) -> Optional[Dict]:
+        """Converte o ID (string no GraphQL) do IP aninhado para inteiro"""
+        if not ip:
+            return None
+        return {**ip, "id": int(ip["id"])} if ip.get("id") else ip
+    
+    def _normalize_inventory_site(self, site: Dict) -> Dict:
+        """Normaliza um site do GraphQL para o mesmo formato retornado pela API REST"""
+        devices = []
+        for device in site.get("devices") or []:
+            devices.append({
+                "id": int(device["id"]),
+                "name": device.get("name"),
+                "status": self._normalize_status(device.get("status")),
+                "primary_ip4": self._normalize_nested_ip(device.get("primary_ip4")),
+                "primary_ip6": self._normalize_nested_ip(device.get("primary_ip6")),
+                "interfaces": [
+                    {
+                        "id": int(iface["id"]),
+                        "name": iface.get("name"),
+                        "enabled": iface.get("enabled", True),
+                        "type": iface.get("type"),
+                    }
+                    for iface in device.get("interfaces") or []
+                ],
+            })
+        
+        return {
+            "id": int(site["id"]),
+            "name": site.get("name"),
+            "slug": site.get("slug"),
+            "status": self._normalize_status(site.get("status")),
+            "region": site.get("region"),
+            "devices": devices,
+        }
+    
     # Métodos para Sites
-    def get_sites(self, tenant_id: Optional[int] = None) -> List[Dict]:
+    def get_sites(self, tenant_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> List[Dict]:
         """Busca sites, opcionalmente filtrados por tenant"""
+        cache_key = self._fields_cache_key(f'sites_{tenant_id or "all"}', fields)
         params = {"tenant_id": tenant_id} if tenant_id else None
-        return self._get_paginated_results("dcim/sites/", params=params)
+        return self._get_snapshot_list(cache_key, "dcim/sites/", params, fields)
     
     def get_site_by_id(self, site_id: int) -> Optional[Dict]:
         """Busca site por ID"""
@@ -82,7 +555,12 @@ class NetboxService:
         return data if data.get('id') else None
     
     # Métodos para Dispositivos
-    def get_devices(self, site_id: Optional[int] = None, tenant_id: Optional[int] = None) -> List[Dict]:
+    def get_devices(
+        self,
+        site_id: Optional[int] = None,
+        tenant_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
         """Busca dispositivos, com filtros opcionais"""
         params = {}
         if site_id:
@@ -90,40 +568,343 @@ class NetboxService:
         if tenant_id:
             params['tenant_id'] = tenant_id
         
-        return self._get_paginated_results("dcim/devices/", params=params)
+        return self._get_paginated_results("dcim/devices/", params=params, fields=fields)
     
     def get_device_by_id(self, device_id: int) -> Optional[Dict]:
         """Busca dispositivo por ID"""
         data = self._make_request(f"dcim/devices/{device_id}/")
         return data if data.get('id') else None
     
-    def get_device_interfaces(self, device_id: int) -> List[Dict]:
+    def get_device_interfaces(self, device_id: int, fields: Optional[Sequence[str]] = None) -> List[Dict]:
         """Busca interfaces de um dispositivo"""
-        return self._get_paginated_results(f"dcim/interfaces/", params={"device_id": device_id})
+        return self._get_paginated_results("dcim/interfaces/", params={"device_id": device_id}, fields=fields)
     
-    # Métodos para IPs
-    def get_device_primary_ip(self, device_id: int) -> Optional[str]:
-        """Obtém o IP primário de um dispositivo"""
-        device = self.get_device_by_id(device_id)
-        if not device:
+    # Contagens (limit=1, lendo apenas o campo 'count')
+    def _count(self, endpoint: str, params: Optional[Dict] = None) -> Optional[int]:
+        """Conta objetos de um endpoint sem baixar a lista; None se a consulta falhar"""
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        params = {**(params or {}), "limit": 1, "brief": "true"}
+        try:
+            data = SINGLE_FLIGHT.do(("get", RESPONSE_CACHE.make_key(url, params)), lambda: self._get_json(url, params=params))
+        except requests.exceptions.RequestException as e:
+            if not isinstance(e, NetboxUnavailableError):
+                st.error(f"Erro ao conectar com Netbox: {str(e)}")
             return None
+        return data.get('count', 0)
+    
+    def _scope_params(self, tenant_id: Optional[int], site_id: Optional[int]) -> Dict:
+        """Filtros de tenant/site comuns às contagens"""
+        params = {}
+        if tenant_id:
+            params['tenant_id'] = tenant_id
+        if site_id:
+            params['site_id'] = site_id
+        return params
+    
+    def count_sites(self, tenant_id: Optional[int] = None) -> Optional[int]:
+        """Conta sites, opcionalmente por tenant"""
+        return self._count("dcim/sites/", self._scope_params(tenant_id, None))
+    
+    def count_devices(self, tenant_id: Optional[int] = None, site_id: Optional[int] = None) -> Optional[int]:
+        """Conta dispositivos por tenant e/ou site"""
+        return self._count("dcim/devices/", self._scope_params(tenant_id, site_id))
+    
+    def count_interfaces(self, tenant_id: Optional[int] = None, site_id: Optional[int] = None) -> Optional[int]:
+        """Conta interfaces por tenant (do dispositivo) e/ou site"""
+        params = self._scope_params(None, site_id)
+        if tenant_id:
+            params['device_tenant_id'] = tenant_id
+        return self._count("dcim/interfaces/", params)
+    
+    def count_circuits(self, tenant_id: Optional[int] = None, site_id: Optional[int] = None) -> Optional[int]:
+        """Conta circuitos por tenant e/ou site (terminação)"""
+        return self._count("circuits/circuits/", self._scope_params(tenant_id, site_id))
+    
+    def get_counts(self, tenant_id: Optional[int] = None, site_id: Optional[int] = None) -> Dict[str, Optional[int]]:
+        """
+        Estatísticas do tenant/site em requisições concorrentes de contagem
         
-        primary_ip = device.get('primary_ip')
-        if not primary_ip:
-            return None
+        Os sites não são contados aqui: as páginas já têm a lista carregada.
         
-        # Buscar detalhes do IP
-        ip_id = primary_ip.get('id')
-        if not ip_id:
-            return None
+        Returns:
+            Dict com as chaves 'devices', 'interfaces' e 'circuits';
+            None nas contagens que falharam (o resultado não vai para o cache)
+        """
+        cache_key = f'counts_{tenant_id or "all"}_{site_id or "all"}'
+        cached = self._cache_get(cache_key)
+        
+        if cached is not None:
+            return cached
+        
+        counters = {
+            "devices": lambda: self.count_devices(tenant_id, site_id),
+            "interfaces": lambda: self.count_interfaces(tenant_id, site_id),
+            "circuits": lambda: self.count_circuits(tenant_id, site_id),
+        }
+        with ThreadPoolExecutor(max_workers=len(counters)) as executor:
+            futures = {name: executor.submit(counter) for name, counter in counters.items()}
+            counts = {name: future.result() for name, future in futures.items()}
+        
+        if None in counts.values():
+            return counts
+        
+        tags = ["counts", f"tenant:{tenant_id}" if tenant_id else "tenants", f"site:{site_id}" if site_id else "sites"]
+        self._cache_set(cache_key, counts, tags=tags)
+        return counts
+    
+    # Pré-carga de interfaces por site
+    def _interfaces_cache_key(self, device_id: int, fields: Optional[Sequence[str]] = None) -> str:
+        return self._fields_cache_key(f'device_interfaces_{device_id}', tuple(fields or self.INTERFACE_FIELDS))
+    
+    def preload_site_interfaces(
+        self,
+        site_id: int,
+        device_ids: List[int],
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[int, List[Dict]]:
+        """
+        Busca as interfaces de todos os dispositivos do site de uma vez
+        
+        Uma listagem paginada filtrada por vários device_id (em blocos de
+        BULK_FILTER_CHUNK) substitui uma requisição por dispositivo. O resultado
+        fica no cache da sessão com uma entrada por dispositivo, tornando
+        instantânea a troca de dispositivo no formulário e permitindo que o
+        feed de mudanças invalide só o dispositivo alterado.
+        
+        Se a busca falhar, nada é cacheado e os dispositivos que faltavam ficam
+        fora do retorno (get_preloaded_interfaces devolve None para eles).
+        
+        Returns:
+            Dict {device_id: [interfaces]}
+        """
+        fields = tuple(fields or self.INTERFACE_FIELDS)
+        by_device: Dict[int, List[Dict]] = {}
+        missing = []
+        for device_id in dict.fromkeys(device_ids):
+            cached = self._cache_get(self._interfaces_cache_key(device_id, fields))
+            if cached is None:
+                missing.append(device_id)
+            else:
+                by_device[device_id] = cached
+        
+        if not missing:
+            return by_device
+        
+        fetched: Dict[int, List[Dict]] = {device_id: [] for device_id in missing}
+        request_fields = fields if 'device' in fields else fields + ('device.id',)
+        
+        try:
+            chunks = [
+                self._get_paginated_results(
+                    "dcim/interfaces/",
+                    params={"device_id": chunk, "limit": INTERFACE_PAGE_SIZE},
+                    fields=request_fields,
+                    strict=True
+                )
+                for chunk in self._chunks(missing, BULK_FILTER_CHUNK)
+            ]
+        except requests.exceptions.RequestException as e:
+            # Lista parcial cacheada esconderia interfaces: nada vai para o cache
+            if not isinstance(e, NetboxUnavailableError):
+                st.error(f"Erro ao buscar interfaces do site no Netbox: {str(e)}")
+            return by_device
+        
+        for interfaces in chunks:
+            for iface in interfaces:
+                device = iface.get('device') or {}
+                if request_fields is not fields:
+                    iface = {k: v for k, v in iface.items() if k != 'device'}
+                fetched.setdefault(device.get('id'), []).append(iface)
+        
+        for device_id, ifaces in fetched.items():
+            if device_id is None:
+                continue
+            self._cache_set(
+                self._interfaces_cache_key(device_id, fields),
+                ifaces,
+                tags=(f"device:{device_id}", f"site:{site_id}")
+            )
+        
+        by_device.update(fetched)
+        return by_device
+    
+    def get_preloaded_interfaces(self, device_id: int, fields: Optional[Sequence[str]] = None) -> Optional[List[Dict]]:
+        """Interfaces do dispositivo já pré-carregadas por preload_site_interfaces (ou None)"""
+        return self._cache_get(self._interfaces_cache_key(device_id, fields))
+    
+    # Métodos para IPs
+    def get_devices_primary_ips(self, device_ids: List[int]) -> Dict[int, Dict[str, Optional[str]]]:
+        """
+        Resolve os IPs primários (IPv4/IPv6) de vários dispositivos em lote
+        
+        Usa listagens filtradas por múltiplos IDs, em blocos de BULK_FILTER_CHUNK,
+        em vez de duas requisições por dispositivo. Cada dispositivo tem sua
+        entrada no cache da sessão ('primary_ip_{id}'), marcada com as tags do
+        dispositivo e dos seus IPs. O cache só é gravado depois de uma busca
+        completa: em falha de rede os dispositivos não resolvidos voltam sem
+        IP e a próxima chamada tenta de novo.
+        
+        Returns:
+            Dict {device_id: {"primary": str|None, "ipv4": str|None, "ipv6": str|None}}
+            com os IPs sem máscara; 'primary' é o primary_ip do Netbox
+        """
+        primary_ips: Dict[int, Dict[str, Optional[str]]] = {}
+        missing = []
+        for device_id in dict.fromkeys(device_ids):
+            cached = self._cache_get(f'primary_ip_{device_id}')
+            if cached is None:
+                missing.append(device_id)
+            else:
+                primary_ips[device_id] = cached
+        
+        tags: Dict[int, List[str]] = {device_id: [f"device:{device_id}"] for device_id in missing}
+        try:
+            self._resolve_primary_ips(missing, primary_ips, tags)
+        except requests.exceptions.RequestException as e:
+            if not isinstance(e, NetboxUnavailableError):
+                st.error(f"Erro ao buscar IPs primários no Netbox: {str(e)}")
+            empty = {"primary": None, "ipv4": None, "ipv6": None}
+            return {device_id: primary_ips.get(device_id, dict(empty)) for device_id in device_ids}
+        
+        # Dispositivos inexistentes também são cacheados para não repetir a busca
+        for device_id in missing:
+            primary_ips.setdefault(device_id, {"primary": None, "ipv4": None, "ipv6": None})
+            self._cache_set(f'primary_ip_{device_id}', primary_ips[device_id], tags=tags.get(device_id, ()))
         
-        ip_data = self._make_request(f"ipam/ip-addresses/{ip_id}/")
-        address = ip_data.get('address', 'N/A')
+        return {device_id: primary_ips[device_id] for device_id in device_ids}
+    
+    def _resolve_primary_ips(
+        self,
+        device_ids: List[int],
+        primary_ips: Dict[int, Dict[str, Optional[str]]],
+        tags: Dict[int, List[str]]
+    ):
+        """Preenche 'primary_ips' e 'tags' com listagens estritas (erros de rede propagam)"""
+        pending_ips: Dict[int, List[Tuple[int, str]]] = {}  # ip_id -> [(device_id, família)]
         
-        # Retornar apenas o IP sem máscara
+        for chunk in self._chunks(device_ids, BULK_FILTER_CHUNK):
+            devices = self._get_paginated_results(
+                "dcim/devices/",
+                params={"id": chunk, "limit": len(chunk)},
+                fields=('id', 'primary_ip', 'primary_ip4', 'primary_ip6'),
+                strict=True
+            )
+            for device in devices:
+                entry = {"primary": None, "ipv4": None, "ipv6": None}
+                for family, field in (("primary", "primary_ip"), ("ipv4", "primary_ip4"), ("ipv6", "primary_ip6")):
+                    nested_ip = device.get(field)
+                    if not nested_ip:
+                        continue
+                    if nested_ip.get('id'):
+                        tags.setdefault(device['id'], []).append(f"ip:{nested_ip['id']}")
+                    if nested_ip.get('address'):
+                        entry[family] = self._strip_mask(nested_ip['address'])
+                    elif nested_ip.get('id'):
+                        pending_ips.setdefault(nested_ip['id'], []).append((device['id'], family))
+                primary_ips[device['id']] = entry
+        
+        # Endereços que não vieram aninhados no dispositivo
+        for chunk in self._chunks(list(pending_ips), BULK_FILTER_CHUNK):
+            addresses = self._get_paginated_results(
+                "ipam/ip-addresses/",
+                params={"id": chunk, "limit": len(chunk)},
+                fields=('id', 'address'),
+                strict=True
+            )
+            for ip_data in addresses:
+                for device_id, family in pending_ips[ip_data['id']]:
+                    primary_ips[device_id][family] = self._strip_mask(ip_data.get('address', 'N/A'))
+    
+    def get_device_primary_ip(self, device_id: int) -> Optional[str]:
+        """Obtém o IP primário (primary_ip do Netbox) de um dispositivo"""
+        return self.get_devices_primary_ips([device_id]).get(device_id, {}).get('primary')
+    
+    @staticmethod
+    def _strip_mask(address: str) -> str:
+        """Retorna apenas o IP sem máscara"""
         return address.split('/')[0] if '/' in address else address
     
+    @staticmethod
+    def _chunks(items: List, size: int):
+        """Divide uma lista em blocos de tamanho fixo"""
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+    
+    # Escrita em lote
+    def lookup_ids(
+        self,
+        endpoint: str,
+        field: str,
+        values: Sequence[str],
+        extra_fields: Sequence[str] = ()
+    ) -> List[Dict]:
+        """
+        Busca objetos por vários valores de um campo (ex.: slug), em blocos de
+        BULK_FILTER_CHUNK, sempre direto no Netbox (sem cache de sessão)
+        
+        Returns:
+            Lista de objetos com 'id', o campo pesquisado e os campos extras
+        """
+        found = []
+        unique = list(dict.fromkeys(v for v in values if v))
+        for chunk in self._chunks(unique, BULK_FILTER_CHUNK):
+            found.extend(self._get_paginated_results(
+                endpoint,
+                params={field: chunk, "limit": INTERFACE_PAGE_SIZE},
+                fields=('id', field) + tuple(extra_fields),
+                strict=True
+            ))
+        return found
+    
+    def bulk_write(self, method: str, endpoint: str, objects: List[Dict]) -> Tuple[int, Any]:
+        """
+        Cria (POST) ou atualiza (PATCH, cada objeto com 'id') vários objetos em
+        uma única requisição com corpo em lista
+        
+        O Netbox grava a lista de forma atômica: em caso de erro de validação
+        (400) nada é gravado e o corpo traz um item de erro por objeto enviado.
+        POST não é repetido após 429/503: o Netbox pode ter gravado o bloco
+        antes de responder e a nova tentativa duplicaria os objetos.
+        
+        Returns:
+            Tupla (status HTTP, corpo decodificado)
+        """
+        admission = NETBOX_BREAKER.allow_request()
+        if admission is None:
+            raise NetboxUnavailableError("Netbox indisponível (circuit breaker aberto)")
+        
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        try:
+            response = self._send(method, url, retry=method != "POST", headers=self.headers, json=objects)
+        except NetboxThrottledError:
+            raise
+        except requests.exceptions.RequestException:
+            NETBOX_BREAKER.record_failure()
+            raise
+        else:
+            if response.status_code >= 500:
+                NETBOX_BREAKER.record_failure()
+            elif response.ok:
+                NETBOX_BREAKER.record_success(response.wire_time)
+        finally:
+            NETBOX_BREAKER.release_probe(admission)
+        
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        
+        if response.ok:
+            # Leituras seguintes (de qualquer sessão) não devem ver a versão antiga
+            RESPONSE_CACHE.invalidate(url)
+            LAST_KNOWN_GOOD.invalidate(url)
+            apply_local_write(endpoint, body if isinstance(body, list) else [body])
+        
+        return response.status_code, body
+    
     # Métodos auxiliares
     def clear_cache(self):
         """Limpa o cache do serviço"""
-        self.state.set('cache', {})
\ No newline at end of file
+        self.state.set('cache', {})
+        # As cópias locais continuam sendo servidas enquanto são atualizadas
+        SNAPSHOTS.expire()
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+Agregação de prefixos IPv4/IPv6 em O(n log n)
+
+Os prefixos são convertidos para intervalos inteiros (início, fim) e
+ordenados; numa única passada descartam-se os contidos em outro prefixo e,
+opcionalmente, irmãos adjacentes são fundidos no prefixo pai.
+"""
+import socket
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_BITS = {4: 32, 6: 128}
+_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+
+# (família, início, tamanho da máscara, texto original)
+Block = Tuple[int, int, int, str]
+
+def parse_prefix(prefix: str) -> Block:
+    """
+    Converte 'rede/máscara' em (família, início, máscara, texto)
+
+    Raises:
+        ValueError: prefixo inválido ou com bits de host ligados
+    """
+    text = prefix.strip()
+    address, _, length = text.partition("/")
+    family = 6 if ":" in address else 4
+    bits = _BITS[family]
+    try:
+        start = int.from_bytes(socket.inet_pton(_FAMILIES[family], address), "big")
+    except OSError:
+        raise ValueError(f"Prefixo inválido: {prefix}") from None
+    length = int(length) if length else bits
+    if not 0 <= length <= bits:
+        raise ValueError(f"Máscara inválida: {prefix}")
+    if start & ((1 << (bits - length)) - 1):
+        raise ValueError(f"{prefix} tem bits de host ligados")
+    return family, start, length, text
+
+def format_prefix(family: int, start: int, length: int) -> str:
+    return f"{socket.inet_ntop(_FAMILIES[family], start.to_bytes(_BITS[family] // 8, 'big'))}/{length}"
+
+def _end(family: int, start: int, length: int) -> int:
+    return start | ((1 << (_BITS[family] - length)) - 1)
+
+def _outermost(blocks: List[Block]) -> List[Block]:
+    """Ordena e mantém só os blocos que não estão contidos em outro (duplicatas incluídas)"""
+    # Mesmo início: o menos específico primeiro
+    blocks = sorted(blocks, key=lambda b: (b[0], b[1], b[2]))
+    kept: List[Block] = []
+    covered_until = {4: -1, 6: -1}
+    for block in blocks:
+        family, start, length, _ = block
+        if start <= covered_until[family]:
+            continue
+        kept.append(block)
+        covered_until[family] = _end(family, start, length)
+    return kept
+
+def remove_covered(prefixes: Iterable[str]) -> List[str]:
+    """
+    Remove os prefixos contidos em outro da lista (e as repetições),
+    preservando a ordem e o texto dos que ficam
+
+    Raises:
+        ValueError: algum prefixo inválido
+    """
+    blocks = [parse_prefix(p) for p in prefixes]
+    kept = {(b[0], b[1], b[2]) for b in _outermost(blocks)}
+    result = []
+    for family, start, length, text in blocks:
+        if (family, start, length) in kept:
+            kept.discard((family, start, length))
+            result.append(text)
+    return result
+
+def aggregate(prefixes: Iterable[str]) -> List[str]:
+    """
+    Agregação completa: remove os contidos e funde irmãos adjacentes
+    (ex.: 10.0.0.0/25 + 10.0.0.128/25 -> 10.0.0.0/24), em ordem de endereço,
+    IPv4 antes de IPv6
+
+    Raises:
+        ValueError: algum prefixo inválido
+    """
+    stack: List[Tuple[int, int, int]] = []
+    for family, start, length, _ in _outermost([parse_prefix(p) for p in prefixes]):
+        stack.append((family, start, length))
+        # Funde enquanto o topo for o irmão direito do anterior
+        while len(stack) >= 2:
+            f1, s1, l1 = stack[-2]
+            f2, s2, l2 = stack[-1]
+            if f1 != f2 or l1 != l2 or l1 == 0:
+                break
+            size = 1 << (_BITS[f1] - l1)
+            if s1 & size or s2 != s1 + size:
+                break
+            stack[-2:] = [(f1, s1, l1 - 1)]
+    return [format_prefix(*block) for block in stack]
+
+# Entrada de prefix-list: (família, início, máscara, greater-equal, less-equal)
+Entry = Tuple[int, int, int, int, int]
+
+def _drop_contained(entries: List[Entry]) -> List[Entry]:
+    """Remove entradas cujo conjunto casado já está em outra (mesmo prefixo ou ancestral com faixa que a cobre)"""
+    by_prefix = {}
+    for family, start, length, ge, le in entries:
+        by_prefix.setdefault((family, start, length), []).append((ge, le))
+
+    kept = []
+    for entry in sorted(set(entries)):
+        family, start, length, ge, le = entry
+        contained = False
+        for parent_length in range(length, -1, -1):
+            parent_start = start & ~((1 << (_BITS[family] - parent_length)) - 1)
+            for other_ge, other_le in by_prefix.get((family, parent_start, parent_length), ()):
+                if (other_ge, other_le) != (ge, le) or parent_length != length:
+                    if other_ge <= ge and le <= other_le:
+                        contained = True
+                        break
+            if contained:
+                break
+        if not contained:
+            kept.append(entry)
+    return kept
+
+def _merge_siblings(entries: List[Entry]) -> List[Entry]:
+    """Funde pares de irmãos com a mesma faixa ge/le no prefixo pai"""
+    groups = {}
+    for family, start, length, ge, le in entries:
+        groups.setdefault((family, ge, le), []).append((start, length))
+
+    merged = []
+    for (family, ge, le), blocks in groups.items():
+        stack: List[Tuple[int, int]] = []
+        for start, length in sorted(blocks):
+            stack.append((start, length))
+            while len(stack) >= 2:
+                s1, l1 = stack[-2]
+                s2, l2 = stack[-1]
+                if l1 != l2 or l1 == 0:
+                    break
+                size = 1 << (_BITS[family] - l1)
+                if s1 & size or s2 != s1 + size:
+                    break
+                stack[-2:] = [(s1, l1 - 1)]
+        merged.extend((family, start, length, ge, le) for start, length in stack)
+    return merged
+
+def compact_prefix_list(prefixes: Iterable[str], less_equal: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Compacta as linhas de uma prefix-list no estilo 'bgpq4 -A'
+
+    Cada prefixo P/M vira a entrada "permit P M less-equal L" (ou casamento
+    exato se less_equal for None). Entradas contidas em outras são removidas
+    e irmãos com a mesma faixa são fundidos no pai com greater-equal, sem
+    alterar o conjunto de rotas aceitas. Ex.: 10.0.0.0/24 e 10.0.1.0/24 com
+    less-equal 24 -> "10.0.0.0 23 greater-equal 24 less-equal 24".
+
+    Returns:
+        Entradas ordenadas no formato usado pelos templates:
+        {"Prefixo", "Máscara", "greater_equal", "less_equal"}; greater_equal
+        é None quando igual à máscara
+
+    Raises:
+        ValueError: algum prefixo inválido
+    """
+    entries = []
+    for family, start, length, _ in (parse_prefix(p) for p in prefixes):
+        # less-equal abaixo da máscara é rejeitado pelo equipamento: vira casamento exato
+        le = length if less_equal is None else max(less_equal, length)
+        entries.append((family, start, length, length, le))
+
+    # Uma fusão pode passar a conter outras entradas (ou ficar contida): repete até estabilizar
+    while True:
+        compacted = _merge_siblings(_drop_contained(entries))
+        if len(compacted) == len(entries):
+            break
+        entries = compacted
+    entries = _drop_contained(entries)
+
+    return [
+        {
+            "Prefixo": format_prefix(family, start, length).split("/")[0],
+            "Máscara": length,
+            "greater_equal": ge if ge != length else None,
+            "less_equal": le,
+        }
+        for family, start, length, ge, le in sorted(entries)
+    ]
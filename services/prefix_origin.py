@@ -0,0 +1,311 @@
+"""
+Base local de origem de prefixos (prefixo -> ASN de origem)
+
+Importa um arquivo pfx2as do CAIDA ou a exportação em texto de uma RIB
+(`bgpdump -m`) para um índice binário ordenado, aberto com mmap. As consultas
+"prefixos anunciados pelo ASN X" e "origem do prefixo Y" são respondidas
+localmente, sem depender do RIPEstat.
+
+Uso:
+    python -m services.prefix_origin routeviews-rv2-20260101-1200.pfx2as.gz
+"""
+import argparse
+import bz2
+import gzip
+import ipaddress
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.paths import DATA_DIR
+
+INDEX_PATH = DATA_DIR / "prefix_origin.idx"
+
+# Cabeçalho: magic, qtd. de prefixos v4 e v6, qtd. de origens, qtd. de entradas do índice por ASN, data de geração
+_MAGIC = b"PFXORIG1"
+_HEADER = struct.Struct("<8sQQQQd")
+
+# Registro de prefixo: início e fim (big-endian, para comparar como bytes),
+# tamanho da máscara, prefixo pai (mais próximo que o contém; -1 se nenhum),
+# posição e quantidade das origens na tabela de origens
+_RECORDS = {4: struct.Struct(">4s4sBiIH"), 6: struct.Struct(">16s16sBiIH")}
+_WIDTH = {4: 4, 6: 16}
+_ORIGIN = struct.Struct("<I")
+# Índice por ASN: (asn, família, registro), ordenado por ASN
+_ASN_ENTRY = struct.Struct(">IBI")
+
+def open_text(path: Path):
+    """Abre um arquivo de texto, descompactando .gz/.bz2"""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+def _parse_origins(field: str) -> List[int]:
+    """Origem no formato pfx2as ('13335', '64500_64501' multi-origem, '64500,64501' AS-SET) ou '{a,b}'"""
+    origins = []
+    for token in field.strip("{} ").replace("_", ",").split(","):
+        if token.isdigit():
+            origins.append(int(token))
+    return origins
+
+def iter_source(path: Path) -> Iterator[Tuple[str, List[int]]]:
+    """
+    Lê (prefixo, origens) de um arquivo pfx2as ou de um dump de RIB
+
+    Formatos aceitos (detectados por linha):
+        pfx2as:      rede<TAB>máscara<TAB>origem
+        bgpdump -m:  TABLE_DUMP2|ts|B|peer_ip|peer_as|prefixo|as_path|...
+        texto:       prefixo origem
+    """
+    with open_text(Path(path)) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "|" in line:
+                fields = line.split("|")
+                if len(fields) < 7 or not fields[6]:
+                    continue
+                yield fields[5], _parse_origins(fields[6].split()[-1])
+                continue
+            fields = line.split()
+            if len(fields) == 3:
+                yield f"{fields[0]}/{fields[1]}", _parse_origins(fields[2])
+            elif len(fields) == 2:
+                yield fields[0], _parse_origins(fields[1].upper().replace("AS", ""))
+
+def build_index(source: Path, target: Path = INDEX_PATH) -> Dict[str, int]:
+    """
+    Gera o índice a partir do arquivo de origem e o substitui atomicamente
+
+    Returns:
+        Estatísticas da importação (prefixos por família, ASNs, linhas ignoradas)
+    """
+    # Um dump de RIB repete o prefixo para cada peer: agrega por texto antes de converter
+    by_text: Dict[str, Set[int]] = {}
+    for prefix, origins in iter_source(source):
+        if origins:
+            by_text.setdefault(prefix, set()).update(origins)
+
+    networks: Dict[int, Dict[Tuple[int, int], Set[int]]] = {4: {}, 6: {}}
+    skipped = 0
+    for prefix, origins in by_text.items():
+        try:
+            network = ipaddress.ip_network(prefix, strict=False)
+        except ValueError:
+            skipped += 1
+            continue
+        key = (int(network.network_address), network.prefixlen)
+        networks[network.version].setdefault(key, set()).update(origins)
+
+    records: Dict[int, List[bytes]] = {4: [], 6: []}
+    origins_table: List[int] = []
+    asn_entries: List[Tuple[int, int, int]] = []
+    for family in (4, 6):
+        width = _WIDTH[family]
+        bits = width * 8
+        stack: List[Tuple[int, int]] = []  # (fim, índice) dos prefixos que ainda podem conter o próximo
+        for idx, ((start, length), origins) in enumerate(sorted(networks[family].items())):
+            end = start | ((1 << (bits - length)) - 1)
+            while stack and stack[-1][0] < start:
+                stack.pop()
+            parent = stack[-1][1] if stack else -1
+            stack.append((end, idx))
+
+            sorted_origins = sorted(origins)
+            records[family].append(_RECORDS[family].pack(
+                start.to_bytes(width, "big"), end.to_bytes(width, "big"),
+                length, parent, len(origins_table), len(sorted_origins)
+            ))
+            origins_table.extend(sorted_origins)
+            asn_entries.extend((asn, family, idx) for asn in sorted_origins)
+    asn_entries.sort()
+
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(records[4]), len(records[6]), len(origins_table), len(asn_entries), time.time()))
+        for family in (4, 6):
+            f.write(b"".join(records[family]))
+        f.write(b"".join(_ORIGIN.pack(asn) for asn in origins_table))
+        f.write(b"".join(_ASN_ENTRY.pack(*entry) for entry in asn_entries))
+    os.replace(tmp, target)
+
+    return {
+        "ipv4": len(records[4]),
+        "ipv6": len(records[6]),
+        "asns": len({asn for asn, _, _ in asn_entries}),
+        "skipped": skipped,
+    }
+
+class PrefixOriginIndex:
+    """
+    Leitura do índice gerado por build_index, via mmap
+
+    As buscas são binárias sobre registros de tamanho fixo; nada é carregado
+    em memória além das páginas tocadas. Um índice regerado (arquivo com outro
+    mtime) é reaberto na consulta seguinte e o mapeamento anterior é fechado;
+    por isso as consultas rodam sob o lock (são buscas curtas, em Python puro,
+    que o GIL já serializaria).
+    """
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mm: Optional[mmap.mmap] = None
+        self._mtime: Optional[float] = None
+
+    def _load(self) -> Optional[mmap.mmap]:
+        """Mapeamento atual do índice (chamar com o lock adquirido)"""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return None
+        if self._mm is None or mtime != self._mtime:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, n4, n6, n_origins, n_asn, built_at = _HEADER.unpack_from(mm, 0)
+            if magic != _MAGIC:
+                mm.close()
+                return None
+            offset = _HEADER.size
+            self._sections = {}
+            for family, count in ((4, n4), (6, n6)):
+                self._sections[family] = (offset, count)
+                offset += count * _RECORDS[family].size
+            self._origins_offset = offset
+            self._asn_offset = offset + n_origins * _ORIGIN.size
+            self._asn_count = n_asn
+            self.built_at = built_at
+            if self._mm is not None:
+                self._mm.close()
+            self._mm, self._mtime = mm, mtime
+        return self._mm
+
+    def available(self) -> bool:
+        with self._lock:
+            return self._load() is not None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            if self._load() is None:
+                return {}
+            return {
+                "ipv4": self._sections[4][1],
+                "ipv6": self._sections[6][1],
+                "built_at": self.built_at,
+            }
+
+    def _record(self, mm: mmap.mmap, family: int, idx: int) -> Tuple[bytes, bytes, int, int, int, int]:
+        offset, _ = self._sections[family]
+        return _RECORDS[family].unpack_from(mm, offset + idx * _RECORDS[family].size)
+
+    def _origins(self, mm: mmap.mmap, offset: int, count: int) -> List[int]:
+        base = self._origins_offset + offset * _ORIGIN.size
+        return [_ORIGIN.unpack_from(mm, base + i * _ORIGIN.size)[0] for i in range(count)]
+
+    def _prefix(self, family: int, start: bytes, length: int) -> str:
+        return f"{ipaddress.ip_address(start)}/{length}"
+
+    def origin_of(self, prefix: str) -> Optional[Dict]:
+        """
+        Origem do prefixo (correspondência exata ou o prefixo mais específico que o contém)
+
+        Returns:
+            {"prefix": prefixo encontrado, "origins": [ASNs]} ou None
+        """
+        network = ipaddress.ip_network(prefix, strict=False)
+        with self._lock:
+            mm = self._load()
+            if mm is None:
+                return None
+            return self._origin_of(mm, network)
+
+    def _origin_of(self, mm: mmap.mmap, network) -> Optional[Dict]:
+        family = network.version
+        width = _WIDTH[family]
+        key = int(network.network_address).to_bytes(width, "big")
+        last = int(network.broadcast_address).to_bytes(width, "big")
+        offset, count = self._sections[family]
+        size = _RECORDS[family].size
+
+        # Último registro com início <= início do prefixo consultado
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if mm[offset + mid * size:offset + mid * size + width] <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        idx = lo - 1
+
+        # Sobe pelos pais até um que contenha o prefixo inteiro
+        while idx >= 0:
+            start, end, length, parent, origin_offset, origin_count = self._record(mm, family, idx)
+            if end >= last and length <= network.prefixlen:
+                return {
+                    "prefix": self._prefix(family, start, length),
+                    "origins": self._origins(mm, origin_offset, origin_count),
+                }
+            idx = parent
+        return None
+
+    def prefixes_of(self, asn) -> Optional[Dict[str, List[str]]]:
+        """Prefixos originados pelo ASN, no mesmo formato de RipeStatService.fetch_prefixes"""
+        asn = int(str(asn).strip().upper().replace("AS", ""))
+        with self._lock:
+            mm = self._load()
+            if mm is None:
+                return None
+            return self._prefixes_of(mm, asn)
+
+    def _prefixes_of(self, mm: mmap.mmap, asn: int) -> Dict[str, List[str]]:
+        size = _ASN_ENTRY.size
+        base = self._asn_offset
+
+        lo, hi = 0, self._asn_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _ASN_ENTRY.unpack_from(mm, base + mid * size)[0] < asn:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        result = {"ipv4_prefixes": [], "ipv6_prefixes": []}
+        for i in range(lo, self._asn_count):
+            entry_asn, family, idx = _ASN_ENTRY.unpack_from(mm, base + i * size)
+            if entry_asn != asn:
+                break
+            start, _, length, _, _, _ = self._record(mm, family, idx)
+            result["ipv4_prefixes" if family == 4 else "ipv6_prefixes"].append(self._prefix(family, start, length))
+        return result
+
+# Instância única compartilhada pelo processo
+PREFIX_ORIGINS = PrefixOriginIndex()
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa um arquivo pfx2as ou dump de RIB para a base local de origem de prefixos")
+    parser.add_argument("source", type=Path, help="Arquivo pfx2as (CAIDA) ou saída de 'bgpdump -m' (.gz/.bz2 aceitos)")
+    parser.add_argument("--output", type=Path, default=INDEX_PATH, help=f"Índice gerado (padrão: {INDEX_PATH})")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stats = build_index(args.source, args.output)
+    print(
+        f"{stats['ipv4']} prefixos IPv4, {stats['ipv6']} IPv6, {stats['asns']} ASNs "
+        f"({stats['skipped']} ignorados) em {time.perf_counter() - started:.1f}s -> {args.output}"
+    )
+
+if __name__ == "__main__":
+    main()
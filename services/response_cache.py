@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+@dataclass
+class CachedResponse:
+    """Resposta armazenada junto com seus validadores HTTP"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    payload: Any
+    size: int
+
+class ConditionalResponseCache:
+    """
+    Cache de respostas GET com validadores (ETag / Last-Modified)
+
+    Compartilhado por todas as sessões do processo. Permite enviar requisições
+    condicionais e servir respostas 304 a partir da cópia local, sem baixar e
+    decodificar novamente o corpo JSON. O payload é guardado e devolvido sem
+    cópia e deve ser tratado como somente leitura: a cópia para o chamador é
+    feita uma única vez, na saída do SINGLE_FLIGHT.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+        }
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> Tuple:
+        """Gera a chave do cache a partir da URL e dos parâmetros"""
+        if not params:
+            return (url, ())
+        items = []
+        for name, value in params.items():
+            if isinstance(value, (list, tuple)):
+                items.extend((name, str(v)) for v in value)
+            else:
+                items.append((name, str(value)))
+        return (url, tuple(sorted(items)))
+
+    def conditional_headers(self, key: Tuple) -> Dict[str, str]:
+        """Retorna os cabeçalhos condicionais para a chave, se houver validadores"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, key: Tuple, headers, payload: Any, size: int):
+        """Armazena a resposta se ela trouxer algum validador"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes_downloaded"] += size
+
+            if not etag and not last_modified:
+                self._entries.pop(key, None)
+                return
+
+            self._entries[key] = CachedResponse(etag, last_modified, payload, size)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def not_modified(self, key: Tuple) -> Optional[Any]:
+        """Registra um 304 e retorna o payload armazenado"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._stats["requests"] += 1
+            self._stats["not_modified"] += 1
+            self._stats["bytes_saved"] += entry.size
+            return entry.payload
+
+    def invalidate(self, url_prefix: Optional[str] = None):
+        """Remove entradas do cache (todas, ou as que começam com a URL informada)"""
+        with self._lock:
+            if url_prefix is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0].startswith(url_prefix)]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores do cache"""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+# Instância única compartilhada pelo processo
+RESPONSE_CACHE = ConditionalResponseCache()
+
+class LastKnownGoodCache:
+    """
+    Última resposta bem-sucedida de cada GET, mantida para o modo degradado
+
+    Quando o Netbox está fora (circuit breaker aberto ou erro de conexão),
+    essas respostas são servidas marcadas como desatualizadas. Somente leitura,
+    como no ConditionalResponseCache.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def store(self, key: Tuple, payload: Any):
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def invalidate(self, url_prefix: Optional[str] = None):
+        """Remove entradas (todas, ou as que começam com a URL informada)"""
+        with self._lock:
+            if url_prefix is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0].startswith(url_prefix)]:
+                del self._entries[key]
+
+# Instância única compartilhada pelo processo
+LAST_KNOWN_GOOD = LastKnownGoodCache()
@@ -0,0 +1,195 @@
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import AppConfig
+from services.asn_cache import ASN_CACHE
+from services.prefix_origin import PREFIX_ORIGINS
+
+RIPESTAT_URL = "https://stat.ripe.net/data"
+
+# Timeouts por endpoint (segundos); announced-prefixes pode ser grande
+OVERVIEW_TIMEOUT = 10
+PREFIXES_TIMEOUT = 15
+
+# Partes de uma consulta de ASN, buscadas em paralelo
+OVERVIEW = "overview"
+PREFIXES = "prefixes"
+
+# Origem dos prefixos exibidos ('source' no resultado)
+SOURCE_RIPESTAT = "ripestat"
+SOURCE_LOCAL = "local"
+
+def normalize_asn(asn) -> str:
+    """Retorna só o número do ASN ('AS64777' -> '64777')"""
+    return str(asn).strip().upper().replace("AS", "").strip()
+
+def empty_asn_info() -> Dict[str, Any]:
+    return {"holder": "", "country": "", "ipv4_prefixes": [], "ipv6_prefixes": [], "success": False, "as_of": None, "source": SOURCE_RIPESTAT}
+
+def format_as_of(as_of) -> str:
+    """Data/hora em que os dados foram obtidos do RIPEstat, para exibição"""
+    return datetime.fromtimestamp(as_of).strftime("%d/%m/%Y %H:%M") if as_of else ""
+
+class RipeStatService:
+    """
+    Cliente do RIPEstat com sessão HTTP reaproveitada (keep-alive) e consultas paralelas
+
+    A sessão e o pool de threads são compartilhados pelo processo, de modo que
+    as consultas de todas as sessões do Streamlit reutilizam as conexões TLS.
+
+    Os resultados ficam no cache persistente (services.asn_cache): consultas
+    repetidas são respondidas localmente e, passado AppConfig.ASN_CACHE_TTL,
+    a cópia é servida enquanto uma atualização roda em segundo plano. Se o
+    RIPEstat falhar, os prefixos vêm da base local (services.prefix_origin).
+    """
+
+    MAX_WORKERS = 8
+
+    _session = None
+    _executor = None
+    _lock = threading.Lock()
+    _refreshing = set()
+
+    @classmethod
+    def _shared(cls) -> Tuple[requests.Session, ThreadPoolExecutor]:
+        with cls._lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=cls.MAX_WORKERS)
+                session.mount("https://", adapter)
+                cls._session = session
+                cls._executor = ThreadPoolExecutor(max_workers=cls.MAX_WORKERS, thread_name_prefix="ripestat")
+            return cls._session, cls._executor
+
+    def _get(self, endpoint: str, asn: str, timeout: float) -> Dict:
+        session, _ = self._shared()
+        response = session.get(f"{RIPESTAT_URL}/{endpoint}/data.json", params={"resource": f"AS{asn}"}, timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("data", {})
+
+    def fetch_overview(self, asn) -> Dict[str, str]:
+        """Titular e país do ASN (as-overview)"""
+        data = self._get("as-overview", normalize_asn(asn), OVERVIEW_TIMEOUT)
+        return {"holder": data.get("holder") or "", "country": data.get("country") or ""}
+
+    def fetch_prefixes(self, asn) -> Dict[str, List[str]]:
+        """Prefixos anunciados pelo ASN, separados por família (announced-prefixes)"""
+        data = self._get("announced-prefixes", normalize_asn(asn), PREFIXES_TIMEOUT)
+        ipv4, ipv6 = [], []
+        for entry in data.get("prefixes", []):
+            prefix = entry.get("prefix", "")
+            if not prefix:
+                continue
+            (ipv6 if ":" in prefix else ipv4).append(prefix)
+        return {"ipv4_prefixes": ipv4, "ipv6_prefixes": ipv6}
+
+    def _fetch_part(self, asn: str, part: str) -> Dict[str, Any]:
+        """
+        Busca uma parte no RIPEstat e grava no cache
+
+        Respostas vazias (ASN desconhecido, sem titular ou sem prefixos) não vão
+        para o cache: seriam servidas como definitivas até o TTL expirar.
+        """
+        fetcher = self.fetch_overview if part == OVERVIEW else self.fetch_prefixes
+        result = fetcher(asn)
+        fetched_at = time.time()
+        if asn.isdigit() and any(result.values()):
+            ASN_CACHE.put(asn, part, result, fetched_at)
+        return {**result, "as_of": fetched_at}
+
+    def _local_prefixes(self, asn: str):
+        """Prefixos da base local pfx2as/RIB, ou None se não foi importada (ou o ASN é inválido)"""
+        if not asn.isdigit():
+            return None
+        result = PREFIX_ORIGINS.prefixes_of(asn)
+        if result is None:
+            return None
+        return {**result, "as_of": PREFIX_ORIGINS.built_at, "source": SOURCE_LOCAL}
+
+    def _refresh_in_background(self, asn: str, part: str):
+        """Atualiza uma parte expirada sem bloquear quem consultou"""
+        _, executor = self._shared()
+        with self._lock:
+            if (asn, part) in self._refreshing:
+                return
+            self._refreshing.add((asn, part))
+
+        def refresh():
+            try:
+                self._fetch_part(asn, part)
+            except (requests.RequestException, ValueError):
+                # Mantém a cópia antiga; a próxima consulta tenta de novo
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard((asn, part))
+
+        executor.submit(refresh)
+
+    def iter_lookups(self, asns: List[str], parts: Sequence[str] = (OVERVIEW, PREFIXES), refresh: bool = False) -> Iterator[Tuple[str, str, Any]]:
+        """
+        Dispara as consultas (overview e prefixos) de todos os ASNs ao mesmo tempo
+
+        Partes presentes no cache são entregues primeiro, sem acessar a rede
+        (exceto com refresh=True); as expiradas são atualizadas em segundo plano.
+
+        Yields:
+            (asn, parte, resultado) na ordem em que as respostas chegam; em caso
+            de erro o resultado é a exceção. Resultados trazem 'as_of' (epoch
+            da obtenção no RIPEstat); os prefixos da base local, usados quando o
+            RIPEstat falha, trazem também 'source' = SOURCE_LOCAL e a data de
+            geração do índice em 'as_of'
+        """
+        _, executor = self._shared()
+        cached: List[Tuple[str, str, Dict[str, Any]]] = []
+        futures: Dict[Future, Tuple[str, str]] = {}
+        for asn in dict.fromkeys(normalize_asn(a) for a in asns if a):
+            for part in parts:
+                entry = None if refresh else ASN_CACHE.get(asn, part)
+                if entry is None:
+                    futures[executor.submit(self._fetch_part, asn, part)] = (asn, part)
+                    continue
+                data, fetched_at = entry
+                if time.time() - fetched_at > AppConfig.ASN_CACHE_TTL:
+                    self._refresh_in_background(asn, part)
+                cached.append((asn, part, {**data, "as_of": fetched_at}))
+
+        yield from cached
+
+        for future in as_completed(futures):
+            asn, part = futures[future]
+            try:
+                yield asn, part, future.result()
+            except (requests.RequestException, ValueError) as e:
+                local = self._local_prefixes(asn) if part == PREFIXES else None
+                yield asn, part, local if local is not None else e
+
+    def lookup(self, asn, parts: Sequence[str] = (OVERVIEW, PREFIXES), refresh: bool = False) -> Dict[str, Any]:
+        """Consulta completa de um ASN (as partes em paralelo)"""
+        info = empty_asn_info()
+        for _, part, result in self.iter_lookups([asn], parts, refresh):
+            merge_part(info, part, result)
+        return info
+
+def merge_part(info: Dict[str, Any], part: str, result: Any) -> Dict[str, Any]:
+    """Incorpora uma parte da consulta ao dicionário de informações do ASN"""
+    if isinstance(result, Exception):
+        info.setdefault("errors", []).append(str(result))
+        return info
+    result = dict(result)
+    as_of = result.pop("as_of", None)
+    if result.pop("source", SOURCE_RIPESTAT) == SOURCE_LOCAL:
+        # A data do índice local não se mistura com a das partes do RIPEstat
+        info.update(result, source=SOURCE_LOCAL, local_as_of=as_of)
+        return info
+    info.update(result)
+    if as_of is not None:
+        # Vale a parte mais antiga
+        info["as_of"] = min(as_of, info.get("as_of") or as_of)
+    if part == OVERVIEW:
+        info["success"] = True
+    return info
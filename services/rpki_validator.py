@@ -0,0 +1,181 @@
+"""
+Validação de origem RPKI (RFC 6811) contra um conjunto local de VRPs
+
+Os VRPs exportados por um validador (Routinator, rpki-client, Fort) em JSON
+ou CSV são indexados por família e tamanho de prefixo; a validação de uma
+rota consulta só os tamanhos que existem no conjunto, sem acessar a rede.
+"""
+import csv
+import ipaddress
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from config.settings import AppConfig
+from core.paths import DATA_DIR
+from services.prefix_aggregation import format_prefix, parse_prefix
+
+VALID = "valid"
+INVALID = "invalid"
+NOT_FOUND = "not-found"
+# Não é um estado RFC 6811: o prefixo informado não pôde ser lido
+MALFORMED = "malformed"
+
+# (asn, maxLength) por prefixo
+Vrp = Tuple[int, int]
+
+def _parse_asn(value) -> int:
+    return int(str(value).strip().upper().replace("AS", ""))
+
+def iter_vrps(path: Path) -> Iterable[Tuple[str, str, Optional[str]]]:
+    """
+    Lê (prefixo, asn, maxLength) de um export JSON ou CSV, como texto
+
+    A conversão e a validação de cada linha ficam com VrpIndex.load, que
+    descarta (e conta) as linhas malformadas. maxLength é None se ausente.
+
+    JSON: {"roas": [{"asn": "AS13335", "prefix": "1.0.0.0/24", "maxLength": 24, ...}]}
+    CSV:  ASN,IP Prefix,Max Length[,Trust Anchor]
+
+    Raises:
+        ValueError: arquivo JSON malformado
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if len(row) < 3 or not row[2].strip().isdigit():
+                    continue  # cabeçalho ou linha incompleta
+                yield row[1].strip(), row[0], row[2]
+        return
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for roa in data.get("roas", []):
+        if isinstance(roa, dict):
+            max_length = roa.get("maxLength")
+            yield str(roa.get("prefix", "")), str(roa.get("asn", "")), None if max_length is None else str(max_length)
+
+def _parse_vrp(prefix: str, asn: str, max_length: Optional[str]) -> Tuple[int, int, int, int, int]:
+    """
+    Converte uma linha de iter_vrps em (família, início, tamanho, asn, maxLength)
+
+    Raises:
+        ValueError: ASN não numérico, prefixo inválido ou com bits de host,
+        maxLength fora de [tamanho do prefixo, bits da família]
+    """
+    family, start, length, _ = parse_prefix(prefix)
+    max_length = length if max_length is None else int(max_length)
+    if not length <= max_length <= (32 if family == 4 else 128):
+        raise ValueError(f"maxLength {max_length} inválido para {prefix}")
+    return family, start, length, _parse_asn(asn), max_length
+
+class VrpIndex:
+    """
+    Índice de VRPs: {(família, tamanho): {início: [(asn, maxLength)]}}
+
+    Uma rota P/L é coberta pelos VRPs cujo prefixo, de tamanho <= L, contém
+    P; para cada tamanho presente no conjunto basta uma consulta ao dicionário
+    com P truncado. O arquivo é relido quando muda (mtime).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        # (tabelas, tamanhos presentes por família), trocados juntos na recarga
+        self._index: Tuple[Dict[Tuple[int, int], Dict[int, List[Vrp]]], Dict[int, List[int]]] = ({}, {4: [], 6: []})
+        self.count = 0
+        self.skipped = 0  # linhas descartadas na última carga
+        self.source: Optional[Path] = None
+
+    def _resolve_path(self) -> Path:
+        if self.path:
+            return self.path
+        return Path(AppConfig.RPKI_VRP_FILE) if AppConfig.RPKI_VRP_FILE else DATA_DIR / "vrps.json"
+
+    def load(self, force: bool = False) -> bool:
+        """
+        Carrega (ou recarrega, se o arquivo mudou) os VRPs; False se não há arquivo
+
+        Linhas malformadas são ignoradas e contadas em 'skipped'.
+
+        Raises:
+            OSError, ValueError: arquivo ilegível ou JSON malformado
+        """
+        path = self._resolve_path()
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return False
+        with self._lock:
+            if force or mtime != self._mtime:
+                tables: Dict[Tuple[int, int], Dict[int, List[Vrp]]] = {}
+                count = skipped = 0
+                for row in iter_vrps(path):
+                    try:
+                        family, start, length, asn, max_length = _parse_vrp(*row)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    tables.setdefault((family, length), {}).setdefault(start, []).append((asn, max_length))
+                    count += 1
+                self._index = (tables, {f: sorted(l for fam, l in tables if fam == f) for f in (4, 6)})
+                self._mtime, self.count, self.skipped = mtime, count, skipped
+                self.source = path
+        return True
+
+    def _covering(self, family: int, start: int, length: int) -> List[Tuple[int, int, int, int]]:
+        """VRPs que cobrem a rota: [(início, tamanho, asn, maxLength)]"""
+        bits = 32 if family == 4 else 128
+        tables, lengths = self._index
+        found = []
+        for vrp_length in lengths[family]:
+            if vrp_length > length:
+                break
+            vrp_start = start & ~((1 << (bits - vrp_length)) - 1)
+            for asn, max_length in tables[(family, vrp_length)].get(vrp_start, ()):
+                found.append((vrp_start, vrp_length, asn, max_length))
+        return found
+
+    def validate(self, prefix: str, origin) -> Dict:
+        """
+        Estado RPKI da rota (prefixo, ASN de origem)
+
+        Um prefixo com bits de host é validado pela rede que ele representa;
+        um prefixo ilegível não é validado: vem com o estado MALFORMED e o
+        motivo em 'error', para não ser confundido com uma rota RPKI inválida.
+
+        Returns:
+            {"prefix", "origin", "state" (valid/invalid/not-found/malformed), "vrps": VRPs que cobrem}
+
+        Raises:
+            ValueError: ASN de origem não numérico
+        """
+        origin = _parse_asn(origin)
+        try:
+            network = ipaddress.ip_network(prefix.strip(), strict=False)
+        except ValueError as e:
+            return {"prefix": prefix, "origin": origin, "state": MALFORMED, "vrps": [], "error": str(e)}
+        family, start, length, _ = parse_prefix(str(network))
+        covering = self._covering(family, start, length)
+        if not covering:
+            state = NOT_FOUND
+        elif any(asn == origin and asn != 0 and length <= max_length for _, _, asn, max_length in covering):
+            state = VALID
+        else:
+            state = INVALID
+
+        return {
+            "prefix": prefix,
+            "origin": origin,
+            "state": state,
+            "vrps": [f"{format_prefix(family, s, l)}-{m} AS{a}" for s, l, a, m in covering],
+        }
+
+    def validate_many(self, prefixes: Iterable[str], origin) -> List[Dict]:
+        """Valida vários prefixos de uma mesma origem"""
+        return [self.validate(prefix, origin) for prefix in prefixes]
+
+# Instância única compartilhada pelo processo
+VRPS = VrpIndex()
@@ -0,0 +1,67 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    """Execução em andamento compartilhada pelos chamadores da mesma chave"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+class SingleFlight:
+    """
+    Coalescência de chamadas idênticas em andamento (single-flight)
+
+    Enquanto uma busca para uma chave está em execução, outros chamadores da
+    mesma chave aguardam e recebem o mesmo resultado, em vez de repetir a
+    requisição. Cada chamador (inclusive o que executou) recebe uma cópia
+    profunda, para que alterações de um não apareçam nos outros nem nos
+    caches de resposta, que guardam o mesmo objeto sem copiá-lo.
+
+    As sessões do Streamlit rodam em threads do mesmo processo, então uma
+    instância no nível do módulo é compartilhada por todas elas.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {"executed": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Executa fn uma única vez por chave entre os chamadores concorrentes"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return copy.deepcopy(call.result)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores de execuções e chamadas coalescidas"""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+# Instância única compartilhada pelo processo
+SINGLE_FLIGHT = SingleFlight()
@@ -0,0 +1,180 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from core.paths import DATA_DIR
+
+class SnapshotStore:
+    """
+    Cache stale-while-revalidate para listas que mudam pouco (tenants, sites)
+
+    A última cópia conhecida fica em memória e em disco, sobrevivendo a
+    reinícios. Leituras são servidas imediatamente; quando a cópia passa do
+    TTL "soft", uma atualização roda em segundo plano. Somente a primeira
+    carga (sem nenhuma cópia) bloqueia o chamador. A cópia armazenada é
+    compartilhada entre as sessões, então get/peek entregam cópias dela.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._refreshing = set()
+        self._expired_families: Dict[str, float] = {}
+
+    @staticmethod
+    def _safe_name(key: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{self._safe_name(key)}.json"
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[Any, float]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["value"], data["fetched_at"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _write(path: Path, data: Dict):
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _save_to_disk(self, key: str, value: Any, fetched_at: float):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._disk_lock:
+                self._write(self._path(key), {"key": key, "value": value, "fetched_at": fetched_at})
+        except OSError:
+            # Persistência é best-effort: a cópia em memória continua válida
+            pass
+
+    def _mark_stale_on_disk(self, paths: Iterable[Path], matches: Callable[[str], bool] = lambda key: True):
+        """Zera o 'fetched_at' das cópias em disco, para que continuem velhas após um reinício"""
+        with self._disk_lock:
+            for path in paths:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    # Arquivos antigos não guardam a chave; o nome serve para chaves simples
+                    if data["fetched_at"] and matches(data.get("key", path.stem)):
+                        self._write(path, {**data, "fetched_at": 0.0})
+                except (OSError, ValueError, KeyError, TypeError):
+                    pass
+
+    def _entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                with self._lock:
+                    entry = self._entries.setdefault(key, entry)
+        return entry
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Retorna a última cópia conhecida, sem buscar"""
+        entry = self._entry(key)
+        return copy.deepcopy(entry[0]) if entry else None
+
+    def age(self, key: str) -> Optional[float]:
+        """Idade da cópia em segundos (None se não houver cópia)"""
+        entry = self._entry(key)
+        return time.time() - entry[1] if entry else None
+
+    def set(self, key: str, value: Any):
+        """Armazena uma nova cópia em memória e em disco"""
+        fetched_at = time.time()
+        with self._lock:
+            self._entries[key] = (value, fetched_at)
+        self._save_to_disk(key, value, fetched_at)
+
+    def get(self, key: str, loader: Callable[[], Any], soft_ttl: float) -> Any:
+        """
+        Retorna a cópia atual, disparando atualização em segundo plano se ela estiver velha
+
+        Sem cópia disponível, executa o loader de forma síncrona (exceções propagam).
+        """
+        entry = self._entry(key)
+
+        if entry is None:
+            value = loader()
+            self.set(key, value)
+            return copy.deepcopy(value)
+
+        value, fetched_at = entry
+        if time.time() - fetched_at > soft_ttl or self._is_expired(key, fetched_at):
+            self._refresh_in_background(key, loader)
+        return copy.deepcopy(value)
+
+    def _is_expired(self, key: str, fetched_at: float) -> bool:
+        base_key = key.split(":", 1)[0]
+        with self._lock:
+            expired_at = self._expired_families.get(base_key)
+        return expired_at is not None and expired_at >= fetched_at
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.set(key, loader())
+            except Exception:
+                # Mantém a cópia anterior; nova tentativa na próxima leitura
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"snapshot-refresh-{key}", daemon=True).start()
+
+    def expire(self, key: Optional[str] = None):
+        """
+        Marca a cópia (ou todas) como velha, mantendo-a para servir enquanto atualiza
+
+        Vale também para as cópias em disco, inclusive as ainda não lidas.
+        """
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            for k in keys:
+                if k in self._entries:
+                    value, _ = self._entries[k]
+                    self._entries[k] = (value, 0.0)
+        self._mark_stale_on_disk([self._path(key)] if key is not None else self.directory.glob("*.json"))
+
+    def expire_family(self, base_key: str):
+        """
+        Marca como velhas a cópia da chave e as das suas projeções
+        ('chave:campos'), inclusive as que ainda estão só em disco
+
+        A comparação é exata: 'sites_1' não atinge 'sites_10'.
+        """
+        with self._lock:
+            self._expired_families[base_key] = time.time()
+        self._mark_stale_on_disk(self.directory.glob(f"{self._safe_name(base_key)}*.json"), lambda key: key.split(":", 1)[0] == base_key)
+
+    def invalidate(self, key_prefix: str = ""):
+        """Remove as cópias cujas chaves começam com o prefixo (memória e disco)"""
+        with self._lock:
+            for k in [k for k in self._entries if k.startswith(key_prefix)]:
+                del self._entries[k]
+        for path in self.directory.glob(f"{self._safe_name(key_prefix)}*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+# Instância única compartilhada pelo processo
+SNAPSHOTS = SnapshotStore(DATA_DIR / "netbox_snapshots")
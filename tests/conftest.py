@@ -0,0 +1,30 @@
+import pytest
+import services.netbox_service as netbox_service
+from bench.dataset import DatasetConfig
+from bench.fake_netbox import FakeNetboxServer
+from services.circuit_breaker import CircuitBreaker
+from services.snapshot_store import SnapshotStore
+from tests.test_netbox_service import make_service
+
+def sent_to(sent, endpoint):
+    """Parâmetros das requisições enviadas ao endpoint, na ordem"""
+    return [params for url, params in sent if endpoint in url]
+
+@pytest.fixture
+def fake_netbox(monkeypatch, tmp_path):
+    """Netbox simulado pequeno, com espião dos parâmetros enviados em cada GET"""
+    server = FakeNetboxServer(dataset=DatasetConfig(tenants=3, sites_per_tenant=2, devices_per_site=3, interfaces_per_device=4)).start()
+    sent = []
+    real_request = netbox_service.requests.request
+
+    def spy(method, url, **kwargs):
+        sent.append((url, dict(kwargs.get("params") or {})))
+        return real_request(method, url, **kwargs)
+
+    monkeypatch.setattr(netbox_service.requests, "request", spy)
+    monkeypatch.setattr(netbox_service, "NETBOX_BREAKER", CircuitBreaker())
+    monkeypatch.setattr(netbox_service, "SNAPSHOTS", SnapshotStore(tmp_path))
+    service = make_service()
+    monkeypatch.setattr(service, "base_url", server.api_url)
+    yield service, sent
+    server.stop()
@@ -0,0 +1,34 @@
+import pytest
+from services.adaptive_limiter import AdaptiveConcurrencyLimiter, NetboxThrottledError, parse_retry_after
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("amanhã") is None
+    assert parse_retry_after(None) is None
+
+def test_throttling_halves_the_limit_once_per_window():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, latency_target=1.0)
+    limiter.acquire()
+    limiter.release(0.1, status=503)
+    limiter.acquire()
+    limiter.release(0.1, status=503)
+    assert limiter.stats()["limit"] == 4
+
+def test_fast_responses_grow_the_limit_back():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, latency_target=1.0)
+    limiter.acquire()
+    limiter.release(0.1, status=429)
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release(0.1, status=200)
+    assert limiter.stats()["limit"] == 8
+
+def test_slot_times_out_when_full():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=1, latency_target=1.0)
+    with limiter.slot():
+        with pytest.raises(NetboxThrottledError):
+            with limiter.slot(timeout=0.01):
+                pass
+    assert limiter.stats()["in_flight"] == 0
@@ -0,0 +1,23 @@
+from services.asn_cache import AsnCache
+
+def test_parts_round_trip(tmp_path):
+    cache = AsnCache(tmp_path / "asn_cache.sqlite3")
+    assert cache.get("64500", "overview") is None
+    cache.put("64500", "overview", {"holder": "Exemplo", "country": "BR"}, fetched_at=10.0)
+    cache.put("64500", "prefixes", {"ipv4_prefixes": ["192.0.2.0/24"], "ipv6_prefixes": []}, fetched_at=20.0)
+    assert cache.get("64500", "overview") == ({"holder": "Exemplo", "country": "BR"}, 10.0)
+    assert cache.get("64500", "prefixes") == ({"ipv4_prefixes": ["192.0.2.0/24"], "ipv6_prefixes": []}, 20.0)
+
+def test_count_history(tmp_path):
+    cache = AsnCache(tmp_path / "asn_cache.sqlite3")
+    for at, v4 in ((30.0, 3), (10.0, 1), (20.0, 2)):
+        cache.put("64500", "prefixes", {"ipv4_prefixes": ["x"] * v4, "ipv6_prefixes": ["y"]}, fetched_at=at)
+    cache.put("64501", "prefixes", {"ipv4_prefixes": [], "ipv6_prefixes": []}, fetched_at=5.0)
+
+    assert cache.count_history(["64500"]) == {"64500": [(10.0, 1, 1), (20.0, 2, 1), (30.0, 3, 1)]}
+    assert set(cache.count_history()) == {"64500", "64501"}
+    assert cache.count_history([]) == {}
+    # Invalidar o cache não apaga o histórico
+    cache.invalidate("64500")
+    assert cache.get("64500", "prefixes") is None
+    assert len(cache.count_history(["64500"])["64500"]) == 3
@@ -0,0 +1,49 @@
+import os
+from services.bogon_filter import DEFAULT_ROUTE, INVALID, TOO_SPECIFIC, BogonFilter
+
+def make_filter(tmp_path, text=None):
+    path = tmp_path / "bogons.txt"
+    if text is not None:
+        path.write_text(text)
+    return BogonFilter(path)
+
+def test_default_list_categories(tmp_path):
+    bogons = make_filter(tmp_path)
+    kept, flagged = bogons.filter([
+        "10.1.0.0/16", "100.64.0.0/10", "8.8.8.0/24", "0.0.0.0/0", "45.169.160.0/25",
+        "2001:db8:1::/48", "fe80::/64", "2804:5984::/32", "2804:5984:1:2::/64", "3ffe:1::/32",
+    ])
+    assert bogons.source == "padrão"
+    assert kept == ["8.8.8.0/24", "2804:5984::/32"]
+    assert flagged == {
+        "10.1.0.0/16": "rfc1918",
+        "100.64.0.0/10": "rfc6598",
+        "0.0.0.0/0": DEFAULT_ROUTE,
+        "45.169.160.0/25": TOO_SPECIFIC,
+        "2001:db8:1::/48": "documentação",
+        "fe80::/64": "link-local",
+        "2804:5984:1:2::/64": TOO_SPECIFIC,
+        "3ffe:1::/32": "6bone",
+    }
+
+def test_flagged_keeps_input_text(tmp_path):
+    prefixes = ["10.0.0.1/8", "2001:DB8::/32", " 8.8.8.0/24", "300.0.0.0/8", "sem-barra"]
+    kept, flagged = make_filter(tmp_path).filter(prefixes)
+    assert kept == ["8.8.8.0/24"]
+    assert flagged == {"10.0.0.1/8": "rfc1918", "2001:DB8::/32": "documentação", "300.0.0.0/8": INVALID}
+    assert [p for p in prefixes if p not in flagged and "/" in p] == [" 8.8.8.0/24"]
+
+def test_most_specific_bogon_wins_and_limits(tmp_path):
+    bogons = make_filter(tmp_path, "10.0.0.0/8 privado\n10.1.0.0/16 laboratório  # comentário\n")
+    _, flagged = bogons.filter(["10.1.2.0/24", "10.2.0.0/16", "192.0.2.0/24", "8.8.8.0/28"], max_length_v4=28)
+    assert bogons.source == "bogons.txt"
+    assert flagged == {"10.1.2.0/24": "laboratório", "10.2.0.0/16": "privado"}
+
+def test_local_file_reload(tmp_path):
+    bogons = make_filter(tmp_path, "192.0.2.0/24\n")
+    assert bogons.filter(["192.0.2.0/24"])[1] == {"192.0.2.0/24": "bogon"}
+    path = tmp_path / "bogons.txt"
+    path.write_text("198.51.100.0/24 doc\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert bogons.filter(["192.0.2.0/24", "198.51.100.0/24"])[1] == {"198.51.100.0/24": "doc"}
@@ -0,0 +1,30 @@
+import pandas as pd
+from services.bulk_import import SPECS, BulkImporter
+
+class FakeNetbox:
+    """Netbox sem nenhum objeto cadastrado"""
+
+    def lookup_ids(self, endpoint, field, values, extra_fields=()):
+        return []
+
+def validate(rows):
+    importer = BulkImporter(SPECS["circuits"], netbox=FakeNetbox())
+    return importer, importer.validate(pd.DataFrame(rows, dtype=str))
+
+def test_commit_rate_is_sent_as_integer():
+    importer, validated = validate([{"cid": "C1", "provider": "p", "type": "t", "commit_rate": "10.0"}])
+    assert validated.loc[0, "commit_rate"] == 10
+    payload = importer._payload(validated, 0)
+    assert payload["commit_rate"] == 10 and isinstance(payload["commit_rate"], int)
+    assert "commit_rate" not in validated.loc[0, "erros"]
+
+def test_non_integer_commit_rate_is_flagged():
+    _, validated = validate([
+        {"cid": "C1", "provider": "p", "type": "t", "commit_rate": "1.5"},
+        {"cid": "C2", "provider": "p", "type": "t", "commit_rate": "dez"},
+        {"cid": "C3", "provider": "p", "type": "t"},
+    ])
+    assert "'commit_rate' deve ser inteiro: 1.5" in validated.loc[0, "erros"]
+    assert "'commit_rate' deve ser inteiro: dez" in validated.loc[1, "erros"]
+    assert "commit_rate" not in validated.loc[2, "erros"]
+    assert validated["commit_rate"].isna().all()
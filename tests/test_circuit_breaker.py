@@ -0,0 +1,125 @@
+import pytest
+import requests
+from services import circuit_breaker, netbox_service
+from services.adaptive_limiter import NetboxThrottledError
+from services.circuit_breaker import CircuitBreaker
+from tests.test_netbox_service import make_service
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock.monotonic)
+    return clock
+
+def test_closed_open_half_open_closed(clock):
+    breaker = CircuitBreaker(failure_threshold=2, latency_slo=1.0, reset_timeout=30)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()  # uma única requisição de teste
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+def test_slow_response_counts_as_failure(clock):
+    breaker = CircuitBreaker(failure_threshold=1, latency_slo=1.0)
+    breaker.record_success(2.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_released_probe_allows_next_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    probe = breaker.allow_request()
+    assert probe
+    breaker.release_probe(probe)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+def test_request_admitted_while_closed_does_not_release_the_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    early = breaker.allow_request()
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+
+    # A requisição admitida antes termina já no meio-aberto
+    breaker.release_probe(early)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+@pytest.fixture
+def half_open_breaker(monkeypatch, clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    monkeypatch.setattr(netbox_service, "NETBOX_BREAKER", breaker)
+    return breaker
+
+@pytest.mark.parametrize("error", [NetboxThrottledError("fila cheia"), RuntimeError("inesperado")])
+def test_probe_is_not_leaked_by_unrecorded_outcomes(half_open_breaker, error):
+    service = make_service()
+
+    def conditional_get(*args, **kwargs):
+        raise error
+
+    service._conditional_get = conditional_get
+    with pytest.raises(type(error)):
+        service._get_json("http://netbox.local/api/dcim/sites/", allow_stale=False)
+    assert half_open_breaker.state == CircuitBreaker.HALF_OPEN
+    assert half_open_breaker.allow_request()
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.payload = payload
+        self.wire_time = 0.01
+
+    def json(self):
+        return self.payload
+
+@pytest.mark.parametrize("status, state", [(503, CircuitBreaker.OPEN), (400, CircuitBreaker.HALF_OPEN), (200, CircuitBreaker.CLOSED)])
+def test_graphql_outcomes(half_open_breaker, status, state):
+    service = make_service()
+    service.graphql_url = "http://netbox.local/graphql/"
+    service._send = lambda *args, **kwargs: FakeResponse(status, {"data": {"site_list": []}})
+    service._graphql_query("{ site_list { id } }")
+    assert half_open_breaker.state == state
+    if state == CircuitBreaker.HALF_OPEN:
+        assert half_open_breaker.allow_request()
+
+def test_graphql_connection_error_is_a_failure(half_open_breaker):
+    service = make_service()
+    service.graphql_url = "http://netbox.local/graphql/"
+
+    def send(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("recusada")
+
+    service._send = send
+    assert service._graphql_query("{ site_list { id } }") is None
+    assert half_open_breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,93 @@
+import os
+import pytest
+from services import irr_index
+from services.irr_index import IrrIndex, build_index
+
+RPSL = """\
+route:   192.0.2.1/24
+origin:  AS64500
+source:  RADB
+
+route:   198.51.100.0/24
+origin:  AS64501
+source:  RADB
+
+route6:  2001:DB8:0000::/32
+origin:  AS64502
+source:  RIPE
+
+as-set:  AS-CLIENTE
+members: AS64500, AS-REVENDA
+source:  RADB
+
+as-set:  AS-REVENDA
+members: AS64501,
++        AS-CLIENTE, AS-SUMIDO
+source:  RADB
+
+as-set:  AS-OUTRO
+members: AS64502
+source:  RADB
+"""
+
+@pytest.fixture
+def irr(tmp_path):
+    source = tmp_path / "radb.db"
+    source.write_text(RPSL)
+    target = tmp_path / "irr.sqlite3"
+    assert build_index([source], target) == {"route": 2, "route6": 1, "as-set": 3}
+    return IrrIndex(target)
+
+def test_routes_are_stored_canonical(irr):
+    assert irr.origins_of("192.0.2.0/24") == [64500]
+    assert irr.origins_of("2001:db8::/32") == [64502]
+    assert irr.prefixes_of([64500, 64502]) == {"ipv4_prefixes": ["192.0.2.0/24"], "ipv6_prefixes": ["2001:db8::/32"]}
+
+def test_expansion_warnings_survive_memoization(irr):
+    expected = ({64500, 64501}, ["AS-SUMIDO não encontrado", "ciclo em AS-CLIENTE"])
+    first = irr.expand_as_set("as-cliente")
+    assert (first[0], sorted(first[1])) == expected
+    again = irr.expand_as_set("AS-CLIENTE")
+    assert (again[0], sorted(again[1])) == expected
+    # Membro do mesmo ciclo: mesmo resultado, vindo da memória
+    revenda = irr.expand_as_set("AS-REVENDA")
+    assert (revenda[0], sorted(revenda[1])) == expected
+    assert irr.expand_as_set("AS-OUTRO") == ({64502}, [])
+
+def test_regenerated_index_does_not_inherit_an_expansion_in_progress(irr, tmp_path, monkeypatch):
+    members = irr._members
+
+    def regenerate_midway(name):
+        if name == "AS-REVENDA" and not regenerated:
+            source = tmp_path / "radb-v2.db"
+            source.write_text(
+                "as-set:  AS-CLIENTE\nmembers: AS64520, AS-REVENDA\nsource:  RADB\n\n"
+                "as-set:  AS-REVENDA\nmembers: AS64510\nsource:  RADB\n"
+            )
+            build_index([source], irr.path)
+            mtime = irr.path.stat().st_mtime + 10
+            os.utime(irr.path, (mtime, mtime))
+            regenerated.append(name)
+        return members(name)
+
+    regenerated = []
+    monkeypatch.setattr(irr, "_members", regenerate_midway)
+    # A expansão mistura as duas gerações e não deve ficar na memória da nova
+    assert irr.expand_as_set("AS-CLIENTE")[0] == {64500, 64510}
+    assert irr.expand_as_set("AS-CLIENTE") == ({64510, 64520}, [])
+
+def test_verify_batches_queries(irr, monkeypatch):
+    monkeypatch.setattr(irr_index, "QUERY_CHUNK_SIZE", 2)
+    queries = []
+    query = irr._query
+    monkeypatch.setattr(irr, "_query", lambda sql, params: queries.append(sql) or query(sql, params))
+    prefixes = ["192.0.2.0/24", "192.0.2.7/24", "198.51.100.0/24", "2001:DB8::/32", "10.0.0.0/8", "lixo/99"]
+    assert irr.verify(prefixes, {64500, 64502}) == {
+        "192.0.2.0/24": True,
+        "192.0.2.7/24": True,
+        "198.51.100.0/24": False,
+        "2001:DB8::/32": True,
+        "10.0.0.0/8": False,
+        "lixo/99": False,
+    }
+    assert len(queries) == 2
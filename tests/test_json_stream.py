@@ -0,0 +1,37 @@
+import json
+import pytest
+import requests
+from services.json_stream import decode_page, iter_page
+
+PAGE = {"count": 3, "next": None, "results": [{"id": 1, "name": "a"}, {"id": 22, "name": "b é"}, {"id": 3.5, "x": []}], "previous": None}
+
+def split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1000])
+def test_iter_page_across_chunk_boundaries(size):
+    meta = {}
+    items = list(iter_page(split(json.dumps(PAGE), size), meta))
+    assert items == PAGE["results"]
+    assert meta == {"count": 3, "next": None, "previous": None}
+
+class StreamResponse:
+    encoding = "utf-8"
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), 5):
+            yield self.body[i:i + 5]
+
+def test_decode_page_applies_transform():
+    body = json.dumps(PAGE, ensure_ascii=False).encode("utf-8")
+    page, size = decode_page(StreamResponse(body), lambda item: {"id": item["id"]})
+    assert page["results"] == [{"id": 1}, {"id": 22}, {"id": 3.5}]
+    assert size == len(body)
+
+@pytest.mark.parametrize("body", [b'{"results": [{"id": 1}', b'{"results": [1 2]}', b'<html>502</html>', b'{"a": "\xff"}'])
+def test_malformed_pages_raise_request_exceptions(body):
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        decode_page(StreamResponse(body))
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from services import max_prefix
+from services.max_prefix import DAY, MIN_LIMIT, _round_up, growth_factor, recommend
+
+@pytest.mark.parametrize("value, expected", [(9, 9), (10.2, 11), (137, 140), (140, 140), (1234, 1300), (99001, 100000)])
+def test_round_up(value, expected):
+    assert _round_up(value) == expected
+
+def test_growth_factor_uses_window_percentile():
+    times = np.array([0, 30, 100, 200], dtype=np.float64) * DAY
+    counts = np.array([100, 110, 150, 120], dtype=np.float64)
+    growth, windows = growth_factor(times, counts)
+    # Janelas: 150/100 (dia 100 vs 0) e 120/150 -> 1 (dia 200 vs 100)
+    assert windows == 2
+    assert growth == pytest.approx(np.percentile([1.5, 0.8], max_prefix.GROWTH_PERCENTILE))
+
+def test_growth_factor_never_shrinks():
+    times = np.array([0, 100], dtype=np.float64) * DAY
+    assert growth_factor(times, np.array([200.0, 100.0])) == (1.0, 1)
+    assert growth_factor(times[:1], np.array([200.0])) == (1.0, 0)
+
+def test_recommend():
+    history = [(0.0, 100, 0), (100 * DAY, 150, 0), (101 * DAY, 140, 2)]
+    rec = recommend(history)
+    assert rec["samples"] == 3 and rec["since"] == 0.0
+    assert rec["current_v4"] == 140 and rec["current_v6"] == 2
+    assert rec["ipv4"] == _round_up(150 * rec["growth_v4"] * (1 + max_prefix.HEADROOM))
+    assert rec["ipv6"] == MIN_LIMIT
+
+def test_recommend_without_history():
+    rec = recommend([])
+    assert rec["ipv4"] is None and rec["ipv6"] is None and rec["samples"] == 0
@@ -0,0 +1,61 @@
+import pytest
+from services import netbox_changefeed
+from services.netbox_changefeed import NetboxChangeFeed, apply_change, change_tags
+from services.snapshot_store import SnapshotStore
+
+def site_change(site_id, tenant_id):
+    return {
+        "changed_object_type": "dcim.site",
+        "changed_object_id": site_id,
+        "postchange_data": {"tenant": {"id": tenant_id}},
+    }
+
+def test_change_tags_include_related_objects():
+    tags = change_tags({
+        "changed_object_type": {"app_label": "dcim", "model": "device"},
+        "changed_object_id": 5,
+        "prechange_data": {"site": 1, "primary_ip4": {"id": 9}},
+        "postchange_data": {"site": 2, "tenant": 3},
+    })
+    assert tags == {"device:5", "site:1", "site:2", "tenant:3", "ip:9", "counts"}
+
+def test_site_change_expires_only_that_tenant(tmp_path, monkeypatch):
+    store = SnapshotStore(tmp_path)
+    monkeypatch.setattr(netbox_changefeed, "SNAPSHOTS", store)
+    for key in ("sites_1", "sites_1:id,name", "sites_10", "sites_100:id", "sites_all"):
+        store.set(key, [])
+    apply_change(site_change(7, 1))
+
+    assert store._is_expired("sites_1", 0)
+    assert store._is_expired("sites_1:id,name", 0)
+    assert store._is_expired("sites_all", 0)
+    assert not store._is_expired("sites_10", 0)
+    assert not store._is_expired("sites_100:id", 0)
+
+@pytest.mark.parametrize("url", ["http://netbox.local/api", "http://netbox.local/api/"])
+def test_feed_url_joins_base_url(monkeypatch, url):
+    monkeypatch.setattr(netbox_changefeed.AppConfig.NETBOX, "url", url)
+    assert NetboxChangeFeed(60).url == "http://netbox.local/api/extras/object-changes/"
+
+class StopLoop(BaseException):
+    pass
+
+def test_run_survives_unexpected_errors(monkeypatch):
+    monkeypatch.setattr(netbox_changefeed.AppConfig.NETBOX, "url", "http://netbox.local/api")
+    feed = NetboxChangeFeed(60)
+    polls = []
+
+    def poll():
+        polls.append(1)
+        raise RuntimeError("inesperado")
+
+    def sleep(seconds):
+        if len(polls) >= 2:
+            raise StopLoop()
+
+    feed.poll = poll
+    monkeypatch.setattr(netbox_changefeed.time, "sleep", sleep)
+    with pytest.raises(StopLoop):
+        feed.run()
+    assert len(polls) == 2
+    assert feed.stats()["errors"] == 2
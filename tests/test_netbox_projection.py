@@ -0,0 +1,54 @@
+import pytest
+from services.netbox_service import NetboxService
+from tests.conftest import sent_to
+
+@pytest.mark.parametrize("stream_json", [False, True])
+def test_projected_devices_keep_the_fields_callers_read(fake_netbox, monkeypatch, stream_json):
+    service, sent = fake_netbox
+    monkeypatch.setattr(service.config, "stream_json", stream_json)
+    monkeypatch.setattr(service.config, "field_projection", True)
+
+    devices = service.get_devices(site_id=2, fields=NetboxService.DEVICE_FIELDS)
+
+    assert sent_to(sent, "dcim/devices/")[0]["fields"] == "id,name,primary_ip4,primary_ip6,status"
+    assert [d["name"] for d in devices] == ["RT-000004", "RT-000005", "RT-000006"]
+    for device in devices:
+        assert set(device) == {"id", "name", "status", "primary_ip4", "primary_ip6"}
+        assert device["status"]["label"]
+        assert device["primary_ip4"]["address"].startswith("10.")
+        assert set(device["primary_ip4"]) == {"address"}
+
+def test_projected_interfaces_keep_enabled_and_type(fake_netbox, monkeypatch):
+    service, sent = fake_netbox
+    monkeypatch.setattr(service.config, "field_projection", True)
+
+    interfaces = service.get_device_interfaces(1, fields=NetboxService.INTERFACE_FIELDS)
+
+    assert sent_to(sent, "dcim/interfaces/")[0]["fields"] == "enabled,id,name,type"
+    assert len(interfaces) == 4
+    for interface in interfaces:
+        assert set(interface) == {"id", "name", "enabled", "type"}
+        assert isinstance(interface["enabled"], bool)
+        assert interface["type"]["value"]
+
+def test_brief_covers_tenant_fields(fake_netbox):
+    service, sent = fake_netbox
+
+    tenants = service._get_paginated_results("tenancy/tenants/", fields=NetboxService.TENANT_FIELDS, strict=True)
+
+    params = sent_to(sent, "tenancy/tenants/")[0]
+    assert params.get("brief") == "true" and "fields" not in params
+    assert [set(t) for t in tenants] == [{"id", "name", "slug"}] * 3
+
+def test_without_field_projection_the_client_still_prunes(fake_netbox, monkeypatch):
+    service, sent = fake_netbox
+    monkeypatch.setattr(service.config, "field_projection", False)
+
+    sites = service._get_paginated_results("dcim/sites/", params={"tenant_id": 1}, fields=NetboxService.SITE_FIELDS, strict=True)
+
+    assert "fields" not in sent_to(sent, "dcim/sites/")[0]
+    assert len(sites) == 2
+    for site in sites:
+        assert set(site) == {"id", "name", "slug", "status", "region"}
+        assert site["status"]["label"] and site["region"]["name"]
+        assert set(site["region"]) == {"name"}
@@ -0,0 +1,254 @@
+import pytest
+import requests
+from services.netbox_service import NetboxService
+
+class FakeState:
+    """Substitui o st.session_state nos testes"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+def make_service():
+    service = NetboxService()
+    service.state = FakeState()
+    return service
+
+def test_empty_inventory_is_cached():
+    service = make_service()
+    calls = []
+
+    def graphql(query):
+        calls.append(query)
+        return {"site_list": []}
+
+    service._graphql_query = graphql
+    assert service.get_tenant_inventory(1) == []
+    assert service.get_tenant_inventory(1) == []
+    assert len(calls) == 1
+
+def test_device_primary_ip_keeps_netbox_primary_ip():
+    service = make_service()
+    devices = [{
+        "id": 7,
+        "primary_ip": {"id": 2, "address": "2001:db8::1/64"},
+        "primary_ip4": {"id": 1, "address": "192.0.2.1/32"},
+        "primary_ip6": {"id": 2, "address": "2001:db8::1/64"},
+    }]
+    service._get_paginated_results = lambda endpoint, params=None, fields=None, strict=False: devices
+    assert service.get_device_primary_ip(7) == "2001:db8::1"
+    assert service.get_devices_primary_ips([7])[7] == {"primary": "2001:db8::1", "ipv4": "192.0.2.1", "ipv6": "2001:db8::1"}
+
+def test_primary_ips_resolve_shared_addresses():
+    service = make_service()
+    responses = {
+        "dcim/devices/": [{"id": 7, "primary_ip": {"id": 2}, "primary_ip4": None, "primary_ip6": {"id": 2}}],
+        "ipam/ip-addresses/": [{"id": 2, "address": "2001:db8::1/64"}],
+    }
+    service._get_paginated_results = lambda endpoint, params=None, fields=None, strict=False: responses[endpoint]
+    assert service.get_devices_primary_ips([7])[7] == {"primary": "2001:db8::1", "ipv4": None, "ipv6": "2001:db8::1"}
+
+def test_failed_counts_are_not_cached(monkeypatch):
+    import requests
+    import services.netbox_service as netbox_service
+    monkeypatch.setattr(netbox_service.st, "error", lambda *args, **kwargs: None)
+    service = make_service()
+    failing = {"fail": True}
+
+    def get_json(url, params=None, **kwargs):
+        if failing["fail"] and "circuits" in url:
+            raise requests.exceptions.HTTPError("500")
+        return {"count": 3, "results": []}
+
+    service._get_json = get_json
+    counts = service.get_counts(tenant_id=1)
+    assert counts["circuits"] is None and counts["devices"] == 3
+
+    failing["fail"] = False
+    assert service.get_counts(tenant_id=1)["circuits"] == 3
+    assert service.state.get("cache")
+
+class FakeHttpResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.ok = status_code < 400
+        self.content = b'{"results": []}'
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"results": []}
+
+    def close(self):
+        pass
+
+def test_breaker_latency_excludes_backoff(monkeypatch):
+    from services import netbox_service
+    from services.circuit_breaker import CircuitBreaker
+    breaker = CircuitBreaker(failure_threshold=1, latency_slo=1.0)
+    monkeypatch.setattr(netbox_service, "NETBOX_BREAKER", breaker)
+    clock = {"now": 0.0}
+    monkeypatch.setattr(netbox_service.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(netbox_service.time, "sleep", lambda seconds: clock.update(now=clock["now"] + 30))
+    statuses = iter([503, 200])
+
+    def request(method, url, **kwargs):
+        clock["now"] += 0.2
+        return FakeHttpResponse(next(statuses))
+
+    monkeypatch.setattr(netbox_service.requests, "request", request)
+    service = make_service()
+    monkeypatch.setattr(service.config, "stream_json", False)
+    assert service._get_json("http://netbox.local/api/dcim/wire-time/") == {"results": []}
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_malformed_stream_counts_as_breaker_failure(monkeypatch):
+    from services import netbox_service
+    from services.circuit_breaker import CircuitBreaker
+    breaker = CircuitBreaker(failure_threshold=1)
+    monkeypatch.setattr(netbox_service, "NETBOX_BREAKER", breaker)
+
+    class Truncated(FakeHttpResponse):
+        encoding = "utf-8"
+
+        def iter_content(self, chunk_size):
+            yield b'{"results": [{"id": 1'
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+    monkeypatch.setattr(netbox_service.requests, "request", lambda method, url, **kwargs: Truncated(200))
+    monkeypatch.setattr(make_service().config, "stream_json", True)
+    service = make_service()
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        service._get_json("http://netbox.local/api/dcim/truncated/", allow_stale=False, fields=("id",))
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_bulk_post_is_not_retried(monkeypatch):
+    from services import netbox_service
+    from services.circuit_breaker import CircuitBreaker
+    monkeypatch.setattr(netbox_service, "NETBOX_BREAKER", CircuitBreaker())
+    monkeypatch.setattr(netbox_service.time, "sleep", lambda seconds: None)
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(method)
+        return FakeHttpResponse(503)
+
+    monkeypatch.setattr(netbox_service.requests, "request", request)
+    service = make_service()
+    status, _ = service.bulk_write("POST", "dcim/sites/", [{"name": "a"}])
+    assert status == 503 and calls == ["POST"]
+
+    calls.clear()
+    service.bulk_write("PATCH", "dcim/sites/", [{"id": 1, "name": "a"}])
+    assert calls == ["PATCH"] * (service.config.max_retries + 1)
+
+def test_primary_ips_are_not_cached_after_a_failure(monkeypatch):
+    from services import netbox_service
+    monkeypatch.setattr(netbox_service.st, "error", lambda *args, **kwargs: None)
+    service = make_service()
+    online = {"up": False}
+
+    def get_json(url, params=None, allow_stale=True, fields=None):
+        if not online["up"]:
+            raise requests.exceptions.ConnectionError("sem rede")
+        return {"results": [{"id": 7, "primary_ip": {"id": 1, "address": "192.0.2.1/32"}}], "next": None}
+
+    service._get_json = get_json
+    assert service.get_devices_primary_ips([7]) == {7: {"primary": None, "ipv4": None, "ipv6": None}}
+    online["up"] = True
+    assert service.get_device_primary_ip(7) == "192.0.2.1"
+
+def test_get_is_copied_once_at_the_return_boundary(monkeypatch):
+    import copy
+    from services import netbox_service
+    from services.circuit_breaker import CircuitBreaker
+    monkeypatch.setattr(netbox_service, "NETBOX_BREAKER", CircuitBreaker())
+    statuses = iter([200, 304])
+
+    class Tagged(FakeHttpResponse):
+        def json(self):
+            return {"results": [{"id": 1}]}
+
+    monkeypatch.setattr(netbox_service.requests, "request", lambda method, url, **kwargs: Tagged(next(statuses), {"ETag": '"v1"'}))
+    real_deepcopy = copy.deepcopy
+    copies = []
+    monkeypatch.setattr(copy, "deepcopy", lambda value, *args: copies.append(value) or real_deepcopy(value, *args))
+    service = make_service()
+    monkeypatch.setattr(service.config, "stream_json", False)
+
+    first = service._make_request("dcim/copy-once/")
+    assert len(copies) == 1
+    first["results"].clear()
+
+    # O 304 é servido da entrada compartilhada, que a alteração acima não atingiu
+    assert service._make_request("dcim/copy-once/") == {"results": [{"id": 1}]}
+    assert len(copies) == 2
+
+def test_counts_skip_the_sites_the_page_already_has():
+    service = make_service()
+    urls = []
+
+    def get_json(url, params=None, **kwargs):
+        urls.append(url)
+        return {"count": 2, "results": []}
+
+    service._get_json = get_json
+    assert service.get_counts(tenant_id=1) == {"devices": 2, "interfaces": 2, "circuits": 2}
+    assert not [url for url in urls if "dcim/sites/" in url]
+
+def test_persistent_throttling_serves_the_last_known_good(monkeypatch):
+    from services import netbox_service
+    from services.circuit_breaker import CircuitBreaker
+    monkeypatch.setattr(netbox_service, "NETBOX_BREAKER", CircuitBreaker())
+    monkeypatch.setattr(netbox_service.time, "sleep", lambda seconds: None)
+    statuses = [200]
+
+    class Throttled(FakeHttpResponse):
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                raise requests.exceptions.HTTPError(str(self.status_code), response=self)
+
+    monkeypatch.setattr(netbox_service.requests, "request", lambda method, url, **kwargs: Throttled(statuses[0]))
+    service = make_service()
+    monkeypatch.setattr(service.config, "stream_json", False)
+    url = "http://netbox.local/api/dcim/throttled/"
+    assert service._get_json(url) == {"results": []}
+
+    statuses[0] = 429
+    assert service._get_json(url) == {"results": []}
+    with pytest.raises(requests.exceptions.HTTPError):
+        service._get_json(url, allow_stale=False)
+
+def test_failed_interface_preload_is_not_cached(monkeypatch):
+    from services import netbox_service
+    errors = []
+    monkeypatch.setattr(netbox_service.st, "error", errors.append)
+    service = make_service()
+    online = {"up": False}
+
+    def get_json(url, params=None, allow_stale=True, fields=None):
+        assert not allow_stale
+        if not online["up"]:
+            raise requests.exceptions.ConnectionError("sem rede")
+        return {"results": [{"id": 1, "name": "ge-0/0/0", "device": {"id": 10}}], "next": None}
+
+    service._get_json = get_json
+    assert service.preload_site_interfaces(1, [10, 11]) == {}
+    assert errors
+    assert service.get_preloaded_interfaces(10) is None
+
+    online["up"] = True
+    assert service.preload_site_interfaces(1, [10, 11]) == {10: [{"id": 1, "name": "ge-0/0/0"}], 11: []}
+    assert service.get_preloaded_interfaces(11) == []
@@ -0,0 +1,64 @@
+import ipaddress
+import random
+import pytest
+from services.prefix_aggregation import aggregate, compact_prefix_list, parse_prefix, remove_covered
+
+def random_prefixes(seed, count=300):
+    rng = random.Random(seed)
+    prefixes = []
+    for _ in range(count):
+        length = rng.randint(18, 24)
+        address = rng.getrandbits(8) << 8 | 10 << 24
+        prefixes.append(str(ipaddress.ip_network(f"{ipaddress.IPv4Address(address)}/{length}", strict=False)))
+    return prefixes
+
+def test_parse_prefix_rejects_host_bits():
+    assert parse_prefix("10.0.0.0/8")[:3] == (4, 10 << 24, 8)
+    with pytest.raises(ValueError):
+        parse_prefix("10.0.0.1/8")
+    with pytest.raises(ValueError):
+        parse_prefix("10.0.0.0/33")
+
+def test_remove_covered_keeps_order_and_text():
+    prefixes = ["10.0.1.0/24", "2001:db8::/32", "10.0.0.0/16", "2001:db8:1::/48", "10.0.0.0/16", "192.0.2.0/24"]
+    assert remove_covered(prefixes) == ["2001:db8::/32", "10.0.0.0/16", "192.0.2.0/24"]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_aggregate_matches_ipaddress(seed):
+    prefixes = random_prefixes(seed)
+    expected = [str(n) for n in ipaddress.collapse_addresses(ipaddress.ip_network(p) for p in prefixes)]
+    assert aggregate(prefixes) == expected
+
+def test_aggregate_merges_siblings_per_family():
+    assert aggregate(["10.0.0.128/25", "2001:db8:8000::/33", "10.0.0.0/25", "2001:db8::/33"]) == ["10.0.0.0/24", "2001:db8::/32"]
+
+def accepted(entries):
+    """Rotas de 10.0.0.0/16 a /26 casadas pelas entradas compactadas"""
+    routes = set()
+    for entry in entries:
+        network = ipaddress.ip_network(f"{entry['Prefixo']}/{entry['Máscara']}")
+        low = entry["greater_equal"] or entry["Máscara"]
+        for length in range(low, entry["less_equal"] + 1):
+            routes.update(network.subnets(new_prefix=length))
+    return routes
+
+def expected_routes(prefixes, less_equal):
+    routes = set()
+    for prefix in prefixes:
+        network = ipaddress.ip_network(prefix)
+        for length in range(network.prefixlen, max(less_equal or 0, network.prefixlen) + 1):
+            routes.update(network.subnets(new_prefix=length))
+    return routes
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("less_equal", [None, 24, 26])
+def test_compact_prefix_list_preserves_accepted_routes(seed, less_equal):
+    prefixes = random_prefixes(seed, count=40)
+    entries = compact_prefix_list(prefixes, less_equal)
+    assert accepted(entries) == expected_routes(prefixes, less_equal)
+    assert len(entries) <= len(set(prefixes))
+
+def test_compact_prefix_list_example():
+    assert compact_prefix_list(["10.0.0.0/24", "10.0.1.0/24"], less_equal=24) == [
+        {"Prefixo": "10.0.0.0", "Máscara": 23, "greater_equal": 24, "less_equal": 24}
+    ]
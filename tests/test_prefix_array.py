@@ -0,0 +1,41 @@
+import ipaddress
+import random
+from utils.prefix_array import parse_prefixes
+from utils.rp_name import RpNameFormatter
+
+def test_parse_matches_ipaddress():
+    rng = random.Random(7)
+    prefixes = []
+    for _ in range(500):
+        if rng.random() < 0.5:
+            prefixes.append(f"{ipaddress.IPv4Address(rng.getrandbits(32))}/{rng.randint(0, 32)}")
+        else:
+            prefixes.append(f"{ipaddress.IPv6Address(rng.getrandbits(128))}/{rng.randint(0, 128)}")
+    networks = {ipaddress.ip_network(p, strict=False) for p in prefixes}
+    expected = [str(n) for n in sorted(networks, key=lambda n: (n.version, n.network_address, n.prefixlen))]
+
+    parsed = parse_prefixes(prefixes)
+    assert parsed.texts() == expected
+    assert parsed.duplicates == len(prefixes) - len(networks)
+    assert sorted(parsed.host_bits) == sorted(p for p in prefixes if str(ipaddress.ip_network(p, strict=False)) != p)
+
+def test_invalid_and_ignored_tokens():
+    parsed = parse_prefixes("10.0.0.0/8, 300.0.0.0/8; 10.0.0.0/33\nfoo 192.0.2.1 2001:db8::/129 2001:db8::/32")
+    assert parsed.texts() == ["10.0.0.0/8", "2001:db8::/32"]
+    assert parsed.invalid == ["300.0.0.0/8", "10.0.0.0/33", "2001:db8::/129"]
+
+def test_list_elements_with_several_prefixes():
+    parsed = parse_prefixes(["10.0.0.0/8\n10.1.0.0/16", " 192.0.2.0/24, 2001:db8::/32 ", "", "198.51.100.0/24\r\n"])
+    assert parsed.texts() == ["10.0.0.0/8", "10.1.0.0/16", "192.0.2.0/24", "198.51.100.0/24", "2001:db8::/32"]
+    assert parsed.invalid == []
+
+def test_select_family():
+    parsed = parse_prefixes(["2001:db8::/32", "192.0.2.0/24"])
+    assert parsed.select(4).texts() == ["192.0.2.0/24"]
+    assert parse_prefixes(["2001:db8::/32", "192.0.2.0/24"], family=6).texts() == ["2001:db8::/32"]
+
+def test_rp_names_match_formatter():
+    prefixes = ["45.169.160.0/24", "2804:5984::/32", "10.1.2.0/23", "2001:db8:0:ffff::/64"]
+    parsed = parse_prefixes(prefixes)
+    assert parsed.rp_names() == [RpNameFormatter.convert(p) for p in parsed.texts()]
+    assert RpNameFormatter.convert_many(prefixes) == [RpNameFormatter.convert(p) for p in prefixes]
@@ -0,0 +1,33 @@
+import os
+from services.prefix_origin import PrefixOriginIndex, build_index
+
+PFX2AS = "10.0.0.0\t8\t64500\n10.1.0.0\t16\t64501_64502\n192.0.2.0\t24\t64500\n2001:db8::\t32\t64500\n"
+
+def make_index(tmp_path, text=PFX2AS):
+    source = tmp_path / "routeviews.pfx2as"
+    source.write_text(text)
+    target = tmp_path / "prefix_origin.idx"
+    stats = build_index(source, target)
+    return PrefixOriginIndex(target), stats
+
+def test_lookups(tmp_path):
+    index, stats = make_index(tmp_path)
+    assert stats == {"ipv4": 3, "ipv6": 1, "asns": 3, "skipped": 0}
+    assert index.origin_of("10.1.2.0/24") == {"prefix": "10.1.0.0/16", "origins": [64501, 64502]}
+    assert index.origin_of("10.200.0.0/16") == {"prefix": "10.0.0.0/8", "origins": [64500]}
+    assert index.origin_of("198.51.100.0/24") is None
+    assert index.prefixes_of("AS64500") == {"ipv4_prefixes": ["10.0.0.0/8", "192.0.2.0/24"], "ipv6_prefixes": ["2001:db8::/32"]}
+
+def test_reload_closes_previous_map(tmp_path):
+    index, _ = make_index(tmp_path)
+    assert index.prefixes_of(64501)["ipv4_prefixes"] == ["10.1.0.0/16"]
+    previous = index._mm
+
+    source = tmp_path / "routeviews.pfx2as"
+    source.write_text("172.16.0.0\t12\t64501\n")
+    build_index(source, index.path)
+    stat = index.path.stat()
+    os.utime(index.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert index.prefixes_of(64501)["ipv4_prefixes"] == ["172.16.0.0/12"]
+    assert previous.closed and not index._mm.closed
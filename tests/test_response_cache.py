@@ -0,0 +1,38 @@
+from services.response_cache import ConditionalResponseCache, LastKnownGoodCache
+
+def test_make_key_is_order_independent():
+    assert ConditionalResponseCache.make_key("u", {"b": 1, "a": [2, 3]}) == ConditionalResponseCache.make_key("u", {"a": [2, 3], "b": 1})
+
+def test_conditional_headers_and_not_modified():
+    cache = ConditionalResponseCache()
+    key = cache.make_key("http://nb/api/dcim/sites/")
+    cache.store(key, {"ETag": '"v1"', "Last-Modified": "Mon"}, {"results": [{"id": 1}]}, 100)
+    assert cache.conditional_headers(key) == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"}
+    assert cache.not_modified(key) == {"results": [{"id": 1}]}
+    assert cache.stats()["bytes_saved"] == 100
+
+def test_responses_without_validators_are_not_kept():
+    cache = ConditionalResponseCache()
+    key = cache.make_key("u")
+    cache.store(key, {}, {"results": []}, 10)
+    assert cache.conditional_headers(key) == {}
+    assert cache.not_modified(key) is None
+
+def test_payloads_are_kept_without_copying():
+    # A cópia para o chamador é feita uma única vez, no SINGLE_FLIGHT
+    cache = ConditionalResponseCache()
+    key = cache.make_key("u")
+    payload = {"results": [{"id": 1}]}
+    cache.store(key, {"ETag": "x"}, payload, 10)
+    assert cache.not_modified(key) is payload
+
+    stale = LastKnownGoodCache()
+    stale.store(key, payload)
+    assert stale.get(key) is payload
+
+def test_invalidate_by_url_prefix():
+    cache = ConditionalResponseCache()
+    cache.store(cache.make_key("http://nb/api/dcim/sites/"), {"ETag": "a"}, {}, 1)
+    cache.store(cache.make_key("http://nb/api/tenancy/tenants/"), {"ETag": "b"}, {}, 1)
+    cache.invalidate("http://nb/api/dcim/")
+    assert cache.stats()["entries"] == 1
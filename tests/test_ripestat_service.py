@@ -0,0 +1,113 @@
+import threading
+import time
+import requests
+from config.settings import AppConfig
+from services import ripestat_service
+from services.asn_cache import AsnCache
+from services.ripestat_service import OVERVIEW, PREFIXES, SOURCE_LOCAL, RipeStatService, empty_asn_info, merge_part
+
+class EmptyCache:
+    def get(self, asn, part):
+        return None
+
+class LocalIndex:
+    built_at = 1_700_000_000.0
+
+    def prefixes_of(self, asn):
+        int(asn)  # como o índice real
+        return {"ipv4_prefixes": ["192.0.2.0/24"], "ipv6_prefixes": []}
+
+def offline(monkeypatch):
+    def fail(self, asn, part):
+        raise requests.exceptions.ConnectionError("sem rede")
+
+    monkeypatch.setattr(ripestat_service, "ASN_CACHE", EmptyCache())
+    monkeypatch.setattr(ripestat_service, "PREFIX_ORIGINS", LocalIndex())
+    monkeypatch.setattr(RipeStatService, "_fetch_part", fail)
+
+def test_local_fallback_is_labelled(monkeypatch):
+    offline(monkeypatch)
+    info = RipeStatService().lookup("AS64500", parts=(PREFIXES,))
+    assert info["source"] == SOURCE_LOCAL
+    assert info["local_as_of"] == LocalIndex.built_at and info["as_of"] is None
+    assert info["ipv4_prefixes"] == ["192.0.2.0/24"]
+
+def test_invalid_asn_skips_local_fallback(monkeypatch):
+    offline(monkeypatch)
+    info = RipeStatService().lookup("ASXYZ", parts=(PREFIXES,))
+    assert info["errors"] == ["sem rede"]
+    assert info["source"] != SOURCE_LOCAL
+
+def test_ripestat_parts_keep_their_date():
+    info = merge_part(empty_asn_info(), PREFIXES, {"ipv4_prefixes": ["198.51.100.0/24"], "ipv6_prefixes": [], "as_of": 10.0})
+    assert info["as_of"] == 10.0 and info["source"] != SOURCE_LOCAL
+
+class FakeRipeStat:
+    """Respostas do RIPEstat por ASN; todas as consultas precisam estar em andamento juntas"""
+
+    def __init__(self, parties):
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.calls = []
+
+    def get(self, endpoint, asn, timeout):
+        self.calls.append((endpoint, asn))
+        self.barrier.wait()
+        if asn == "64501":
+            raise requests.exceptions.ConnectionError("sem rede")
+        if asn == "64502":
+            return {}
+        if endpoint == "as-overview":
+            return {"holder": f"Titular {asn}", "country": "BR"}
+        return {"prefixes": [{"prefix": "192.0.2.0/24"}, {"prefix": "2001:db8::/32"}]}
+
+def test_lookups_run_concurrently_and_errors_stay_with_their_asn(monkeypatch, tmp_path):
+    cache = AsnCache(tmp_path / "asn_cache.sqlite3")
+    monkeypatch.setattr(ripestat_service, "ASN_CACHE", cache)
+    monkeypatch.setattr(ripestat_service, "PREFIX_ORIGINS", type("NoIndex", (), {"prefixes_of": lambda self, asn: None})())
+    fake = FakeRipeStat(parties=6)
+    service = RipeStatService()
+    monkeypatch.setattr(service, "_get", fake.get)
+
+    results = {(asn, part): result for asn, part, result in service.iter_lookups(["AS64500", "64501", "as64502", "AS64500"])}
+
+    assert set(results) == {(asn, part) for asn in ("64500", "64501", "64502") for part in (OVERVIEW, PREFIXES)}
+    assert len(fake.calls) == 6
+    assert results[("64500", OVERVIEW)]["holder"] == "Titular 64500"
+    assert results[("64500", PREFIXES)]["ipv6_prefixes"] == ["2001:db8::/32"]
+    assert isinstance(results[("64501", OVERVIEW)], requests.exceptions.ConnectionError)
+    assert isinstance(results[("64501", PREFIXES)], requests.exceptions.ConnectionError)
+    assert results[("64502", OVERVIEW)]["holder"] == ""
+
+    # Só o ASN conhecido vai para o cache; o que falhou e o desconhecido são consultados de novo
+    assert cache.get("64500", OVERVIEW) is not None and cache.get("64500", PREFIXES) is not None
+    for asn in ("64501", "64502"):
+        assert cache.get(asn, OVERVIEW) is None and cache.get(asn, PREFIXES) is None
+
+def test_expired_entry_is_served_while_it_refreshes(monkeypatch, tmp_path):
+    cache = AsnCache(tmp_path / "asn_cache.sqlite3")
+    monkeypatch.setattr(ripestat_service, "ASN_CACHE", cache)
+    cache.put("64500", OVERVIEW, {"holder": "Titular antigo", "country": "BR"}, fetched_at=time.time() - AppConfig.ASN_CACHE_TTL - 60)
+    release = threading.Event()
+    calls = []
+
+    def get(endpoint, asn, timeout):
+        calls.append(asn)
+        release.wait(5)
+        return {"holder": "Titular novo", "country": "BR"}
+
+    service = RipeStatService()
+    monkeypatch.setattr(service, "_get", get)
+
+    assert service.lookup("AS64500", parts=(OVERVIEW,))["holder"] == "Titular antigo"
+    # Uma segunda consulta durante a atualização não dispara outra busca
+    assert service.lookup("AS64500", parts=(OVERVIEW,))["holder"] == "Titular antigo"
+    release.set()
+    deadline = time.monotonic() + 5
+    while ("64500", OVERVIEW) in RipeStatService._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert calls == ["64500"]
+    data, fetched_at = cache.get("64500", OVERVIEW)
+    assert data["holder"] == "Titular novo" and time.time() - fetched_at < AppConfig.ASN_CACHE_TTL
+    assert service.lookup("AS64500", parts=(OVERVIEW,))["holder"] == "Titular novo"
+    assert calls == ["64500"]
@@ -0,0 +1,58 @@
+import json
+import pytest
+from services.rpki_validator import INVALID, MALFORMED, NOT_FOUND, VALID, VrpIndex
+
+ROAS = [
+    {"asn": "AS64500", "prefix": "192.0.2.0/24", "maxLength": 24},
+    {"asn": "AS64500", "prefix": "10.0.0.0/16", "maxLength": 20},
+    {"asn": "AS0", "prefix": "198.51.100.0/24", "maxLength": 24},
+    {"asn": "64501", "prefix": "2001:db8::/32", "maxLength": 48},
+    {"asn": "ASxyz", "prefix": "203.0.113.0/24", "maxLength": 24},
+    {"asn": "AS64500", "prefix": "203.0.113.1/24", "maxLength": 24},
+    {"asn": "AS64500", "prefix": "203.0.113.0/24", "maxLength": 16},
+    {"asn": "AS64500", "prefix": "203.0.113.0/24", "maxLength": 33},
+]
+
+@pytest.fixture
+def vrps(tmp_path):
+    path = tmp_path / "vrps.json"
+    path.write_text(json.dumps({"roas": ROAS}))
+    index = VrpIndex(path)
+    assert index.load()
+    return index
+
+def test_bad_rows_are_skipped_and_counted(vrps):
+    assert vrps.count == 4 and vrps.skipped == 4
+    assert vrps.validate("203.0.113.0/24", 64500)["state"] == NOT_FOUND
+
+@pytest.mark.parametrize("prefix, origin, state", [
+    ("192.0.2.0/24", "AS64500", VALID),
+    ("192.0.2.0/24", "AS64501", INVALID),
+    ("10.0.16.0/20", 64500, VALID),
+    ("10.0.16.0/21", 64500, INVALID),  # mais específico que o maxLength
+    ("198.51.100.0/24", 0, INVALID),   # AS0 nunca valida
+    ("2001:db8:1::/48", 64501, VALID),
+    ("172.16.0.0/12", 64500, NOT_FOUND),
+])
+def test_origin_validation(vrps, prefix, origin, state):
+    assert vrps.validate(prefix, origin)["state"] == state
+
+def test_user_prefixes_with_host_bits_or_garbage(vrps):
+    result = vrps.validate("192.0.2.1/24", 64500)
+    assert result["state"] == VALID and result["prefix"] == "192.0.2.1/24"
+    for garbage in ("192.0.2.0/33", "foo"):
+        result = vrps.validate(garbage, 64500)
+        assert result["state"] == MALFORMED and result["error"]
+
+def test_csv_export(tmp_path):
+    path = tmp_path / "vrps.csv"
+    path.write_text("ASN,IP Prefix,Max Length,Trust Anchor\nAS64500,192.0.2.0/24,24,ripe\nAS64500,192.0.2.0/24,8,ripe\n")
+    index = VrpIndex(path)
+    assert index.load() and (index.count, index.skipped) == (1, 1)
+
+def test_malformed_json_raises(tmp_path):
+    path = tmp_path / "vrps.json"
+    path.write_text('{"roas": [')
+    with pytest.raises(ValueError):
+        VrpIndex(path).load()
+    assert VrpIndex(tmp_path / "missing.json").load() is False
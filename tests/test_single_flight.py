@@ -0,0 +1,45 @@
+import threading
+import time
+from services.single_flight import SingleFlight
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return [{"id": 1}]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    follower.start()
+    while flight.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert results == [[{"id": 1}], [{"id": 1}]]
+    assert results[0] is not results[1]
+    assert results[0][0] is not results[1][0]
+
+def test_errors_propagate_and_key_is_released():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    try:
+        flight.do("k", fail)
+    except ValueError:
+        pass
+    assert flight.do("k", lambda: 42) == 42
+    assert flight.stats()["in_flight"] == 0
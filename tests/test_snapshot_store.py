@@ -0,0 +1,90 @@
+import threading
+import time
+from services import snapshot_store
+from services.snapshot_store import SnapshotStore
+
+def wait_refresh(store, key, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while key in store._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert key not in store._refreshing
+
+def test_fresh_copy_is_served_without_calling_the_loader(tmp_path):
+    store = SnapshotStore(tmp_path)
+    calls = []
+    loader = lambda: calls.append(1) or [{"id": len(calls)}]
+
+    assert store.get("tenants_list", loader, soft_ttl=60) == [{"id": 1}]
+    assert store.get("tenants_list", loader, soft_ttl=60) == [{"id": 1}]
+    assert calls == [1]
+
+def test_old_copy_is_served_while_it_revalidates(tmp_path, monkeypatch):
+    store = SnapshotStore(tmp_path)
+    store.set("tenants_list", ["antigo"])
+    clock = {"now": time.time() + 120}
+    monkeypatch.setattr(snapshot_store.time, "time", lambda: clock["now"])
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(2)
+        return ["novo"]
+
+    assert store.get("tenants_list", loader, soft_ttl=60) == ["antigo"]
+    # Uma segunda leitura durante a atualização não dispara outra busca
+    assert store.get("tenants_list", loader, soft_ttl=60) == ["antigo"]
+    release.set()
+    wait_refresh(store, "tenants_list")
+
+    assert calls == [1]
+    assert store.get("tenants_list", loader, soft_ttl=60) == ["novo"]
+
+def test_failed_refresh_keeps_the_previous_copy(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.set("sites_all", ["antigo"])
+
+    def loader():
+        raise ConnectionError("sem rede")
+
+    store.expire("sites_all")
+    assert store.get("sites_all", loader, soft_ttl=60) == ["antigo"]
+    wait_refresh(store, "sites_all")
+    assert store.peek("sites_all") == ["antigo"]
+
+def test_disk_copy_survives_a_restart(tmp_path):
+    SnapshotStore(tmp_path).set("tenants_list:id,name", [{"id": 1}])
+
+    restarted = SnapshotStore(tmp_path)
+    assert restarted.peek("tenants_list:id,name") == [{"id": 1}]
+    assert restarted.get("tenants_list:id,name", lambda: [], soft_ttl=60) == [{"id": 1}]
+    assert restarted.peek("tenants_list") is None
+
+def test_expire_reaches_the_disk_copy(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.set("tenants_list", ["antigo"])
+    store.set("sites_1", ["antigo"])
+    store.expire()
+
+    restarted = SnapshotStore(tmp_path)
+    assert restarted.get("tenants_list", lambda: ["novo"], soft_ttl=60) == ["antigo"]
+    wait_refresh(restarted, "tenants_list")
+    assert restarted.peek("tenants_list") == ["novo"]
+    assert restarted.age("sites_1") > 60
+
+def test_expired_family_stays_expired_after_a_restart(tmp_path):
+    store = SnapshotStore(tmp_path)
+    for key in ("sites_1", "sites_1:id,name", "sites_10"):
+        store.set(key, [])
+    store.expire_family("sites_1")
+
+    restarted = SnapshotStore(tmp_path)
+    assert restarted.age("sites_1") > 60
+    assert restarted.age("sites_1:id,name") > 60
+    assert restarted.age("sites_10") < 60
+
+def test_callers_get_copies(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.get("tenants_list", lambda: [{"id": 1}], soft_ttl=60).append({"id": 2})
+    store.peek("tenants_list")[0]["id"] = 99
+    assert store.peek("tenants_list") == [{"id": 1}]
@@ -0,0 +1,104 @@
+import requests
+import services.netbox_service as netbox_service
+from components import tenant_picker
+from components.tenant_picker import TenantPicker
+from services.netbox_service import NetboxService
+from tests.conftest import sent_to
+
+def test_search_asks_the_server_for_the_top_matches_only(fake_netbox):
+    service, sent = fake_netbox
+
+    results = service.search_tenants("cliente", limit=2)
+
+    params = sent_to(sent, "tenancy/tenants/")
+    assert params == [{"q": "cliente", "limit": 2, "brief": "true"}]
+    assert [t["name"] for t in results] == ["Cliente 00001 Telecom", "Cliente 00002 Telecom"]
+    assert set(results[0]) == set(NetboxService.TENANT_FIELDS)
+
+    # A mesma busca é servida do cache da sessão
+    assert service.search_tenants(" Cliente ", limit=2) == results
+    assert len(sent_to(sent, "tenancy/tenants/")) == 1
+
+def test_short_queries_do_not_hit_the_server(fake_netbox):
+    service, sent = fake_netbox
+    assert service.search_tenants("c") == []
+    assert sent == []
+
+def test_search_uses_the_local_mirror_when_there_is_one(fake_netbox):
+    service, sent = fake_netbox
+    netbox_service.SNAPSHOTS.set(service.tenants_snapshot_key(NetboxService.TENANT_FIELDS), [
+        {"id": 1, "name": "Provedor Acme", "slug": "provedor-acme"},
+        {"id": 2, "name": "Acme Telecom", "slug": "acme-telecom"},
+        {"id": 3, "name": "Outro Cliente", "slug": "outro"},
+        {"id": 4, "name": "Acme Fibra", "slug": "acme-fibra"},
+    ])
+
+    results = service.search_tenants("acme", limit=2)
+
+    assert sent == []
+    # Nomes que começam com o termo primeiro
+    assert [t["id"] for t in results] == [4, 2]
+
+def test_failed_search_is_not_cached(fake_netbox, monkeypatch):
+    service, sent = fake_netbox
+    errors = []
+    monkeypatch.setattr(netbox_service.st, "error", errors.append)
+    real_request = netbox_service.requests.request
+
+    def offline(method, url, **kwargs):
+        raise requests.exceptions.ConnectionError("sem rede")
+
+    monkeypatch.setattr(netbox_service.requests, "request", offline)
+    assert service.search_tenants("00003") == []
+    assert errors
+
+    monkeypatch.setattr(netbox_service.requests, "request", real_request)
+    assert [t["id"] for t in service.search_tenants("00003")] == [3]
+
+class FakeStreamlit:
+    """Widgets mínimos usados pelo TenantPicker"""
+
+    def __init__(self, query, choice=None):
+        self.query = query
+        self.choice = choice
+        self.options = None
+        self.captions = []
+
+    def text_input(self, label, **kwargs):
+        return self.query
+
+    def caption(self, text):
+        self.captions.append(text)
+
+    def selectbox(self, label, options, index=0, format_func=str, **kwargs):
+        self.options = [format_func(option) for option in options]
+        return options[index] if self.choice is None else self.choice
+
+def make_picker(monkeypatch, fake_st, results):
+    monkeypatch.setattr(tenant_picker, "st", fake_st)
+    picker = TenantPicker("cliente", limit=5)
+    searches = []
+    picker.netbox.search_tenants = lambda query, limit: searches.append((query, limit)) or results
+    return picker, searches
+
+def test_picker_lists_the_matches_and_returns_the_choice(monkeypatch):
+    fake_st = FakeStreamlit("acme", choice=2)
+    picker, searches = make_picker(monkeypatch, fake_st, [{"id": 1, "name": "Acme Fibra"}, {"id": 2, "name": "Acme Telecom"}])
+
+    assert picker.render() == (2, "Acme Telecom")
+    assert searches == [("acme", 5)]
+    assert fake_st.options == [TenantPicker.PLACEHOLDER, "Acme Fibra", "Acme Telecom"]
+
+def test_picker_keeps_the_selected_tenant_between_searches(monkeypatch):
+    fake_st = FakeStreamlit("zz")
+    picker, _ = make_picker(monkeypatch, fake_st, [])
+
+    assert picker.render(selected=(7, "Cliente Sete")) == (7, "Cliente Sete")
+    assert fake_st.captions == ["Nenhum cliente encontrado"]
+
+def test_picker_without_query_or_selection_shows_nothing(monkeypatch):
+    fake_st = FakeStreamlit("")
+    picker, searches = make_picker(monkeypatch, fake_st, [])
+
+    assert picker.render() is None
+    assert searches == [] and fake_st.options is None
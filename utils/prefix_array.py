@@ -0,0 +1,195 @@
+# utils/prefix_array.py
+import re
+import socket
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Union
+import numpy as np
+
+# Separadores aceitos em listas coladas: espaços, quebras de linha, vírgula e ponto e vírgula
+_TOKEN_SPLIT = re.compile(r"[\s,;]+")
+
+# Uma linha por token: grupos numéricos preenchidos só quando o token tem o formato a.b.c.d/m
+_IPV4_LINE = re.compile(r"^(?:([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})/([0-9]{1,3})|.*)$", re.M)
+
+_ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Tabelas de formatação: indexar um array de strings é vetorizado, np.char.mod não
+_DECIMAL = np.array([str(i) for i in range(256)])
+_DECIMAL_3 = np.array([f"{i:03d}" for i in range(256)])
+_HEX_4 = np.array([f"{i:04x}" for i in range(65536)])
+
+def _low_bits(count: np.ndarray) -> np.ndarray:
+    """Máscara com os 'count' bits menos significativos ligados (0 a 64), por elemento"""
+    count = count.astype(np.uint64)
+    shifted = (np.uint64(1) << np.minimum(count, np.uint64(63))) - np.uint64(1)
+    return np.where(count >= 64, _ALL_BITS, shifted)
+
+@dataclass
+class ParsedPrefixes:
+    """
+    Prefixos válidos em arrays NumPy, deduplicados e ordenados (IPv4 antes de IPv6)
+
+    O endereço de rede ocupa dois inteiros de 64 bits: 'hi' (zero no IPv4) e 'lo'.
+    """
+    family: np.ndarray
+    hi: np.ndarray
+    lo: np.ndarray
+    length: np.ndarray
+    invalid: List[str] = field(default_factory=list)
+    host_bits: List[str] = field(default_factory=list)  # tinham bits de host; mantidos como a rede
+    duplicates: int = 0
+
+    def __len__(self) -> int:
+        return len(self.length)
+
+    def select(self, family: int) -> "ParsedPrefixes":
+        """Só os prefixos de uma família (4 ou 6)"""
+        mask = self.family == family
+        return ParsedPrefixes(self.family[mask], self.hi[mask], self.lo[mask], self.length[mask],
+                              self.invalid, self.host_bits, self.duplicates)
+
+    def _v4_octets(self, mask: np.ndarray) -> List[np.ndarray]:
+        lo = self.lo[mask]
+        return [(lo >> np.uint64(shift)) & np.uint64(0xFF) for shift in (24, 16, 8, 0)]
+
+    def _v6_groups(self, mask: np.ndarray, count: int) -> List[np.ndarray]:
+        words = (self.hi[mask], self.lo[mask])
+        return [(words[i // 4] >> np.uint64(48 - 16 * (i % 4))) & np.uint64(0xFFFF) for i in range(count)]
+
+    def texts(self) -> List[str]:
+        """Prefixos no formato canônico 'rede/máscara'"""
+        result = np.empty(len(self), dtype=object)
+        v4 = self.family == 4
+        if v4.any():
+            octets = [_DECIMAL[o] for o in self._v4_octets(v4)]
+            joined = octets[0]
+            for part in octets[1:]:
+                joined = np.char.add(np.char.add(joined, "."), part)
+            result[v4] = np.char.add(np.char.add(joined, "/"), _DECIMAL[self.length[v4]])
+        v6 = ~v4
+        if v6.any():
+            # A compressão de zeros do IPv6 não é vetorizável: inet_ntop por elemento
+            packed = np.stack([self.hi[v6], self.lo[v6]], axis=1).astype(">u8").tobytes()
+            result[v6] = [
+                f"{socket.inet_ntop(socket.AF_INET6, packed[i * 16:(i + 1) * 16])}/{length}"
+                for i, length in enumerate(self.length[v6].tolist())
+            ]
+        return result.tolist()
+
+    def rp_names(self) -> List[str]:
+        """Nomes no formato de RpNameFormatter (045-169-160-000-24 / 2804-5984-0000-0000-32)"""
+        result = np.empty(len(self), dtype=object)
+        for family in (4, 6):
+            mask = self.family == family
+            if not mask.any():
+                continue
+            if family == 4:
+                parts = [_DECIMAL_3[o] for o in self._v4_octets(mask)]
+            else:
+                parts = [_HEX_4[g] for g in self._v6_groups(mask, 4)]
+            joined = parts[0]
+            for part in parts[1:] + [_DECIMAL[self.length[mask]]]:
+                joined = np.char.add(np.char.add(joined, "-"), part)
+            result[mask] = joined
+        return result.tolist()
+
+def _tokens(source: Union[str, Iterable[str]]) -> List[str]:
+    if isinstance(source, str):
+        return [t for t in _TOKEN_SPLIT.split(source) if t]
+    # Um elemento da lista pode trazer vários prefixos (ex.: linhas coladas)
+    return [t for item in source if item for t in _TOKEN_SPLIT.split(item) if t]
+
+def _parse_v4(tokens: List[str]):
+    """Endereço, máscara e validade de cada token IPv4 (regex em uma passada sobre todos)"""
+    rows = _IPV4_LINE.findall("\n".join(tokens))
+    # Cada campo tem até 3 dígitos: os códigos dos caracteres viram números sem passar por int()
+    codes = np.array(rows, dtype="<U3").reshape(len(tokens), 5).view(np.uint32).reshape(len(tokens), 5, 3).astype(np.int64)
+    present = codes != 0
+    numbers = np.zeros((len(tokens), 5), dtype=np.int64)
+    for position in range(3):
+        digit = codes[:, :, position] - 48
+        numbers = np.where(present[:, :, position], numbers * 10 + digit, numbers)
+
+    matched = present[:, 0, 0]
+    leading_zero = ((codes[:, :4, 0] == 48) & present[:, :4, 1]).any(axis=1)
+    valid = matched & ~leading_zero & (numbers[:, :4] <= 255).all(axis=1) & (numbers[:, 4] <= 32)
+
+    address = np.zeros(len(tokens), dtype=np.uint64)
+    for column, shift in zip(range(4), (24, 16, 8, 0)):
+        address |= numbers[:, column].astype(np.uint64) << np.uint64(shift)
+    return np.zeros(len(tokens), dtype=np.uint64), address, numbers[:, 4].astype(np.uint8), valid
+
+def _parse_v6(tokens: List[str]):
+    """inet_pton por token (a forma comprimida '::' não é vetorizável) e o resto em arrays"""
+    packed = bytearray(16 * len(tokens))
+    lengths = np.zeros(len(tokens), dtype=np.int64)
+    valid = np.zeros(len(tokens), dtype=bool)
+    for i, token in enumerate(tokens):
+        address, _, length = token.partition("/")
+        if not length.isdigit() or len(length) > 3:
+            continue
+        try:
+            packed[i * 16:(i + 1) * 16] = socket.inet_pton(socket.AF_INET6, address)
+        except OSError:
+            continue
+        lengths[i] = int(length)
+        valid[i] = True
+    words = np.frombuffer(bytes(packed), dtype=">u8").reshape(-1, 2).astype(np.uint64)
+    valid &= lengths <= 128
+    return words[:, 0], words[:, 1], lengths.astype(np.uint8), valid
+
+def parse_prefixes(source: Union[str, Iterable[str]], family: Optional[int] = None) -> ParsedPrefixes:
+    """
+    Converte uma lista de prefixos (texto colado ou lista) em arrays NumPy
+
+    Tokens com '/' são candidatos; os demais (palavras, endereços soltos) são
+    ignorados, como no parser por regex anterior. Validação, correção de bits
+    de host, deduplicação e ordenação são feitas sobre os arrays.
+
+    Args:
+        source: Texto (separado por espaços, linhas, vírgulas) ou lista de prefixos
+        family: 4 ou 6 para considerar só uma família; a outra é ignorada
+    """
+    candidates = [t for t in _tokens(source) if "/" in t]
+    is_v6 = np.array([":" in t for t in candidates], dtype=bool)
+    families = [f for f in (4, 6) if family in (None, f)]
+
+    parts, invalid = [], []
+    for fam in families:
+        indexes = np.flatnonzero(is_v6 if fam == 6 else ~is_v6)
+        if not len(indexes):
+            continue
+        tokens = [candidates[i] for i in indexes]
+        hi, lo, length, valid = (_parse_v6 if fam == 6 else _parse_v4)(tokens)
+        invalid.extend(t for t, ok in zip(tokens, valid.tolist()) if not ok)
+        parts.append((fam, np.asarray(tokens, dtype=object)[valid], hi[valid], lo[valid], length[valid]))
+
+    if not parts:
+        empty = np.zeros(0, dtype=np.uint64)
+        return ParsedPrefixes(np.zeros(0, dtype=np.uint8), empty, empty, np.zeros(0, dtype=np.uint8), invalid)
+
+    fam_arr = np.concatenate([np.full(len(p[2]), p[0], dtype=np.uint8) for p in parts])
+    text_arr = np.concatenate([p[1] for p in parts])
+    hi = np.concatenate([p[2] for p in parts])
+    lo = np.concatenate([p[3] for p in parts])
+    length = np.concatenate([p[4] for p in parts])
+
+    # Bits de host: zera o que fica além da máscara e registra o prefixo original
+    bits = np.where(fam_arr == 4, 32, 128).astype(np.int64) - length
+    hi_host = np.where(bits > 64, _low_bits(np.clip(bits - 64, 0, 64)), 0).astype(np.uint64)
+    lo_host = np.where(fam_arr == 4, _low_bits(np.clip(bits, 0, 32)), _low_bits(np.clip(bits, 0, 64)))
+    has_host_bits = ((hi & hi_host) | (lo & lo_host)) != 0
+    hi &= ~hi_host
+    lo &= ~lo_host
+
+    order = np.lexsort((length, lo, hi, fam_arr))
+    fam_arr, hi, lo, length = fam_arr[order], hi[order], lo[order], length[order]
+    unique = np.ones(len(order), dtype=bool)
+    unique[1:] = (np.diff(fam_arr.astype(np.int16)) != 0) | (hi[1:] != hi[:-1]) | (lo[1:] != lo[:-1]) | (length[1:] != length[:-1])
+
+    return ParsedPrefixes(
+        fam_arr[unique], hi[unique], lo[unique], length[unique],
+        invalid=invalid,
+        host_bits=text_arr[has_host_bits].tolist(),
+        duplicates=int((~unique).sum()),
+    )
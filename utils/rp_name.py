@@ -1,5 +1,7 @@
 # utils/rp_name.py
 import ipaddress
+from typing import Iterable, List
+from utils.prefix_array import parse_prefixes
 
 class RpNameFormatter:
     """
@@ -39,3 +41,15 @@ class RpNameFormatter:
             rp_name = prefix_cidr.replace(".", "-").replace(":", "-").replace("/", "-")
 
         return rp_name
+
+    @staticmethod
+    def convert_many(prefixes: Iterable[str]) -> List[str]:
+        """
+        Converte uma lista de prefixos de uma vez (mesma ordem da entrada).
+        Prefixos já na forma canônica são formatados em lote via NumPy;
+        os demais passam por convert().
+        """
+        prefixes = list(prefixes)
+        parsed = parse_prefixes(prefixes)
+        names = dict(zip(parsed.texts(), parsed.rp_names()))
+        return [names.get(p) or RpNameFormatter.convert(p) for p in prefixes]